@@ -0,0 +1,209 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A column archive is a directory holding one append-only file per column: int64 epoch milliseconds for rec, and float64
+for each numeric leaf node of the archived documents. A missing value is NaN.
+
+Without a codec, column files hold little-endian values, and may be memory-mapped. With the gorilla codec, each chunk
+is appended to each column file as a block, framed by its row count and byte length.
+
+The archive.json header records the column paths and the number of committed rows. Rows are written in chunks; the
+header is replaced atomically after each chunk, so that a partially-written chunk is never visible to readers.
+
+example header:
+{"paths": ["val.hmd", "val.tmp"], "types": ["float", "float"], "count": 8640, "ordered": true, "codec": null}
+"""
+
+import json
+import os
+import struct
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ColumnArchive(object):
+    """
+    classdocs
+    """
+
+    HEADER_FILENAME = "archive.json"
+
+    CODECS = (None, 'gorilla')
+
+    REC_DTYPE = '<i8'
+    VALUE_DTYPE = '<f8'
+
+    ITEM_SIZE = 8
+
+    BLOCK_HEADER = struct.Struct('<II')             # rows, length
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def leaves(jdict, prefix=None):
+        for key, value in jdict.items():
+            path = key if prefix is None else prefix + '.' + key
+
+            if isinstance(value, dict):
+                yield from ColumnArchive.leaves(value, path)
+
+            elif isinstance(value, (int, float)) or value is None:
+                yield path, value
+
+
+    @classmethod
+    def blocks(cls, file):
+        """
+        yields (rows, data) for each complete block, from the current position of the file
+        """
+        while True:
+            header = file.read(cls.BLOCK_HEADER.size)
+
+            if len(header) < cls.BLOCK_HEADER.size:
+                return
+
+            rows, length = cls.BLOCK_HEADER.unpack(header)
+            data = file.read(length)
+
+            if len(data) < length:
+                return
+
+            yield rows, data
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, directory):
+        try:
+            with open(os.path.join(directory, cls.HEADER_FILENAME), "r") as f:
+                jdict = json.load(f, object_pairs_hook=OrderedDict)
+
+        except FileNotFoundError:
+            return None
+
+        return cls(directory, jdict.get('paths'), jdict.get('types'), jdict.get('count'), jdict.get('ordered'),
+                   jdict.get('codec'))
+
+
+    @classmethod
+    def construct(cls, directory, codec=None):
+        if codec not in cls.CODECS:
+            raise ValueError(codec)
+
+        os.makedirs(directory, exist_ok=True)
+
+        archive = cls(directory, [], [], 0, True, codec)
+        archive.save()
+
+        return archive
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, directory, paths, types, count, ordered, codec):
+        """
+        Constructor
+        """
+        self.__directory = directory                    # string            archive directory
+        self.__paths = list(paths)                      # list of string    leaf paths, in order of first appearance
+        self.__types = list(types)                      # list of string    'int' or 'float'
+        self.__count = int(count)                       # int               committed rows
+        self.__ordered = bool(ordered)                  # bool              rec is non-decreasing
+        self.__codec = codec                            # string            None or 'gorilla'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def save(self):
+        jdict = OrderedDict()
+
+        jdict['paths'] = self.paths
+        jdict['types'] = self.types
+        jdict['count'] = self.count
+        jdict['ordered'] = self.ordered
+        jdict['codec'] = self.codec
+
+        filename = os.path.join(self.directory, self.HEADER_FILENAME)
+        tmp_filename = filename + '.tmp'
+
+        with open(tmp_filename, "w") as f:
+            f.write(json.dumps(jdict))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_filename, filename)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def add_path(self, path, value_type):
+        self.__paths.append(path)
+        self.__types.append(value_type)
+
+        return len(self.__paths) - 1
+
+
+    def set_type(self, index, value_type):
+        self.__types[index] = value_type
+
+
+    def commit(self, count, ordered):
+        self.__count = count
+        self.__ordered = ordered
+
+        self.save()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def rec_filename(self):
+        return os.path.join(self.directory, "rec.grl" if self.codec else "rec.i64")
+
+
+    def column_filename(self, index):
+        return os.path.join(self.directory, ("col-%04d.grl" if self.codec else "col-%04d.f64") % index)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__directory
+
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def types(self):
+        return self.__types
+
+
+    @property
+    def count(self):
+        return self.__count
+
+
+    @property
+    def ordered(self):
+        return self.__ordered
+
+
+    @property
+    def codec(self):
+        return self.__codec
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ColumnArchive:{directory:%s, paths:%s, types:%s, count:%s, ordered:%s, codec:%s}" % \
+               (self.directory, self.paths, self.types, self.count, self.ordered, self.codec)
@@ -0,0 +1,163 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Presents the committed rows of a ColumnArchive as NumPy arrays. Uncompressed columns are read-only memory maps, so
+that no data is copied until a row is rendered as a document. Compressed columns are decoded on opening.
+"""
+
+import math
+import os
+
+import numpy as np
+
+from collections import OrderedDict
+
+from scs_analysis.archive.column_archive import ColumnArchive
+from scs_analysis.archive.gorilla_codec import GorillaCodec
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ColumnArchiveReader(object):
+    """
+    classdocs
+    """
+
+    @staticmethod
+    def __map(filename, dtype, count):
+        if count == 0:
+            return np.empty(0, dtype=dtype)                 # an empty file cannot be mapped
+
+        return np.memmap(filename, dtype=dtype, mode='r', shape=(count,))
+
+
+    @staticmethod
+    def __decode(filename, decoder, dtype, count):
+        arrays = []
+        rows = 0
+
+        with open(filename, "rb") as file:
+            for block_rows, data in ColumnArchive.blocks(file):
+                if rows >= count:
+                    break
+
+                arrays.append(decoder(data))
+                rows += block_rows
+
+        return np.concatenate(arrays)[:count] if arrays else np.empty(0, dtype=dtype)
+
+
+    @classmethod
+    def __column(cls, archive, filename, is_rec):
+        dtype = ColumnArchive.REC_DTYPE if is_rec else ColumnArchive.VALUE_DTYPE
+
+        if archive.codec is None:
+            return cls.__map(filename, dtype, archive.count)
+
+        decoder = GorillaCodec.decode_timestamps if is_rec else GorillaCodec.decode_values
+
+        return cls.__decode(filename, decoder, dtype, archive.count)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, directory):
+        """
+        Constructor
+        """
+        archive = ColumnArchive.load(directory)
+
+        if archive is None:
+            raise FileNotFoundError(os.path.join(directory, ColumnArchive.HEADER_FILENAME))
+
+        self.__archive = archive
+
+        self.__rec = self.__column(archive, archive.rec_filename(), True)
+        self.__columns = OrderedDict((path, self.__column(archive, archive.column_filename(i), False))
+                                     for i, path in enumerate(archive.paths))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def rec(self):
+        return self.__rec
+
+
+    def column(self, path):
+        return self.__columns[path]
+
+
+    def span(self, start=None, end=None):
+        """
+        start and end are epoch milliseconds - returns the indices of rows in [start, end)
+        """
+        if self.__archive.ordered:
+            lo = 0 if start is None else int(np.searchsorted(self.__rec, start, side='left'))
+            hi = len(self.__rec) if end is None else int(np.searchsorted(self.__rec, end, side='left'))
+
+            return np.arange(lo, hi)
+
+        mask = np.ones(len(self.__rec), dtype=bool)
+
+        if start is not None:
+            mask &= self.__rec >= start
+
+        if end is not None:
+            mask &= self.__rec < end
+
+        return np.flatnonzero(mask)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def rows(self, start=None, end=None, paths=None):
+        """
+        yields (rec, jdict) pairs - rec is epoch milliseconds, jdict excludes NaN values
+        """
+        paths = self.paths if paths is None else paths
+        types = dict(zip(self.__archive.paths, self.__archive.types))
+
+        columns = [(path.split('.'), types[path] == 'int', self.__columns[path]) for path in paths]
+
+        for index in self.span(start, end):
+            jdict = OrderedDict()
+
+            for nodes, is_int, column in columns:
+                value = float(column[index])
+
+                if math.isnan(value):
+                    continue
+
+                container = jdict
+
+                for node in nodes[:-1]:
+                    container = container.setdefault(node, OrderedDict())
+
+                container[nodes[-1]] = int(value) if is_int else value
+
+            yield int(self.__rec[index]), jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def archive(self):
+        return self.__archive
+
+
+    @property
+    def paths(self):
+        return list(self.__columns.keys())
+
+
+    @property
+    def count(self):
+        return len(self.__rec)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ColumnArchiveReader:{archive:%s}" % self.archive
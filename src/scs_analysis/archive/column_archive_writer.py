@@ -0,0 +1,227 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Appends documents to a ColumnArchive, one chunk at a time. On opening, any bytes beyond the committed row count -
+left by an interrupted chunk - are truncated.
+"""
+
+import math
+import os
+
+import numpy as np
+
+from scs_analysis.archive.column_archive import ColumnArchive
+from scs_analysis.archive.gorilla_codec import GorillaCodec
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ColumnArchiveWriter(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_CHUNK_SIZE = 4096                   # rows
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, directory, chunk_size=DEFAULT_CHUNK_SIZE, codec=None):
+        """
+        Constructor - the codec is only used if the archive does not already exist
+        """
+        archive = ColumnArchive.load(directory)
+
+        self.__archive = ColumnArchive.construct(directory, codec) if archive is None else archive
+        self.__chunk_size = int(chunk_size)
+
+        self.__indices = {path: i for i, path in enumerate(self.__archive.paths)}
+
+        self.__count = self.__archive.count
+        self.__ordered = self.__archive.ordered
+        self.__last_rec = None
+
+        self.__block_rows = []                  # rows in each committed block, if the archive has a codec
+
+        # files...
+        self.__rec_file = self.__open(self.__archive.rec_filename(), True)
+        self.__column_files = [self.__open(self.__archive.column_filename(i)) for i in range(len(self.__indices))]
+
+        # chunk...
+        self.__recs = []
+        self.__columns = [[] for _ in range(len(self.__indices))]
+
+
+    def __open(self, filename, is_rec=False):
+        file = open(filename, "a+b")
+        file.seek(0)
+
+        if self.__archive.codec is None:
+            file.truncate(self.__count * ColumnArchive.ITEM_SIZE)
+
+            if is_rec and self.__count > 0:
+                file.seek((self.__count - 1) * ColumnArchive.ITEM_SIZE)
+                self.__last_rec = int(np.frombuffer(file.read(ColumnArchive.ITEM_SIZE),
+                                                    dtype=ColumnArchive.REC_DTYPE)[0])
+
+            return file
+
+        rows = 0
+        size = 0
+
+        for block_rows, data in ColumnArchive.blocks(file):
+            if rows + block_rows > self.__count:
+                break
+
+            rows += block_rows
+            size += ColumnArchive.BLOCK_HEADER.size + len(data)
+
+            if is_rec:
+                self.__block_rows.append(block_rows)
+
+                if rows == self.__count:
+                    self.__last_rec = int(GorillaCodec.decode_timestamps(data)[-1])
+
+            if rows == self.__count:
+                break
+
+        file.truncate(size)
+
+        return file
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, rec, jdict):
+        """
+        rec is epoch milliseconds - non-numeric leaf nodes of jdict, and the rec node itself, are not archived
+        """
+        if rec is None:
+            return False
+
+        rec = int(rec)
+        offset = len(self.__recs)
+
+        if self.__last_rec is not None and rec < self.__last_rec:
+            self.__ordered = False
+
+        self.__last_rec = rec
+        self.__recs.append(rec)
+
+        for path, value in ColumnArchive.leaves(jdict):
+            if path == 'rec':
+                continue
+
+            index = self.__indices.get(path)
+
+            if index is None:
+                index = self.__add_column(path, offset)
+
+            self.__columns[index].append(math.nan if value is None else float(value))
+
+            if isinstance(value, float) and self.__archive.types[index] == 'int':
+                self.__archive.set_type(index, 'float')
+
+        # pad missing values...
+        for column in self.__columns:
+            if len(column) == offset:
+                column.append(math.nan)
+
+        if len(self.__recs) >= self.__chunk_size:
+            self.flush()
+
+        return True
+
+
+    def flush(self):
+        if not self.__recs:
+            return
+
+        recs = np.array(self.__recs, dtype=ColumnArchive.REC_DTYPE)
+
+        if self.__archive.codec is None:
+            recs.tofile(self.__rec_file)
+
+            for file, column in zip(self.__column_files, self.__columns):
+                np.array(column, dtype=ColumnArchive.VALUE_DTYPE).tofile(file)
+
+        else:
+            self.__write_block(self.__rec_file, len(recs), GorillaCodec.encode_timestamps(recs))
+
+            for file, column in zip(self.__column_files, self.__columns):
+                self.__write_block(file, len(recs), GorillaCodec.encode_values(column))
+
+            self.__block_rows.append(len(recs))
+
+        for file in [self.__rec_file] + self.__column_files:
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.__count += len(self.__recs)
+        self.__archive.commit(self.__count, self.__ordered)
+
+        self.__recs = []
+        self.__columns = [[] for _ in range(len(self.__columns))]
+
+
+    def close(self):
+        try:
+            self.flush()
+
+        finally:
+            for file in [self.__rec_file] + self.__column_files:
+                file.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __add_column(self, path, offset):
+        index = self.__archive.add_path(path, 'int')
+        self.__indices[path] = index
+
+        # committed rows have no value for this path...
+        file = open(self.__archive.column_filename(index), "w+b")
+
+        if self.__archive.codec is None:
+            np.full(self.__count, math.nan, dtype=ColumnArchive.VALUE_DTYPE).tofile(file)
+
+        else:
+            for rows in self.__block_rows:
+                self.__write_block(file, rows, GorillaCodec.encode_values(np.full(rows, math.nan)))
+
+        self.__column_files.append(file)
+        self.__columns.append([math.nan] * offset)
+
+        return index
+
+
+    @staticmethod
+    def __write_block(file, rows, data):
+        file.write(ColumnArchive.BLOCK_HEADER.pack(rows, len(data)))
+        file.write(data)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def archive(self):
+        return self.__archive
+
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+
+    @property
+    def count(self):
+        return self.__count + len(self.__recs)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ColumnArchiveWriter:{archive:%s, chunk_size:%s, count:%s}" % \
+               (self.archive, self.chunk_size, self.count)
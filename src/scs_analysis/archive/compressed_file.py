@@ -0,0 +1,409 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Text streams over gzip, bz2 or xz files. On read, the compression is identified by magic bytes - so misnamed files
+are handled correctly - on write, by the filename extension. Uncompressed files are opened as ordinary text files.
+
+CompressedCSVReader and CompressedCSVWriter convert between CSV and JSON over these streams, so that the CSV tools
+read and write compressed or plain files - or stdin / stdout - directly. The CSV header cells are paths into the JSON
+documents, as for the scs_core CSV classes.
+
+https://docs.python.org/3/library/archiving.html
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import lzma
+import os
+import sys
+
+from collections import OrderedDict
+
+from scs_core.csv.csv_dict import CSVDict, CSVHeader
+from scs_core.data.json import JSONify
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CompressedFile(io.TextIOWrapper):
+    """
+    classdocs
+    """
+
+    BUFFER_SIZE = 1024 * 1024                   # large buffers keep the number of disk operations low
+    DEFAULT_LEVEL = 6                           # zlib / bz2 / xz levels are 1 (fastest) to 9 (smallest)
+
+    __EXTENSIONS = {
+        '.gz': 'gzip',
+        '.gzip': 'gzip',
+        '.bz2': 'bz2',
+        '.xz': 'xz',
+        '.lzma': 'xz'
+    }
+
+    __MAGIC = (
+        (b'\x1f\x8b', 'gzip'),
+        (b'BZh', 'bz2'),
+        (b'\xfd7zXZ\x00', 'xz')
+    )
+
+    __MAGIC_LENGTH = 6
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def compression_for_name(cls, filename):
+        if filename is None:
+            return None
+
+        _, extension = os.path.splitext(filename)
+
+        return cls.__EXTENSIONS.get(extension.lower())
+
+
+    @classmethod
+    def compression_for_magic(cls, header):
+        for magic, compression in cls.__MAGIC:
+            if header.startswith(magic):
+                return compression
+
+        return None
+
+
+    @classmethod
+    def compression_for_file(cls, filename):
+        with open(filename, "rb") as file:
+            return cls.compression_for_magic(file.read(cls.__MAGIC_LENGTH))
+
+
+    @classmethod
+    def compression_for_stream(cls, buffered_reader):
+        return cls.compression_for_magic(buffered_reader.peek(cls.__MAGIC_LENGTH))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def open_for_read(cls, filename, buffer_size=None):
+        buffer_size = cls.BUFFER_SIZE if buffer_size is None else buffer_size
+
+        compression = cls.compression_for_file(filename)
+
+        if compression is None:
+            return open(filename, "r", buffering=buffer_size, newline='')
+
+        raw = open(filename, "rb", buffering=buffer_size)
+
+        return cls(raw, cls.__decompressor(compression, raw), buffer_size)
+
+
+    @classmethod
+    def open_for_stdin(cls, stdin, buffer_size=None):
+        buffer_size = cls.BUFFER_SIZE if buffer_size is None else buffer_size
+
+        compression = cls.compression_for_stream(stdin.buffer)
+
+        if compression is None:
+            return stdin
+
+        return cls(None, cls.__decompressor(compression, stdin.buffer), buffer_size)
+
+
+    @classmethod
+    def open_for_write(cls, filename, append=False, level=None, buffer_size=None):
+        buffer_size = cls.BUFFER_SIZE if buffer_size is None else buffer_size
+        level = cls.DEFAULT_LEVEL if level is None else level
+
+        compression = cls.compression_for_name(filename)
+        mode = "a" if append else "w"
+
+        if compression is None:
+            return open(filename, mode, buffering=buffer_size, newline='')
+
+        raw = open(filename, mode + "b", buffering=buffer_size)
+
+        return cls(raw, cls.__compressor(compression, raw, level), buffer_size)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __decompressor(compression, raw):
+        if compression == 'gzip':
+            return gzip.GzipFile(fileobj=raw, mode="rb")
+
+        if compression == 'bz2':
+            return bz2.BZ2File(raw, mode="rb")
+
+        return lzma.LZMAFile(raw, mode="rb")
+
+
+    @staticmethod
+    def __compressor(compression, raw, level):
+        if compression == 'gzip':
+            return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level)
+
+        if compression == 'bz2':
+            return bz2.BZ2File(raw, mode="wb", compresslevel=level)
+
+        return lzma.LZMAFile(raw, mode="wb", preset=level)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, raw, codec, buffer_size):
+        """
+        Constructor
+        """
+        if codec.readable():
+            buffered = io.BufferedReader(codec, buffer_size)
+        else:
+            buffered = io.BufferedWriter(codec, buffer_size)
+
+        super().__init__(buffered, newline='')
+
+        self.__raw = raw                    # underlying file - not closed by the codec, which did not open it
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def close(self):
+        try:
+            super().close()
+
+        finally:
+            if self.__raw is not None:
+                self.__raw.close()
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CompressedCSVReader(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __recast(value):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        return value
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename=None, numeric_cast=True):
+        """
+        Constructor - if filename is None, stdin is read
+        """
+        self.__filename = filename                          # string (may be None)
+        self.__numeric_cast = bool(numeric_cast)            # bool
+
+        if filename is None:
+            self.__file = CompressedFile.open_for_stdin(sys.stdin)
+        else:
+            self.__file = CompressedFile.open_for_read(filename)
+
+        self.__compressed = isinstance(self.__file, CompressedFile)         # bool
+
+        self.__reader = csv.reader(self.__file, skipinitialspace=True)
+
+        try:
+            paths = next(self.__reader)
+        except StopIteration:                                               # no input
+            paths = []
+
+        self.__header = CSVHeader.construct_from_paths(paths)               # CSVHeader
+        self.__read_count = 0                                               # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def close(self):
+        if self.__file is not sys.stdin:
+            self.__file.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def rows(self):
+        """
+        yields a JSON string for each row - excess cells are ignored
+        """
+        width = len(self.__header)
+
+        for row in self.__reader:
+            if len(row) == 0:
+                continue
+
+            if self.__numeric_cast:
+                row = [self.__recast(cell) for cell in row]
+
+            yield JSONify.dumps(self.__header.as_dict(row[:width]))
+
+            self.__read_count += 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def compressed(self):
+        return self.__compressed
+
+
+    @property
+    def read_count(self):
+        return self.__read_count
+
+
+    @property
+    def header(self):
+        return self.__header
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "CompressedCSVReader:{filename:%s, compressed:%s, numeric_cast:%s, read_count:%s, header:[%s]}" % \
+               (self.filename, self.compressed, self.__numeric_cast, self.read_count, ', '.join(self.header.paths()))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CompressedCSVWriter(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename=None, cache=False, append=False, level=None):
+        """
+        Constructor - if filename is None, stdout is written - if cache, the documents are held until close, and the
+        header includes the leaf nodes of every document, not only the first
+        """
+        self.__filename = filename                          # string (may be None)
+        self.__append = append and filename is not None and os.path.exists(filename)         # bool
+
+        self.__paths = self.__append_paths() if self.__append else None     # list of string
+        self.__append = self.__paths is not None                            # an empty file is written afresh
+        self.__cache = [] if cache else None                                # list of CSVDict
+
+        if filename is None:
+            self.__file = sys.stdout
+        else:
+            self.__file = CompressedFile.open_for_write(filename, append=self.__append, level=level)
+
+        self.__writer = csv.writer(self.__file, quoting=csv.QUOTE_MINIMAL)
+        self.__write_count = 0                                              # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, jstr):
+        """
+        returns False if jstr is not a JSON document
+        """
+        if jstr is None:
+            return False
+
+        datum = CSVDict.construct_from_jstr(jstr)
+
+        if datum is None:
+            return False
+
+        if self.__cache is not None:
+            self.__cache.append(datum)
+            return True
+
+        self.__write_row(datum)
+
+        if self.__filename is None:
+            self.__file.flush()
+
+        return True
+
+
+    def close(self):
+        if self.__cache is not None:
+            paths = OrderedDict()
+
+            for datum in self.__cache:
+                paths.update((path, None) for path in datum.paths())
+
+            self.__paths = list(paths)
+
+            for datum in self.__cache:
+                self.__write_row(datum)
+
+            self.__cache = None
+
+        if self.__filename is None:
+            self.__file.flush()
+        else:
+            self.__file.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __write_row(self, datum):
+        if self.__paths is None:
+            self.__paths = datum.paths()
+
+        if self.__write_count == 0 and not self.__append:
+            self.__writer.writerow(self.__paths)
+
+        self.__writer.writerow(datum.row(self.__paths))
+        self.__write_count += 1
+
+
+    def __append_paths(self):
+        file = CompressedFile.open_for_read(self.__filename)
+
+        try:
+            return next(csv.reader(file))
+
+        except StopIteration:
+            return None
+
+        finally:
+            file.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def write_count(self):
+        return self.__write_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "CompressedCSVWriter:{filename:%s, append:%s, cache:%s, paths:%s, write_count:%s}" % \
+               (self.filename, self.__append, self.__cache is not None, self.__paths, self.write_count)
@@ -0,0 +1,113 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A least-recently-used pool of open, buffered, append-mode text files. When the pool is full, the least-recently-used
+file is closed to make room. Files are fsynced when they are closed.
+"""
+
+import os
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FilePool(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_MAX_OPEN = 64
+    BUFFER_SIZE = 256 * 1024
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, max_open=DEFAULT_MAX_OPEN, buffer_size=BUFFER_SIZE):
+        """
+        Constructor
+        """
+        self.__max_open = int(max_open)                 # int
+        self.__buffer_size = int(buffer_size)           # int
+
+        self.__files = OrderedDict()                    # dict of filename: file, least-recently-used first
+
+        self.__open_count = 0                           # int           total opens, including re-opens
+        self.__evict_count = 0                          # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def file(self, filename):
+        file = self.__files.get(filename)
+
+        if file is not None:
+            self.__files.move_to_end(filename)
+            return file
+
+        while len(self.__files) >= self.__max_open:
+            _, lru_file = self.__files.popitem(last=False)
+            self.__close(lru_file)
+
+            self.__evict_count += 1
+
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+        file = open(filename, "a", buffering=self.__buffer_size)
+        self.__files[filename] = file
+
+        self.__open_count += 1
+
+        return file
+
+
+    def write(self, filename, line):
+        self.file(filename).write(line + '\n')
+
+
+    def close(self):
+        while self.__files:
+            _, file = self.__files.popitem(last=False)
+            self.__close(file)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __close(file):
+        try:
+            file.flush()
+            os.fsync(file.fileno())
+
+        finally:
+            file.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def max_open(self):
+        return self.__max_open
+
+
+    @property
+    def open_count(self):
+        return self.__open_count
+
+
+    @property
+    def evict_count(self):
+        return self.__evict_count
+
+
+    def __len__(self):
+        return len(self.__files)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "FilePool:{max_open:%s, buffer_size:%s, open:%s, open_count:%s, evict_count:%s}" % \
+               (self.max_open, self.__buffer_size, len(self), self.open_count, self.evict_count)
@@ -0,0 +1,103 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Routes documents to files in a ROOT/TOPIC/YYYY/MM/DD.jsonl hierarchy. The date is taken from the rec field of the
+document, in the document's own timezone, or from the given default date if there is no valid rec field.
+"""
+
+import os
+import re
+
+from scs_analysis.archive.file_pool import FilePool
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PartitionedWriter(object):
+    """
+    classdocs
+    """
+
+    __DATE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})T')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def date_parts(cls, rec):
+        if not isinstance(rec, str):
+            return None
+
+        match = cls.__DATE.match(rec)
+
+        return None if match is None else match.groups()
+
+
+    @staticmethod
+    def topic_parts(topic):
+        if not isinstance(topic, str):
+            raise ValueError(topic)
+
+        parts = [part for part in topic.split('/') if part]
+
+        if not parts or '.' in parts or '..' in parts:
+            raise ValueError(topic)
+
+        return parts
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, root, pool):
+        """
+        Constructor
+        """
+        self.__root = root                              # string            root directory
+        self.__pool = pool                              # FilePool
+
+        self.__topic_directories = {}                   # dict of topic: directory
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def filename(self, topic, rec, default_date):
+        directory = self.__topic_directories.get(topic)
+
+        if directory is None:
+            directory = os.path.join(self.__root, *self.topic_parts(topic))
+            self.__topic_directories[topic] = directory
+
+        year, month, day = self.date_parts(rec) or default_date
+
+        return os.path.join(directory, year, month, day + '.jsonl')
+
+
+    def write(self, topic, rec, jstr, default_date):
+        filename = self.filename(topic, rec, default_date)
+        self.__pool.write(filename, jstr)
+
+        return filename
+
+
+    def close(self):
+        self.__pool.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def root(self):
+        return self.__root
+
+
+    @property
+    def pool(self):
+        return self.__pool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PartitionedWriter:{root:%s, pool:%s}" % (self.root, self.pool)
@@ -0,0 +1,243 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A SQLite store of JSON documents, indexed by topic and rec. rec is held as epoch milliseconds; documents are held as
+JSON text, exactly as they were written, so that queries return them without re-encoding.
+
+The database uses write-ahead logging, so that queries may run while a writer is ingesting.
+
+Written documents are committed in batches: when batch_size documents are pending, or when the oldest pending document
+has waited flush_interval seconds, whichever comes first. The interval is kept by a timer thread, so that a slow
+input stream is still committed promptly.
+
+https://www.sqlite.org/wal.html
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from urllib.request import pathname2url
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SampleDatabase(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+    DEFAULT_FLUSH_INTERVAL = 5.0                            # seconds
+
+    __SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sample (topic TEXT, rec INTEGER, document TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS sample_topic_rec ON sample (topic, rec)",
+        "CREATE INDEX IF NOT EXISTS sample_rec ON sample (rec)"
+    )
+
+    __INSERT = "INSERT INTO sample (topic, rec, document) VALUES (?, ?, ?)"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Constructor
+        """
+        self.__filename = filename                          # string
+        self.__batch_size = int(batch_size)                 # int
+        self.__flush_interval = float(flush_interval)       # float             seconds
+
+        self.__connection = None                            # sqlite3.Connection
+        self.__read_only = False                            # bool
+        self.__batch = []                                   # list of (topic, rec, document)
+        self.__batch_started = None                         # float             time of the oldest pending document
+
+        self.__lock = threading.RLock()                     # the connection is shared with the timer thread
+        self.__stopping = threading.Event()
+        self.__timer = None                                 # threading.Thread
+
+        self.__write_count = 0                              # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, read_only=False):
+        """
+        a read-only connection neither creates the database nor changes its schema or journal mode
+        """
+        self.__read_only = bool(read_only)
+
+        if self.__read_only:
+            uri = 'file:%s?mode=ro' % pathname2url(os.path.abspath(self.__filename))
+            self.__connection = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+            return
+
+        # transactions are explicit - the connection is used under the lock, by the timer thread too...
+        self.__connection = sqlite3.connect(self.__filename, isolation_level=None, check_same_thread=False)
+
+        self.__connection.execute("PRAGMA journal_mode = WAL")
+        self.__connection.execute("PRAGMA synchronous = NORMAL")
+
+        for statement in self.__SCHEMA:
+            self.__connection.execute(statement)
+
+
+    def close(self):
+        if self.__connection is None:
+            return
+
+        if self.__timer is not None:
+            self.__stopping.set()
+            self.__timer.join()
+            self.__timer = None
+
+        try:
+            self.flush()
+
+        finally:
+            self.__connection.close()
+            self.__connection = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, topic, rec, document):
+        """
+        rec is epoch milliseconds, or None - document is a JSON string
+        """
+        if self.__read_only:
+            raise ValueError("the database is connected read-only")
+
+        with self.__lock:
+            if not self.__batch:
+                self.__batch_started = time.time()
+
+            self.__batch.append((topic, rec, document))
+
+            if len(self.__batch) >= self.__batch_size:
+                self.flush()
+
+        if self.__timer is None and self.__flush_interval > 0:
+            self.__timer = threading.Thread(target=self.__run, name="SampleDatabase", daemon=True)
+            self.__timer.start()
+
+
+    def flush(self):
+        with self.__lock:
+            if not self.__batch:
+                return
+
+            self.__connection.execute("BEGIN")
+
+            try:
+                self.__connection.executemany(self.__INSERT, self.__batch)  # one prepared statement per batch
+                self.__connection.execute("COMMIT")
+
+            except Exception:
+                self.__connection.execute("ROLLBACK")
+                raise
+
+            self.__write_count += len(self.__batch)
+
+            self.__batch = []
+            self.__batch_started = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while True:
+            started = self.__batch_started
+            timeout = self.__flush_interval if started is None else started + self.__flush_interval - time.time()
+
+            if self.__stopping.wait(max(0.0, timeout)):
+                return
+
+            with self.__lock:
+                if self.__batch_started is None or time.time() - self.__batch_started < self.__flush_interval:
+                    continue
+
+                try:
+                    self.flush()
+
+                except sqlite3.Error as ex:
+                    self.__batch_started = time.time()                      # the batch is kept, and tried again
+
+                    print("SampleDatabase: %s: %s" % (ex.__class__.__name__, ex), file=sys.stderr)
+                    sys.stderr.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def find(self, topic=None, start=None, end=None):
+        """
+        yields (topic, rec, document) in rec order - start and end are epoch milliseconds, the range is [start, end)
+        """
+        clauses = []
+        params = []
+
+        if topic is not None:
+            clauses.append("topic = ?")
+            params.append(topic)
+
+        if start is not None:
+            clauses.append("rec >= ?")
+            params.append(start)
+
+        if end is not None:
+            clauses.append("rec < ?")
+            params.append(end)
+
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+        cursor = self.__connection.execute("SELECT topic, rec, document FROM sample" + where + " ORDER BY rec",
+                                           params)
+
+        while True:
+            rows = cursor.fetchmany(self.__batch_size)
+
+            if not rows:
+                return
+
+            yield from rows
+
+
+    def topics(self):
+        cursor = self.__connection.execute("SELECT DISTINCT topic FROM sample ORDER BY topic")
+
+        return [row[0] for row in cursor]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def batch_size(self):
+        return self.__batch_size
+
+
+    @property
+    def flush_interval(self):
+        return self.__flush_interval
+
+
+    @property
+    def write_count(self):
+        return self.__write_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SampleDatabase:{filename:%s, batch_size:%s, flush_interval:%s, write_count:%s}" % \
+               (self.filename, self.batch_size, self.flush_interval, self.write_count)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The archive_reader utility is used to present the contents of a column archive as a stream of JSON documents, for use
+by the other scs_analysis utilities. Rows may be selected by start and / or end localised date / times, and leaf nodes
+may be selected by path. The rec node is presented in the host's timezone.
+
+Null values are omitted from the output documents.
+
+EXAMPLES
+./archive_reader.py climate val.tmp -s 2017-10-01T00:00:00Z -e 2017-10-02T00:00:00Z | ./single_chart.py val.tmp
+
+FILES
+ARCHIVE/archive.json
+
+SEE ALSO
+scs_analysis/archive_writer
+"""
+
+import sys
+
+from collections import OrderedDict
+
+from scs_analysis.archive.column_archive_reader import ColumnArchiveReader
+from scs_analysis.cmd.cmd_archive_reader import CmdArchiveReader
+
+from scs_core.data.json import JSONify
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+from scs_core.sys.exception_report import ExceptionReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdArchiveReader()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print(cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        reader = ColumnArchiveReader(cmd.directory)
+
+        if cmd.verbose:
+            print(reader, file=sys.stderr)
+            sys.stderr.flush()
+
+        if cmd.paths is not None:
+            for path in cmd.paths:
+                if path not in reader.paths:
+                    print("Path not available: %s" % path, file=sys.stderr)
+                    exit(1)
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        start = None if cmd.start is None else round(cmd.start.timestamp() * 1000)
+        end = None if cmd.end is None else round(cmd.end.timestamp() * 1000)
+
+        count = 0
+
+        for rec, jdict in reader.rows(start, end, cmd.paths):
+            document = OrderedDict()
+
+            document['rec'] = LocalizedDatetime.construct_from_timestamp(rec / 1000).as_iso8601()
+            document.update(jdict)
+
+            print(JSONify.dumps(document))
+            sys.stdout.flush()
+
+            count += 1
+
+        if cmd.verbose:
+            print("total: %d" % count, file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("archive_reader: KeyboardInterrupt", file=sys.stderr)
+
+    except Exception as ex:
+        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
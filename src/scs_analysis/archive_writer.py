@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The archive_writer utility is used to append a stream of JSON documents to a column archive. A column archive is a
+directory holding one binary file per leaf node, which may be memory-mapped by the archive_reader utility or by
+analysis code, without parsing.
+
+The rec node of each document is stored as an epoch timestamp. Every other numeric leaf node is stored as a 64-bit
+float; string nodes are not archived. Documents without a rec node are ignored. Leaf nodes that first appear part-way
+through the stream are given null values for earlier documents.
+
+Rows are committed in chunks. If the archive_writer is interrupted, the archive contains all of the rows of every
+complete chunk. An existing archive is appended to.
+
+If the --gorilla flag is set when an archive is created, each chunk is compressed with the Gorilla codec: timestamps
+as delta-of-deltas and values as XORs with their predecessors. Regular timestamps cost a bit each, and values that
+change rarely a few bits each; values that change in every reading, by a decimal step, cost about three quarters of
+their size with gzip. Compressed archives cannot be memory-mapped, and are decoded by the archive_reader at one to
+three million values per second.
+
+EXAMPLES
+./aws_topic_history.py south-coast-science-dev/production-test/loc/1/climate -m1440 | ./archive_writer.py climate
+
+./csv_reader.py climate.csv.gz | ./archive_writer.py climate -z -c 65536
+
+FILES
+ARCHIVE/archive.json
+
+SEE ALSO
+scs_analysis/archive_reader
+"""
+
+import json
+import sys
+
+from collections import OrderedDict
+
+from scs_analysis.archive.column_archive_writer import ColumnArchiveWriter
+from scs_analysis.cmd.cmd_archive_writer import CmdArchiveWriter
+
+from scs_core.data.json import JSONify
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+from scs_core.sys.exception_report import ExceptionReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    writer = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdArchiveWriter()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print(cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        writer = ColumnArchiveWriter(cmd.directory, cmd.chunk, cmd.codec)
+
+        if cmd.verbose:
+            print(writer, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        for line in sys.stdin:
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+            except ValueError:
+                continue
+
+            rec = LocalizedDatetime.construct_from_iso8601(jdict.get('rec'))
+
+            if rec is None:
+                continue
+
+            writer.write(round(rec.timestamp() * 1000), jdict)
+
+            if cmd.echo:
+                print(line.strip())
+                sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("archive_writer: KeyboardInterrupt", file=sys.stderr)
+
+    except Exception as ex:
+        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # close...
+
+    finally:
+        if writer is not None:
+            writer.close()
+
+            if cmd.verbose:
+                print("archive_writer: rows: %d" % writer.count, file=sys.stderr)
@@ -12,7 +12,75 @@ infrastructure.
 Note that AWS endpoint specification and client credentials must be installed on the host for the aws_mqtt_client
 to operate.
 
-Only one MQTT client should run at any one time, per TCP/IP host.
+Only one MQTT client should run at any one time, per TCP/IP host. Where several processes need the broker, they
+should share the connection of aws_mqtt_mux.
+
+Where a subscription is written to a Unix domain socket, the connection is kept open, and each message is terminated
+by a newline. Messages that arrive together are written together. If the reader goes away, the connection is re-made
+after a backoff; messages received while there is no reader are lost. If the connection fails part-way through a
+write, the messages not yet sent in full are written on the new connection - no message is written twice.
+
+This is a change of protocol: earlier versions made a connection for each message, and a reader that takes everything
+sent on a connection as one message - such as DomainSocket.read() - will not work. The socket should be read with
+uds_receiver, or another reader that splits the stream at newlines.
+
+Each subscription has its own bounded queue and writer thread, so that a slow reader does not stall the MQTT client,
+or the other subscriptions. When a queue is full, the drop policy applies: drop-oldest (the default) discards the
+oldest queued message, drop-newest discards the new message, and block holds up the MQTT client until there is space.
+The state of the queues is written to stderr when the process receives SIGUSR1 - for example, kill -USR1 PID.
+
+Publications are completed by worker threads, with up to WINDOW publications in flight at once (the default is one),
+so that on a link with a long round trip, publishing is not held to one publication per round trip. Publications on
+the same topic are published one at a time, in order; publications on different topics overlap. The state of the
+publisher is also written on SIGUSR1.
+
+If a spool directory is given, each publication is appended to a disk-backed spool, and published from there, so that
+reading publications never waits on the broker, and publications not yet published survive a restart - they are
+published first when the client is restarted. Publication is at least once: publications in flight when the client
+stopped are published again. A publication is removed from the spool only when it has been published; one that fails
+is retried after a backoff, and the spool is held until it succeeds. The spool is bounded by --spool-size; when it is
+full, the oldest publications are lost.
+The --sync policy sets how often the spool is synced to disk.
+
+Where there is a spool, the AWS IoT SDK's in-memory offline queue is disabled: while the broker cannot be reached, a
+publication fails, and stays in the spool, rather than being held by the SDK. A publication leaves the spool only when
+the broker has acknowledged it. Without a spool, the SDK queues publications while the broker cannot be reached, and
+sends them when it is reached again; they are reported as failed, and are lost if the client stops first.
+
+In raw mode, subscription payloads are passed through as the bytes that were received, wrapped in the topic envelope,
+without being decoded and re-encoded. Payloads are not checked, and may not match the layout that JSONify produces.
+Raw mode is for relaying high-rate topics.
+
+Where many topics are subscribed, decoding and re-encoding the messages may take more than one core. With --shards N,
+messages are serialised and written by N worker processes, on one broker connection - each topic is given to one
+worker, by a hash of the topic, so that the messages of a topic stay in order. Each worker has its own connection to
+each domain socket, and appends to files with whole batches of lines; lines for stdout are written by the client
+itself. Routes changed on the control socket are passed to the workers, and latency statistics are kept as without
+shards. The state of the workers is written on SIGUSR1.
+
+Messages can also be routed with --route FILTER SINK, which may be repeated. FILTER is an MQTT topic filter - + matches
+one level and # matches any number of levels - and SINK is uds:PATH, file:PATH or stdout. Each message is written to
+every sink with a matching route, once, so several local consumers can share one subscription. A subscription to a
+domain socket is a route from its topic to that socket. Where routes are given, subscriptions without a domain socket
+are not written to stdout, unless there is a route to stdout.
+
+If a control socket is given with --control, routes and broker subscriptions can be added and removed while the
+client runs, without the client reconnecting. Each command is a JSON document on one line, and is answered on the same
+connection: {"cmd": "route", "topic": FILTER, "sink": SINK}, {"cmd": "unroute", "topic": FILTER, "sink": SINK},
+{"cmd": "routes"}, {"cmd": "subscribe", "topic": FILTER}, {"cmd": "unsubscribe", "topic": FILTER} or
+{"cmd": "subscriptions"}.
+
+A subscription made by the control socket is made on the live connection, and is made again whenever the client
+reconnects; it has its own queue, as the subscriptions given on the command line do, and its messages are written to
+the sinks of the routes that match them. A route that no subscription covers is answered with "covered": false, and
+receives nothing until a subscription that covers it is made. While the broker cannot be reached, subscribe and
+unsubscribe commands fail.
+
+For each message received, the rec field of its payload is compared with the time at which the message was received,
+and with the time at which it was written to its sockets, files or stdout. The latencies are held in a histogram for
+each topic, with the count and rate of messages. The statistics are written to stderr on SIGUSR1 and, if a file is
+given with --latency, saved to it every --interval seconds. Latencies include any difference between the clocks of the
+publishing device and this host.
 
 Note that there are currently no utilities to manage AWS configuration documents - these must be installed or edited
 by hand. This situation will change.
@@ -20,6 +88,26 @@ by hand. This situation will change.
 EXAMPLES
 ./aws_mqtt_client.py south-coast-science-dev/production-test/loc/1/gases
 
+./aws_mqtt_client.py -q 5000 -d drop-newest -s south-coast-science-dev/production-test/loc/1/gases /tmp/gases.uds
+
+./aws_mqtt_client.py -w 8 -p /tmp/publications.uds
+
+./aws_mqtt_client.py -w 8 -o ~/SCS/aws/spool -z 256 -p /tmp/publications.uds
+
+./aws_mqtt_client.py -r -q 10000 -s south-coast-science-dev/production-test/loc/1/gases /tmp/gases.uds
+
+./aws_mqtt_client.py -n 4 -q 10000 -t '#' uds:/tmp/all.uds 'south-coast-science-dev/#'
+
+./aws_mqtt_client.py -t '+/+/loc/+/gases' uds:/tmp/gases.uds -t '#' file:/tmp/all.jsonl 'south-coast-science-dev/#'
+
+./aws_mqtt_client.py -c /tmp/aws_mqtt_ctrl.uds -t '#' stdout south-coast-science-dev/production-test/loc/1/gases
+
+./aws_mqtt_client.py -l /tmp/latency.json -i 10 -s south-coast-science-dev/production-test/loc/1/gases /tmp/gases.uds
+
+echo '{"cmd": "route", "topic": "+/+/loc/+/gases", "sink": "uds:/tmp/gases.uds"}' | socat - UNIX:/tmp/aws_mqtt_ctrl.uds
+
+echo '{"cmd": "subscribe", "topic": "south-coast-science-dev/unep/loc/1/gases"}' | socat - UNIX:/tmp/aws_mqtt_ctrl.uds
+
 FILES
 ~/SCS/aws/client_credentials.json
 ~/SCS/aws/endpoint.json
@@ -31,7 +119,10 @@ FILES
 
 SEE ALSO
 scs_analysis/aws_mqtt_control
+scs_analysis/aws_mqtt_mux
 scs_analysis/aws_topic_publisher
+scs_analysis/partitioned_writer
+scs_analysis/uds_receiver
 
 BUGS
 When run as a background process, aws_mqtt_client will exit if it has no stdin stream.
@@ -42,9 +133,21 @@ import sys
 
 from collections import OrderedDict
 
+from scs_analysis.client.async_publisher import AsyncPublisher
 from scs_analysis.cmd.cmd_mqtt_client import CmdMQTTClient
-
-from scs_core.aws.client.mqtt_client import MQTTClient, MQTTSubscriber
+from scs_analysis.comms.aws_mqtt_handler import AWSMQTTHandler
+from scs_analysis.comms.aws_mqtt_live_client import AWSMQTTLiveClient
+from scs_analysis.comms.latency_stats import LatencyStats
+from scs_analysis.comms.publication_spool import PublicationSpool
+from scs_analysis.comms.route_control import RouteControl
+from scs_analysis.comms.route_sink import RouteSink
+from scs_analysis.comms.shard_pool import ShardPool
+from scs_analysis.comms.spool_drain import SpoolDrain
+from scs_analysis.comms.status_signal import StatusSignal
+from scs_analysis.comms.topic_router import TopicRouter
+from scs_analysis.comms.uds_reader import UDSReader
+
+from scs_core.aws.client.mqtt_client import MQTTSubscriber
 from scs_core.aws.client.client_credentials import ClientCredentials
 from scs_core.aws.service.endpoint import Endpoint
 
@@ -54,74 +157,26 @@ from scs_core.data.publication import Publication
 
 from scs_core.sys.exception_report import ExceptionReport
 
-from scs_host.comms.domain_socket import DomainSocket
 from scs_host.comms.stdio import StdIO
 
 from scs_host.sys.host import Host
 
 
-# --------------------------------------------------------------------------------------------------------------------
-# subscription handler...
-
-class AWSMQTTHandler(object):
-    """
-    classdocs
-    """
-
-    # ----------------------------------------------------------------------------------------------------------------
-
-    def __init__(self, comms=None, echo=False, verbose=False):
-        """
-        Constructor
-        """
-        self.__comms = comms
-
-        self.__echo = echo
-        self.__verbose = verbose
-
-
-    # ----------------------------------------------------------------------------------------------------------------
-
-    # noinspection PyUnusedLocal,PyShadowingNames
-    def handle(self, client, userdata, message):
-        payload = json.loads(message.payload.decode(), object_pairs_hook=OrderedDict)
-
-        pub = Publication(message.topic, payload)
-
-        try:
-            self.__comms.connect()
-            self.__comms.write(JSONify.dumps(pub), False)
-
-        except ConnectionRefusedError:
-            if self.__verbose:
-                print("AWSMQTTHandler: connection refused for %s" % self.__comms.address, file=sys.stderr)
-                sys.stderr.flush()
-
-        finally:
-            self.__comms.close()
-
-        if self.__echo:
-            print(JSONify.dumps(pub))
-            sys.stdout.flush()
-
-        if self.__verbose:
-            print("received: %s" % JSONify.dumps(pub), file=sys.stderr)
-            sys.stderr.flush()
-
-
-    # ----------------------------------------------------------------------------------------------------------------
-
-    def __str__(self, *args, **kwargs):
-        return "AWSMQTTHandler:{comms:%s, echo:%s, verbose:%s}" % \
-               (self.__comms, self.__echo, self.__verbose)
-
-
 # --------------------------------------------------------------------------------------------------------------------
 
 if __name__ == '__main__':
 
     client = None
+    publisher = None
+    spool = None
+    drain = None
+    status_signal = None
     pub_comms = None
+    sinks = {}
+    handlers = []
+    control = None
+    stats = None
+    pool = None
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -155,36 +210,163 @@ if __name__ == '__main__':
             exit(1)
 
         # comms...
-        pub_comms = DomainSocket(cmd.uds_pub_addr) if cmd.uds_pub_addr else StdIO()
+        pub_comms = UDSReader(cmd.uds_pub_addr) if cmd.uds_pub_addr else StdIO()
 
-        # subscribers...
-        subscribers = []
+        # routes - a subscription to a domain socket is a route, and routes may share sinks...
+        router = TopicRouter()
+
+        def sink(spec):
+            if spec not in sinks:
+                sinks[spec] = RouteSink.construct(spec)
+                sinks[spec].connect()
+
+            return sinks[spec]
 
         for subscription in cmd.subscriptions:
-            sub_comms = DomainSocket(subscription.address) if subscription.address else StdIO()
+            if subscription.address:
+                router.add(subscription.topic, sink(RouteSink.UDS + ':' + subscription.address))
+
+            elif not cmd.routes:
+                router.add(subscription.topic, sink(RouteSink.STDOUT))
+
+        for topic_filter, spec in cmd.routes:
+            router.add(topic_filter, sink(spec))
+
+        if cmd.verbose:
+            print(router, file=sys.stderr)
+
+        # latency statistics - shared by the handlers...
+        stats = LatencyStats(cmd.stats_file, cmd.stats_interval)
 
-            # handler...
-            handler = AWSMQTTHandler(sub_comms, cmd.echo, cmd.verbose)
+        # shards - each worker process serialises and writes its topics...
+        if cmd.shards > 1:
+            pool = ShardPool(cmd.shards, router, cmd.raw, stats, cmd.echo, cmd.verbose, cmd.queue_length,
+                             cmd.drop_policy)
+            pool.start()
+
+            if cmd.verbose:
+                print(pool, file=sys.stderr)
+
+        # subscribers - at startup, or by the control socket...
+        def subscriber(topic):
+            if pool is not None:
+                return MQTTSubscriber(topic, pool.handle)
+
+            # handler - with its own queue and writer thread...
+            handler = AWSMQTTHandler(router, cmd.echo, cmd.verbose, cmd.queue_length, cmd.drop_policy, topic,
+                                     cmd.raw, stats)
+            handler.start()
+
+            handlers.append(handler)
 
             if cmd.verbose:
                 print(handler, file=sys.stderr)
+                sys.stderr.flush()
+
+            return MQTTSubscriber(topic, handler.handle)
 
-            subscribers.append(MQTTSubscriber(subscription.topic, handler.handle))
+        def close_handler(topic):
+            for closing in [handler for handler in handlers if handler.queue.name == topic]:
+                handlers.remove(closing)
+                closing.close()
 
-        # client...
-        client = MQTTClient(*subscribers)
+        subscribers = [subscriber(subscription.topic) for subscription in cmd.subscriptions]
+
+        # client - a spool holds publications while the broker cannot be reached, so the SDK should not...
+        client = AWSMQTTLiveClient(*subscribers, offline_queueing=not cmd.spool)
 
         if cmd.verbose:
             print(client, file=sys.stderr)
             sys.stderr.flush()
 
 
+        # publisher...
+        def published(publication, success, ex):
+            if ex is not None:
+                print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+                sys.stderr.flush()
+
+            if cmd.verbose:
+                status = "done" if success else "failed: %s" % publication.topic
+                print("%s:         mqtt: %s" % (LocalizedDatetime.now().as_iso8601(), status), file=sys.stderr)
+                sys.stderr.flush()
+
+        publisher = AsyncPublisher(client.publish, cmd.window, published)
+
+        if cmd.verbose:
+            print(publisher, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # queue status on demand...
+        def print_status():
+            print(publisher, file=sys.stderr)
+
+            if spool is not None:
+                print(spool, file=sys.stderr)
+
+            for status_handler in list(handlers):
+                print(status_handler.queue, file=sys.stderr)
+
+            if pool is not None:
+                print(pool, file=sys.stderr)
+
+            for status_sink in list(sinks.values()):
+                print(status_sink, file=sys.stderr)
+
+            if control is not None:
+                print(control, file=sys.stderr)
+
+            print(JSONify.dumps(stats.as_json()), file=sys.stderr)
+
+            sys.stderr.flush()
+
+        status_signal = StatusSignal(print_status)
+        status_signal.start()
+
+
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
-        handler = AWSMQTTHandler()      # TODO: WTF?
-
         client.connect(endpoint, credentials)
+        publisher.start()
+
+        stats.start()
+
+        # control - routes and subscriptions may be changed from here on...
+        if cmd.uds_ctrl_addr:
+            def subscribe(topic):
+                try:
+                    client.subscribe(subscriber(topic))
+
+                except OSError:
+                    close_handler(topic)
+                    raise
+
+            def unsubscribe(topic):
+                client.unsubscribe(topic)
+                close_handler(topic)
+
+            control = RouteControl(cmd.uds_ctrl_addr, router, sink,
+                                   [subscription.topic for subscription in cmd.subscriptions], cmd.verbose,
+                                   subscribe, unsubscribe)
+            control.start()
+
+            if cmd.verbose:
+                print(control, file=sys.stderr)
+                sys.stderr.flush()
+
+        # spool - publications held since the last run are published first...
+        if cmd.spool:
+            spool = PublicationSpool(cmd.spool, cmd.spool_size * 1024 * 1024, sync=cmd.sync)
+            spool.open()
+
+            drain = SpoolDrain(spool, publisher, Publication.construct_from_jdict, published)
+            drain.start()
+
+            if cmd.verbose:
+                print(spool, file=sys.stderr)
+                sys.stderr.flush()
 
         pub_comms.connect()
 
@@ -194,13 +376,13 @@ if __name__ == '__main__':
             except ValueError:
                 continue
 
-            publication = Publication.construct_from_jdict(jdict)
-
-            client.publish(publication)
+            # the publication is spooled, then submitted by the drain...
+            if spool is not None:
+                spool.append(message)
 
-            if cmd.verbose:
-                print("%s:         mqtt: done" % LocalizedDatetime.now().as_iso8601(), file=sys.stderr)
-                sys.stderr.flush()
+            # ...or completed by the publisher's worker threads...
+            else:
+                publisher.submit(Publication.construct_from_jdict(jdict))
 
             if cmd.echo:
                 print(message)
@@ -218,8 +400,56 @@ if __name__ == '__main__':
         print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
 
     finally:
+        if status_signal:
+            status_signal.close()
+
+        if drain:
+            drain.close()
+
+        if publisher:
+            publisher.close()
+
+            if cmd.verbose:
+                print(publisher, file=sys.stderr)
+
+        if spool:
+            spool.close()
+
+            if cmd.verbose:
+                print(spool, file=sys.stderr)
+
+        if drain:
+            drain.join()
+
         if client:
             client.disconnect()
 
+        if pool:
+            pool.close()
+
+            if cmd.verbose:
+                print(pool, file=sys.stderr)
+
         if pub_comms:
             pub_comms.close()
+
+        if control:
+            control.close()
+
+            if cmd.verbose:
+                print(control, file=sys.stderr)
+
+        for handler in handlers:
+            handler.close()
+
+            if cmd.verbose:
+                print(handler, file=sys.stderr)
+
+        if stats:
+            stats.close()
+
+        for route_sink in list(sinks.values()):
+            route_sink.close()
+
+            if cmd.verbose:
+                print(route_sink, file=sys.stderr)
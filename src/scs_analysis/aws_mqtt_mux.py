@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The aws_mqtt_mux utility holds a single connection to the South Coast Science / AWS messaging infrastructure, and
+shares it between any number of local clients, which connect to a Unix domain socket. It may be used in place of
+aws_mqtt_client where several processes on a host need to subscribe or publish, since only one MQTT client should run
+at any one time, per TCP/IP host.
+
+The broker subscriptions are given on the command line, as MQTT topic filters. Each local client sends commands to the
+control socket, one JSON document per line:
+
+{"cmd": "subscribe", "topic": FILTER}
+{"cmd": "unsubscribe", "topic": FILTER}
+{"cmd": "publish", "topic": TOPIC, "payload": PAYLOAD}
+
+Messages from the broker are written back to each client with a matching subscription, one publication per line, in
+the same form as aws_mqtt_client. A client's subscriptions are matched against the messages received by the broker
+subscriptions - a client receives nothing for topics outside them. Each message is decoded and serialised once,
+however many clients receive it. When a client goes away, its subscriptions are removed.
+
+Each client has its own bounded queue, with the drop policy of aws_mqtt_client, so that a slow client does not hold up
+the others. Commands are not acknowledged; commands that cannot be parsed are reported to stderr. The state of the
+clients is written to stderr when the process receives SIGUSR1.
+
+Note that AWS endpoint specification and client credentials must be installed on the host for the aws_mqtt_mux to
+operate.
+
+EXAMPLES
+./aws_mqtt_mux.py -c /tmp/aws_mqtt_mux.uds -w 8 'south-coast-science-dev/#'
+
+(echo '{"cmd": "subscribe", "topic": "south-coast-science-dev/+/loc/1/#"}'; cat) | socat - UNIX:/tmp/aws_mqtt_mux.uds
+
+FILES
+~/SCS/aws/client_credentials.json
+~/SCS/aws/endpoint.json
+
+~/SCS/aws/certs/XXX-certificate.pem.crt
+~/SCS/aws/certs/XXX-private.pem.key
+~/SCS/aws/certs/XXX-public.pem.key
+~/SCS/aws/certs/root-CA.crt
+
+SEE ALSO
+scs_analysis/aws_mqtt_client
+"""
+
+import json
+import sys
+
+from collections import OrderedDict
+
+from scs_analysis.client.async_publisher import AsyncPublisher
+from scs_analysis.cmd.cmd_mqtt_mux import CmdMQTTMux
+from scs_analysis.comms.aws_mqtt_handler import AWSMQTTHandler
+from scs_analysis.comms.status_signal import StatusSignal
+from scs_analysis.comms.topic_router import TopicRouter
+from scs_analysis.comms.uds_server import UDSServer
+
+from scs_core.aws.client.mqtt_client import MQTTClient, MQTTSubscriber
+from scs_core.aws.client.client_credentials import ClientCredentials
+from scs_core.aws.service.endpoint import Endpoint
+
+from scs_core.data.json import JSONify
+from scs_core.data.publication import Publication
+
+from scs_core.sys.exception_report import ExceptionReport
+
+from scs_host.sys.host import Host
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    client = None
+    publisher = None
+    handler = None
+    server = None
+    status_signal = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdMQTTMux()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print(cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        # endpoint...
+        endpoint = Endpoint.load(Host)
+
+        if endpoint is None:
+            print("Endpoint config not available.", file=sys.stderr)
+            exit(1)
+
+        # credentials...
+        credentials = ClientCredentials.load(Host)
+
+        if credentials is None:
+            print("ClientCredentials not available.", file=sys.stderr)
+            exit(1)
+
+        # routes - each local client is a sink...
+        router = TopicRouter()
+
+        # handler...
+        handler = AWSMQTTHandler(router, False, False, cmd.queue_length, cmd.drop_policy, "aws_mqtt_mux", cmd.raw)
+
+        # client...
+        client = MQTTClient(*[MQTTSubscriber(topic, handler.handle) for topic in cmd.topics])
+
+        if cmd.verbose:
+            print(client, file=sys.stderr)
+
+        # publisher...
+        def published(publication, success, ex):
+            if ex is not None:
+                print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+                sys.stderr.flush()
+
+            elif not success:
+                print("aws_mqtt_mux: publication failed: %s" % publication.topic, file=sys.stderr)
+                sys.stderr.flush()
+
+        publisher = AsyncPublisher(client.publish, cmd.window, published)
+
+        # server...
+        server = UDSServer(cmd.uds_ctrl_addr, cmd.queue_length, cmd.drop_policy)
+
+        if cmd.verbose:
+            print(server, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # status on demand...
+        def print_status():
+            print(handler, file=sys.stderr)
+            print(publisher, file=sys.stderr)
+            print(server, file=sys.stderr)
+
+            for status_connection in server.connections:
+                print(status_connection, file=sys.stderr)
+
+            sys.stderr.flush()
+
+        status_signal = StatusSignal(print_status)
+        status_signal.start()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        client.connect(endpoint, credentials)
+
+        handler.start()
+        publisher.start()
+
+        server.connect()
+
+        for connection, line in server.read():
+            # client gone...
+            if line is None:
+                router.remove_sink(connection)
+                connection.close()
+
+                if cmd.verbose:
+                    print("aws_mqtt_mux: closed: %s" % connection, file=sys.stderr)
+                    sys.stderr.flush()
+
+                continue
+
+            # command...
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+
+                command = jdict['cmd']
+                topic = jdict['topic']
+
+                if command == 'subscribe':
+                    router.add(topic, connection)
+
+                elif command == 'unsubscribe':
+                    router.remove(topic, connection)
+
+                elif command == 'publish':
+                    publisher.submit(Publication(topic, jdict['payload']))
+
+                else:
+                    raise ValueError("unknown command: %s" % command)
+
+            except (ValueError, KeyError, TypeError) as ex:
+                print("aws_mqtt_mux: %s: %s: %s" % (connection.name, ex.__class__.__name__, line), file=sys.stderr)
+                sys.stderr.flush()
+                continue
+
+            if cmd.verbose and command != 'publish':
+                print("aws_mqtt_mux: %s: %s %s" % (connection.name, command, topic), file=sys.stderr)
+                sys.stderr.flush()
+
+
+        # ----------------------------------------------------------------------------------------------------------------
+        # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("aws_mqtt_mux: KeyboardInterrupt", file=sys.stderr)
+
+    except Exception as ex:
+        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+    finally:
+        if status_signal:
+            status_signal.close()
+
+        if publisher:
+            publisher.close()
+
+            if cmd.verbose:
+                print(publisher, file=sys.stderr)
+
+        if client:
+            client.disconnect()
+
+        if handler:
+            handler.close()
+
+            if cmd.verbose:
+                print(handler, file=sys.stderr)
+
+        if server:
+            server.close()
+
+            if cmd.verbose:
+                print(server, file=sys.stderr)
@@ -12,23 +12,61 @@ Data can be retrieved by start or start + end localised date / times, or by minu
 Note that no check is made for the existence of the topic - if the topic does not exist, then no error is raised and
 no data is returned.
 
+The period is divided into time slices, which are written as they arrive - the next slice is fetched while the
+current slice is written. With the --parallel option, several slices are fetched concurrently. Messages are always
+written in order. Each page of a response is parsed as it arrives, and is never held as a whole.
+
+With the --cache option, the slices are hourly buckets. Whole buckets that closed more than ten minutes ago are
+kept in a local cache, and are not fetched again. The cache is limited in size: the least-recently-used buckets are
+evicted first.
+
+Requests are paced by a token-bucket rate limiter, shared by all workers - and, through a lock file, by every process
+that uses the same API key. When the server responds with 429 Too Many Requests or 503 Service Unavailable, the rate
+is halved and requests are held off - for the Retry-After period, if one is given, otherwise for an exponential
+backoff with jitter. The rate then recovers gradually, up to --rate.
+
+If more than one topic is given, the topics are fetched concurrently, and their messages are merged in order of rec.
+Each document is then tagged by its topic, in the form {"topic": document}.
+
+With the --checkpoint option, the position after the last message written for each topic is recorded in FILE, as the
+pull progresses and when it stops. If FILE exists, the pull that it records is resumed - the period given on the
+command line, if any, is ignored - and no message is written twice. FILE is deleted when the pull is complete.
+
+With the --follow option, the tool does not stop at the end of the period - or now, if no period is given - but polls
+for new messages, as tail -f does. Each poll starts a minute before the latest rec seen, to pick up messages that
+arrive late, and messages already written are recognised by their rec and a digest of their payload. The poll
+interval shortens while messages are arriving, and lengthens - up to two minutes - while they are not.
+
 EXAMPLES
 ./aws_topic_history.py south-coast-science-dev/production-test/loc/1/gases -m1 -v -w
+./aws_topic_history.py south-coast-science-dev/production-test/loc/1/gases -s 2017-10-01T00:00:00Z -n 8 -v
+./aws_topic_history.py south-coast-science-dev/production-test/loc/1/gases south-coast-science-dev/unep/loc/1/gases -m60
+./aws_topic_history.py south-coast-science-dev/production-test/loc/1/gases -s 2017-10-01T00:00:00Z -k pull.json
+./aws_topic_history.py south-coast-science-dev/production-test/loc/1/gases -m10 -f
+
+FILES
+~/SCS/cache/aws/
+~/SCS/limiter/
 """
 
 import sys
 
 from scs_analysis.cmd.cmd_aws_topic_history import CmdAWSTopicHistory
+from scs_analysis.client.http_connection_pool import HTTPConnectionPool
+from scs_analysis.client.pooled_http_client import PooledHTTPClient
+from scs_analysis.client.rate_limiter import RateLimiter
+from scs_analysis.client.shared_limiter_store import SharedLimiterStore
+from scs_analysis.history.aws_message_reader import AWSMessageReader
+from scs_analysis.history.history_cache import HistoryCache
+from scs_analysis.history.topic_history import TopicHistory
 
 from scs_core.aws.client.api_auth import APIAuth
-from scs_core.aws.manager.message_manager import MessageManager
+from scs_core.aws.data.message import Message
 
 from scs_core.data.json import JSONify
-from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sys.exception_report import ExceptionReport
 
-from scs_host.client.http_client import HTTPClient
 from scs_host.sys.host import Host
 
 
@@ -36,7 +74,7 @@ from scs_host.sys.host import Host
 
 if __name__ == '__main__':
 
-    agent = None
+    history = None
 
     # ----------------------------------------------------------------------------------------------------------------
     # cmd...
@@ -65,38 +103,47 @@ if __name__ == '__main__':
             print(api_auth, file=sys.stderr)
             sys.stderr.flush()
 
-        # message manager...
-        message_manager = MessageManager(HTTPClient(), api_auth.api_key, cmd.verbose)
+        # cache...
+        cache = HistoryCache.construct('aws', Message.construct_from_jdict, cmd.cache_size) if cmd.cache else None
+
+        if cmd.verbose and cache:
+            print(cache, file=sys.stderr)
+
+        # connection pool - shared by all managers...
+        pool = HTTPConnectionPool()
+
+        # rate limiter - shared by all workers, and all processes using this API key...
+        limiter = RateLimiter(cmd.rate, store=SharedLimiterStore.construct('aws', api_auth.api_key))
+
+        # fetcher - one message reader per worker...
+        def fetch_factory():
+            fetch = AWSMessageReader(PooledHTTPClient(pool, limiter), api_auth, cmd.verbose).find_for_topic
+
+            return fetch if cache is None else cache.cached(fetch)
+
+        history = TopicHistory(cmd, fetch_factory, lambda message: message.payload, cache)
 
         if cmd.verbose:
-            print(message_manager, file=sys.stderr)
+            print(history.fetcher, file=sys.stderr)
 
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
-        # time...
-        if cmd.use_offset():
-            end = LocalizedDatetime.now()
-            start = end.timedelta(minutes=-cmd.minutes)
-        else:
-            end = LocalizedDatetime.now() if cmd.end is None else cmd.end
-            start = cmd.start
+        # history...
+        if not history.open():
+            exit(1)
 
-        if cmd.verbose:
-            print("start: %s" % start, file=sys.stderr)
-            print("end: %s" % end, file=sys.stderr)
-            sys.stderr.flush()
+        history.run()
 
-        # messages...
-        messages = message_manager.find_for_topic(cmd.path, start, end)
+        if cmd.verbose:
+            print("total: %d" % history.count, file=sys.stderr)
 
-        for message in messages:
-            document = message if cmd.include_wrapping else message.payload
-            print(JSONify.dumps(document))
+            print(pool, file=sys.stderr)
+            print(limiter, file=sys.stderr)
 
-        if cmd.verbose:
-            print("total: %d" % len(messages), file=sys.stderr)
+            if cache:
+                print(cache, file=sys.stderr)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -106,5 +153,12 @@ if __name__ == '__main__':
         if cmd.verbose:
             print("aws_topic_history: KeyboardInterrupt", file=sys.stderr)
 
+            if history is not None and history.follower:
+                print(history.follower, file=sys.stderr)
+
     except Exception as ex:
         print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+    finally:
+        if history is not None:
+            history.close()
@@ -0,0 +1,244 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A publisher that keeps up to window publications in flight at once, so that publishing is not held to one
+publication per round trip to the broker.
+
+The MQTT clients publish synchronously - each publish(..) waits for the broker's acknowledgement - so each publication
+in flight is published by a worker thread. submit(..) returns as soon as the publication is queued, unless the window
+is full, when it waits for a publication to complete.
+
+Publications on the same topic are published one at a time, in the order that they were submitted, so that order
+within a topic is preserved - including when a publish is retried. Publications on different topics overlap.
+
+The callback is called by the worker thread as callback(publication, success, ex) when each publication completes -
+success is the truth of publish(..)'s return value, and ex is the exception that it raised, if any. Callbacks for a
+topic are called in the order of its publications. An exception raised by a callback does not stop the worker - it is
+written to stderr, and counted.
+"""
+
+import sys
+import threading
+import time
+
+from collections import OrderedDict, deque
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class AsyncPublisher(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_WINDOW = 1                              # publications in flight
+
+    __JOIN_TIMEOUT = 10.0                           # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, publish, window=DEFAULT_WINDOW, callback=None):
+        """
+        Constructor - publish(publication) is called by a worker thread, and should block until it completes
+        """
+        if int(window) < 1:
+            raise ValueError("window must be at least 1: %s" % window)
+
+        self.__publish = publish                        # callable
+        self.__window = int(window)                     # int
+        self.__callback = callback                      # callable (may be None)
+
+        self.__lanes = OrderedDict()                    # dict of topic: deque of (publication, callback)
+        self.__ready = deque()                          # deque of topic    waiting, with nothing in flight
+        self.__condition = threading.Condition()
+
+        self.__threads = []                             # list of threading.Thread
+        self.__running = False                          # bool
+
+        self.__in_flight = 0                            # int               submitted, not completed
+        self.__max_in_flight = 0                        # int               high-water mark
+
+        self.__submit_count = 0                         # int
+        self.__success_count = 0                        # int
+        self.__fail_count = 0                           # int
+        self.__wait_time = 0.0                          # float             seconds spent waiting in submit(..)
+        self.__callback_error_count = 0                 # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        with self.__condition:
+            if self.__running:
+                return
+
+            self.__running = True
+
+        for i in range(self.__window):
+            thread = threading.Thread(target=self.__run, name="AsyncPublisher:%d" % i, daemon=True)
+            thread.start()
+
+            self.__threads.append(thread)
+
+
+    def close(self):
+        """
+        completes the publications already submitted, then stops the worker threads
+        """
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+
+        deadline = time.time() + self.__JOIN_TIMEOUT
+
+        for thread in self.__threads:
+            thread.join(max(deadline - time.time(), 0.0))
+
+        self.__threads = []
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def submit(self, publication, callback=None):
+        """
+        queues the publication, waiting while the window is full - callback, if given, replaces the default callback
+        """
+        with self.__condition:
+            if self.__in_flight >= self.__window:
+                started = time.time()
+
+                while self.__running and self.__in_flight >= self.__window:
+                    self.__condition.wait()
+
+                self.__wait_time += time.time() - started
+
+            if not self.__running:
+                raise RuntimeError("AsyncPublisher is not running")
+
+            topic = publication.topic
+
+            if topic not in self.__lanes:
+                self.__lanes[topic] = deque()
+                self.__ready.append(topic)
+
+            self.__lanes[topic].append((publication, callback))
+
+            self.__in_flight += 1
+            self.__max_in_flight = max(self.__max_in_flight, self.__in_flight)
+            self.__submit_count += 1
+
+            self.__condition.notify_all()
+
+
+    def flush(self):
+        """
+        waits until every publication submitted has completed
+        """
+        with self.__condition:
+            while self.__threads and self.__in_flight > 0:
+                self.__condition.wait()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                while not self.__ready:
+                    if not self.__running and self.__in_flight == 0:
+                        return
+
+                    self.__condition.wait()
+
+                # the topic leaves ready while its publication is in flight...
+                topic = self.__ready.popleft()
+                publication, callback = self.__lanes[topic].popleft()
+
+            try:
+                success = bool(self.__publish(publication))
+                error = None
+
+            except Exception as ex:
+                success = False
+                error = ex
+
+            callback = self.__callback if callback is None else callback
+
+            if callback is not None:
+                try:
+                    callback(publication, success, error)
+
+                except Exception as ex:                         # a callback must not stop the worker
+                    print("AsyncPublisher: callback: %s: %s" % (ex.__class__.__name__, ex), file=sys.stderr)
+                    sys.stderr.flush()
+
+                    with self.__condition:
+                        self.__callback_error_count += 1
+
+            with self.__condition:
+                if success:
+                    self.__success_count += 1
+                else:
+                    self.__fail_count += 1
+
+                if self.__lanes[topic]:
+                    self.__ready.append(topic)
+                else:
+                    del self.__lanes[topic]
+
+                self.__in_flight -= 1
+                self.__condition.notify_all()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def window(self):
+        return self.__window
+
+
+    @property
+    def in_flight(self):
+        return self.__in_flight
+
+
+    @property
+    def max_in_flight(self):
+        return self.__max_in_flight
+
+
+    @property
+    def submit_count(self):
+        return self.__submit_count
+
+
+    @property
+    def success_count(self):
+        return self.__success_count
+
+
+    @property
+    def fail_count(self):
+        return self.__fail_count
+
+
+    @property
+    def wait_time(self):
+        return self.__wait_time
+
+
+    @property
+    def callback_error_count(self):
+        return self.__callback_error_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "AsyncPublisher:{window:%s, in_flight:%s, max_in_flight:%s, submit_count:%s, success_count:%s, " \
+               "fail_count:%s, wait_time:%0.3f, callback_error_count:%s}" % \
+               (self.window, self.in_flight, self.max_in_flight, self.submit_count, self.success_count,
+                self.fail_count, self.wait_time, self.callback_error_count)
@@ -0,0 +1,254 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A thread-safe pool of keep-alive HTTP and HTTPS connections, shared by all the HTTP clients of a process.
+
+A connection is taken from the pool for each request, and returned when its response has been read, so that the next
+request to the same host - from any client - re-uses the open connection instead of paying for TCP and TLS setup.
+Where a new TLS connection must be made, it resumes the most recent TLS session with that host, which abbreviates the
+handshake. SSL contexts are created once per pool.
+
+An idle connection that the server has closed - its socket is readable, at EOF - is found to be stale when it is
+taken from the pool, and is closed, so that no request is sent on it.
+
+https://docs.python.org/3/library/ssl.html#ssl-session
+"""
+
+import http.client
+import select
+import ssl
+import threading
+
+from collections import deque
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class HTTPConnectionPool(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_MAX_IDLE = 8                        # idle connections kept, per host
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, max_idle=DEFAULT_MAX_IDLE):
+        """
+        Constructor
+        """
+        self.__max_idle = int(max_idle)                 # int
+
+        self.__lock = threading.Lock()
+
+        self.__idle = {}                                # dict of key: deque of connection, most-recently-used last
+        self.__contexts = {}                            # dict of verified: SSLContext
+        self.__sessions = {}                            # dict of host: SSLSession
+
+        self.__connect_count = 0                        # int
+        self.__reuse_count = 0                          # int
+        self.__resume_count = 0                         # int       TLS sessions resumed
+        self.__stale_count = 0                          # int       idle connections closed by the server
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def acquire(self, host, secure=True, verified=True, timeout=None):
+        """
+        returns (connection, reused) - the connection must be returned to the pool with release(..) or discard(..)
+        """
+        key = (host, secure, verified, timeout)
+        stale = []
+
+        with self.__lock:
+            idle = self.__idle.get(key)
+
+            while idle:
+                connection = idle.pop()
+
+                if self.__is_stale(connection):
+                    stale.append(connection)
+                    continue
+
+                self.__reuse_count += 1
+                break
+
+            else:
+                connection = None
+                self.__connect_count += 1
+
+                context = self.__context(verified) if secure else None
+
+            self.__stale_count += len(stale)
+
+        for stale_connection in stale:
+            stale_connection.close()
+
+        if connection is not None:
+            return connection, True
+
+        if secure:
+            return _PooledHTTPSConnection(self, key, host, context, timeout), False
+
+        return _PooledHTTPConnection(key, host, timeout), False
+
+
+    def release(self, connection):
+        if connection.sock is None:                     # closed by the server, or by a failed request
+            return
+
+        with self.__lock:
+            idle = self.__idle.setdefault(connection.key, deque())
+            idle.append(connection)
+
+            if len(idle) <= self.__max_idle:
+                return
+
+            surplus = idle.popleft()
+
+        surplus.close()
+
+
+    @staticmethod
+    def discard(connection):
+        connection.close()
+
+
+    def close(self):
+        with self.__lock:
+            connections = [connection for idle in self.__idle.values() for connection in idle]
+            self.__idle = {}
+
+        for connection in connections:
+            connection.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def session(self, host):
+        with self.__lock:
+            return self.__sessions.get(host)
+
+
+    def save_session(self, host, session):
+        if session is None:
+            return
+
+        with self.__lock:
+            self.__sessions[host] = session
+
+
+    def session_resumed(self):
+        with self.__lock:
+            self.__resume_count += 1
+
+
+    @staticmethod
+    def __is_stale(connection):
+        # an idle connection has no response pending - if its socket is readable, the server has closed it...
+        try:
+            readable, _, _ = select.select([connection.sock], [], [], 0)
+
+        except (OSError, ValueError):
+            return True
+
+        return bool(readable)
+
+
+    def __context(self, verified):
+        context = self.__contexts.get(verified)
+
+        if context is None:
+            # noinspection PyProtectedMember
+            context = ssl.create_default_context() if verified else ssl._create_unverified_context()
+            self.__contexts[verified] = context
+
+        return context
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def max_idle(self):
+        return self.__max_idle
+
+
+    @property
+    def connect_count(self):
+        return self.__connect_count
+
+
+    @property
+    def reuse_count(self):
+        return self.__reuse_count
+
+
+    @property
+    def resume_count(self):
+        return self.__resume_count
+
+
+    @property
+    def stale_count(self):
+        return self.__stale_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "HTTPConnectionPool:{max_idle:%s, connect_count:%s, reuse_count:%s, resume_count:%s, stale_count:%s}" % \
+               (self.max_idle, self.connect_count, self.reuse_count, self.resume_count, self.stale_count)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _PooledHTTPConnection(http.client.HTTPConnection):
+    """
+    classdocs
+    """
+
+    def __init__(self, key, host, timeout):
+        if timeout is None:
+            super().__init__(host)
+        else:
+            super().__init__(host, timeout=timeout)
+
+        self.key = key
+
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    """
+    classdocs
+    """
+
+    def __init__(self, pool, key, host, context, timeout):
+        if timeout is None:
+            super().__init__(host, context=context)
+        else:
+            super().__init__(host, timeout=timeout, context=context)
+
+        self.key = key
+        self.__pool = pool
+
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+
+        # noinspection PyUnresolvedReferences
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host,
+                                              session=self.__pool.session(self.host))
+
+        if self.sock.session_reused:
+            self.__pool.session_resumed()
+
+
+    def getresponse(self):
+        response = super().getresponse()
+
+        # with TLS 1.3, the session ticket arrives after the handshake...
+        self.__pool.save_session(self.host, getattr(self.sock, 'session', None))
+
+        return response
@@ -0,0 +1,299 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+An incremental parser for paged API responses - JSON objects that hold an array of items and a few other fields, such
+as {"Items": [...], "next": "..."} - or for a JSON array of items.
+
+Text is fed to the parser as it arrives. Each item is returned as soon as its closing brace has been fed, so decoding
+overlaps the transfer, and only the text of the item in progress is held - the page as a whole is never held, as
+text or as a decoded document. The other fields of the object are available from fields.
+
+Items are decoded by the standard library's JSON decoder. An item that is split between chunks is located by a scan
+of its structural characters - braces, brackets and strings - which resumes where it stopped as more text arrives.
+Malformed text raises ValueError.
+"""
+
+import json
+import re
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class JSONStreamParser(object):
+    """
+    classdocs
+    """
+
+    __DOCUMENT = 'document'
+    __KEY = 'key'
+    __COLON = 'colon'
+    __VALUE = 'value'
+    __ITEMS = 'items'
+    __END = 'end'
+
+    __SEPARATORS = re.compile(r'[\s,]*')
+    __STRUCTURE = re.compile(r'["{}\[\]]')
+    __STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+    __SCALAR_END = re.compile(r'[\s,}\]]')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, items_key=None, object_pairs_hook=OrderedDict):
+        """
+        Constructor - items_key names the array field of the object, or is None if the document is an array
+        """
+        self.__items_key = items_key                                    # string (may be None)
+        self.__decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+
+        self.__fields = OrderedDict()                                   # dict of key: value
+
+        self.__buffer = ''                                              # string        unconsumed text
+        self.__pos = 0                                                  # int           consumed up to
+        self.__state = self.__DOCUMENT                                  # string
+        self.__key = None                                               # string        key of current field
+
+        self.__scan_pos = None                                          # int           container scan resumes at
+        self.__scan_depth = 0                                           # int
+
+        self.__item_count = 0                                           # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def feed(self, text):
+        """
+        returns the list of items completed by the text
+        """
+        # drop consumed text...
+        if self.__pos:
+            if self.__scan_pos is not None:
+                self.__scan_pos -= self.__pos
+
+            self.__buffer = self.__buffer[self.__pos:]
+            self.__pos = 0
+
+        self.__buffer += text
+
+        items = []
+
+        while self.__step(items):
+            pass
+
+        self.__item_count += len(items)
+
+        return items
+
+
+    def close(self):
+        """
+        raises ValueError if the document is incomplete
+        """
+        if self.__state != self.__END:
+            raise ValueError("incomplete JSON document in state: %s" % self.__state)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __step(self, items):
+        """
+        consumes one token or value - returns False if more text is needed
+        """
+        buffer = self.__buffer
+
+        if self.__scan_pos is None:
+            self.__pos = self.__SEPARATORS.match(buffer, self.__pos).end()
+
+        if self.__pos >= len(buffer):
+            return False
+
+        char = buffer[self.__pos]
+
+        if self.__state == self.__DOCUMENT:
+            if char == '{' and self.__items_key is not None:
+                self.__state = self.__KEY
+
+            elif char == '[' and self.__items_key is None:
+                self.__state = self.__ITEMS
+
+            else:
+                raise ValueError("unexpected %s at start of document" % repr(char))
+
+            self.__pos += 1
+            return True
+
+        if self.__state == self.__KEY:
+            if char == '}':
+                self.__state = self.__END
+                self.__pos += 1
+                return True
+
+            if char != '"':
+                raise ValueError("expected key, found %s" % repr(char))
+
+            end = self.__scan_string(self.__pos)
+
+            if end is None:
+                return False
+
+            self.__key, self.__pos = self.__decoder.raw_decode(buffer, self.__pos)
+            self.__state = self.__COLON
+            return True
+
+        if self.__state == self.__COLON:
+            if char != ':':
+                raise ValueError("expected colon, found %s" % repr(char))
+
+            self.__state = self.__VALUE
+            self.__pos += 1
+            return True
+
+        if self.__state == self.__VALUE:
+            if self.__key == self.__items_key and char == '[':
+                self.__state = self.__ITEMS
+                self.__pos += 1
+                return True
+
+            value = self.__scan_value(char)
+
+            if value is None:
+                return False
+
+            self.__fields[self.__key] = value[0]
+            self.__state = self.__KEY
+            return True
+
+        if self.__state == self.__ITEMS:
+            if char == ']':
+                self.__state = self.__END if self.__items_key is None else self.__KEY
+                self.__pos += 1
+                return True
+
+            value = self.__scan_value(char)
+
+            if value is None:
+                return False
+
+            items.append(value[0])
+            return True
+
+        if self.__state == self.__END:
+            raise ValueError("unexpected %s after end of document" % repr(char))
+
+        return False
+
+
+    def __scan_value(self, char):
+        """
+        returns (value, ) if the value at pos is complete, or None
+        """
+        buffer = self.__buffer
+        start = self.__pos
+
+        if char == '{' or char == '[':
+            # most items are complete...
+            if self.__scan_pos is None:
+                try:
+                    value, self.__pos = self.__decoder.raw_decode(buffer, start)
+                    return value,
+
+                except ValueError:
+                    pass
+
+            end = self.__scan_container(start)
+
+        elif char == '"':
+            end = self.__scan_string(start)
+
+        else:
+            match = self.__SCALAR_END.search(buffer, start)
+            end = None if match is None else match.start()
+
+        if end is None:
+            return None
+
+        value, self.__pos = self.__decoder.raw_decode(buffer, start)
+
+        if self.__pos != end:
+            raise ValueError("malformed value at: %s" % repr(buffer[start:end]))
+
+        return value,
+
+
+    def __scan_container(self, start):
+        """
+        returns the end of the object or array at start, or None - the scan resumes where it stopped
+        """
+        buffer = self.__buffer
+
+        if self.__scan_pos is None:
+            self.__scan_pos = start
+            self.__scan_depth = 0
+
+        pos = self.__scan_pos
+        depth = self.__scan_depth
+
+        while True:
+            match = self.__STRUCTURE.search(buffer, pos)
+
+            if match is None:
+                pos = len(buffer)
+                break
+
+            char = match.group()
+            pos = match.start()
+
+            if char == '"':
+                end = self.__scan_string(pos)
+
+                if end is None:
+                    break
+
+                pos = end
+                continue
+
+            pos += 1
+            depth += 1 if char in '{[' else -1
+
+            if depth == 0:
+                self.__scan_pos = None
+                return pos
+
+        self.__scan_pos = pos
+        self.__scan_depth = depth
+
+        return None
+
+
+    def __scan_string(self, start):
+        match = self.__STRING.match(self.__buffer, start)
+
+        return None if match is None else match.end()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def fields(self):
+        return self.__fields
+
+
+    @property
+    def item_count(self):
+        return self.__item_count
+
+
+    @property
+    def complete(self):
+        return self.__state == self.__END
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "JSONStreamParser:{items_key:%s, state:%s, item_count:%s, buffered:%s, fields:%s}" % \
+               (self.__items_key, self.__state, self.item_count, len(self.__buffer) - self.__pos, dict(self.fields))
@@ -0,0 +1,110 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+The mutable state of a RateLimiter token bucket, with a fixed-size binary form, so that it can be shared by processes
+through a file.
+"""
+
+import struct
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LimiterState(object):
+    """
+    classdocs
+    """
+
+    __PACKING = struct.Struct('<ddddI')             # rate, tokens, updated, hold_until, failures
+
+    SIZE = __PACKING.size
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct_from_bytes(cls, data):
+        if len(data) < cls.SIZE:
+            return None
+
+        return cls(*cls.__PACKING.unpack_from(data))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, rate, tokens, updated, hold_until, failures):
+        """
+        Constructor
+        """
+        self.__rate = float(rate)                       # float     requests per second
+        self.__tokens = float(tokens)                   # float
+        self.__updated = float(updated)                 # float     epoch seconds
+        self.__hold_until = float(hold_until)           # float     epoch seconds
+        self.__failures = int(failures)                 # int       consecutive
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_bytes(self):
+        return self.__PACKING.pack(self.rate, self.tokens, self.updated, self.hold_until, self.failures)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def rate(self):
+        return self.__rate
+
+
+    @rate.setter
+    def rate(self, rate):
+        self.__rate = rate
+
+
+    @property
+    def tokens(self):
+        return self.__tokens
+
+
+    @tokens.setter
+    def tokens(self, tokens):
+        self.__tokens = tokens
+
+
+    @property
+    def updated(self):
+        return self.__updated
+
+
+    @updated.setter
+    def updated(self, updated):
+        self.__updated = updated
+
+
+    @property
+    def hold_until(self):
+        return self.__hold_until
+
+
+    @hold_until.setter
+    def hold_until(self, hold_until):
+        self.__hold_until = hold_until
+
+
+    @property
+    def failures(self):
+        return self.__failures
+
+
+    @failures.setter
+    def failures(self, failures):
+        self.__failures = failures
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LimiterState:{rate:%s, tokens:%s, updated:%s, hold_until:%s, failures:%s}" % \
+               (self.rate, self.tokens, self.updated, self.hold_until, self.failures)
@@ -0,0 +1,50 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Holds RateLimiter state in memory, for the threads of one process.
+"""
+
+import threading
+
+from contextlib import contextmanager
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LocalLimiterStore(object):
+    """
+    classdocs
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__lock = threading.Lock()
+        self.__state = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @contextmanager
+    def transaction(self, initial_state):
+        """
+        yields the LimiterState - initial_state() is used on the first transaction
+        """
+        with self.__lock:
+            if self.__state is None:
+                self.__state = initial_state()
+
+            yield self.__state
+
+
+    def close(self):
+        pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LocalLimiterStore:{}"
@@ -0,0 +1,272 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+An HTTP client with the interface of scs_host's HTTPClient, whose connections are drawn from a shared
+HTTPConnectionPool, and whose requests may be paced by a shared RateLimiter. Clients are cheap - each manager may have
+its own - and close() leaves the pooled connections open for re-use.
+
+Responses may be gzip-encoded. Requests that are refused with 429 Too Many Requests or 503 Service Unavailable are
+retried once the limiter's hold-off period - set from the Retry-After header where there is one - has passed.
+
+A request that fails for network reasons before it is sent - the connection could not be made - is retried after an
+exponential backoff, whatever its method. A request that fails once it has been sent is retried only if its method is
+idempotent - GET, HEAD, PUT, DELETE or OPTIONS - since the server may already have acted on it: a POST is never sent
+twice, and its failure is raised. A failed idempotent request on a re-used pooled connection is retried immediately,
+on a new connection. Other failures are raised as HTTPException, as they are by HTTPClient.
+
+The stream(..) method returns the body of a successful GET response as a sequence of text chunks, decompressed and
+decoded as they arrive, so that the caller can parse the response while it is being transferred. A stream that fails
+part-way is not retried.
+"""
+
+import codecs
+import gzip
+import http.client
+import time
+import urllib.parse
+import zlib
+
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+from scs_analysis.client.rate_limiter import RateLimiter
+
+from scs_core.sys.http_exception import HTTPException
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PooledHTTPClient(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_MAX_RETRIES = 8
+
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')          # RFC 7231 section 4.2.2
+
+    DEFAULT_CHUNK_SIZE = 65536                              # bytes
+
+    __THROTTLE_STATUSES = (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def retry_after(response):
+        """
+        returns the Retry-After period in seconds, or None - the header may be a number of seconds or an HTTP-date
+        """
+        value = response.getheader('Retry-After')
+
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+
+        except (TypeError, ValueError):
+            return None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, pool, limiter=None, max_retries=DEFAULT_MAX_RETRIES):
+        """
+        Constructor
+        """
+        self.__pool = pool                                      # HTTPConnectionPool
+        self.__limiter = limiter                                # RateLimiter (may be None)
+        self.__max_retries = int(max_retries)                   # int
+
+        self.__host = None
+        self.__secure = True
+        self.__verified = True
+        self.__timeout = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, host, secure=True, verified=True, timeout=None):
+        self.__host = host
+        self.__secure = secure
+        self.__verified = verified
+        self.__timeout = timeout
+
+
+    def close(self):
+        pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def get(self, path, payload, headers):
+        params = urllib.parse.urlencode(payload) if payload else None
+        query = path + '?' + params if params else path
+
+        return self.__request("GET", query, None, headers, (HTTPStatus.OK, ))
+
+
+    def stream(self, path, payload, headers, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        yields the text of the response in chunks of up to chunk_size bytes, as they arrive
+        """
+        params = urllib.parse.urlencode(payload) if payload else None
+        query = path + '?' + params if params else path
+
+        connection, response = self.__request("GET", query, None, headers, (HTTPStatus.OK, ), streamed=True)
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) \
+            if response.getheader('Content-Encoding', '').lower() == 'gzip' else None
+
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        complete = False
+
+        try:
+            while True:
+                data = response.read1(chunk_size)
+
+                if not data:
+                    break
+
+                if decompressor is not None:
+                    data = decompressor.decompress(data)
+
+                text = decoder.decode(data)
+
+                if text:
+                    yield text
+
+            tail = decoder.decode(decompressor.flush() if decompressor is not None else b'', final=True)
+
+            if tail:
+                yield tail
+
+            complete = True
+
+        finally:
+            if complete:
+                self.__pool.release(connection)
+            else:
+                self.__pool.discard(connection)
+
+
+    def post(self, path, payload, headers):
+        return self.__request("POST", path, payload, headers, (HTTPStatus.OK, HTTPStatus.CREATED))
+
+
+    def put(self, path, payload, headers):
+        return self.__request("PUT", path, payload, headers, (HTTPStatus.OK, HTTPStatus.NO_CONTENT))
+
+
+    def delete(self, path, headers):
+        return self.__request("DELETE", path, "", headers, (HTTPStatus.OK, HTTPStatus.NO_CONTENT))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __request(self, method, url, body, headers, ok_statuses, streamed=False):
+        """
+        returns the decoded body - or, if streamed, the (connection, response) whose body has not been read
+        """
+        headers = dict(headers or {})
+        headers['Accept-Encoding'] = 'gzip'
+
+        failures = 0
+
+        while True:
+            if self.__limiter is not None:
+                self.__limiter.acquire()
+
+            connection, reused = self.__pool.acquire(self.__host, self.__secure, self.__verified, self.__timeout)
+            sent = False
+
+            try:
+                if connection.sock is None:
+                    connection.connect()                        # nothing has been sent if this fails
+
+                sent = True
+                connection.request(method, url, body=body, headers=headers)
+
+                response = connection.getresponse()
+
+                if streamed and response.status in ok_statuses:
+                    if self.__limiter is not None:
+                        self.__limiter.healthy()
+
+                    return connection, response
+
+                data = response.read()
+
+            except (OSError, http.client.HTTPException):
+                self.__pool.discard(connection)
+
+                # the server may have acted on the request...
+                if sent and method not in self.IDEMPOTENT_METHODS:
+                    raise
+
+                # an idle connection closed by the server...
+                if reused:
+                    continue
+
+                failures += 1
+
+                if failures > self.__max_retries:
+                    raise
+
+                time.sleep(RateLimiter.backoff(failures))
+                continue
+
+            self.__pool.release(connection)
+
+            if response.getheader('Content-Encoding', '').lower() == 'gzip':
+                data = gzip.decompress(data)
+
+            if response.status in self.__THROTTLE_STATUSES:
+                failures += 1
+
+                if failures > self.__max_retries:
+                    raise HTTPException.construct(response, data)
+
+                if self.__limiter is None:
+                    time.sleep(RateLimiter.backoff(failures))
+                else:
+                    self.__limiter.throttled(self.retry_after(response))
+
+                continue
+
+            if self.__limiter is not None:
+                self.__limiter.healthy()
+
+            if response.status not in ok_statuses:
+                raise HTTPException.construct(response, data)
+
+            return data.decode()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def pool(self):
+        return self.__pool
+
+
+    @property
+    def limiter(self):
+        return self.__limiter
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PooledHTTPClient:{host:%s, secure:%s, verified:%s, timeout:%s, max_retries:%s, pool:%s, limiter:%s}" % \
+               (self.__host, self.__secure, self.__verified, self.__timeout, self.__max_retries, self.pool,
+                self.limiter)
@@ -0,0 +1,181 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+An adaptive token-bucket rate limiter, shared by everything that makes requests of one data infrastructure.
+
+Each request takes one token. Tokens accumulate at the current rate, up to a burst. When the server signals that it is
+overloaded - 429 Too Many Requests or 503 Service Unavailable - the rate is halved, and no request is made until the
+Retry-After period, or an exponential backoff with jitter, has passed. Each healthy response increases the rate
+additively, back up to the maximum.
+
+The token bucket is held by a store: in memory, for the threads of one process, or in a SharedLimiterStore, for all
+the processes that use one API key.
+
+https://tools.ietf.org/html/rfc6585#section-4
+https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+"""
+
+import random
+import threading
+import time
+
+from scs_analysis.client.limiter_state import LimiterState
+from scs_analysis.client.local_limiter_store import LocalLimiterStore
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class RateLimiter(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_MAX_RATE = 5.0                      # requests per second
+    DEFAULT_MIN_RATE = 0.1                      # requests per second
+
+    DECREASE_FACTOR = 0.5
+    INCREASE_STEP = 0.1                         # requests per second, per healthy response
+
+    BACKOFF_BASE = 1.0                          # seconds
+    BACKOFF_MAX = 120.0                         # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def backoff(cls, failures):
+        """
+        returns an exponential backoff period in seconds, with "equal jitter", after the given consecutive failures
+        """
+        ceiling = min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * 2 ** (max(failures, 1) - 1))
+
+        return ceiling / 2 + random.uniform(0.0, ceiling / 2)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, max_rate=DEFAULT_MAX_RATE, min_rate=DEFAULT_MIN_RATE, burst=None, store=None):
+        """
+        Constructor - without a store, the limiter is shared only by the threads of this process
+        """
+        self.__max_rate = float(max_rate)                           # float     requests per second
+        self.__min_rate = min(float(min_rate), self.__max_rate)     # float     requests per second
+        self.__burst = max(1.0, self.__max_rate if burst is None else float(burst))     # float     tokens
+
+        self.__store = LocalLimiterStore() if store is None else store
+
+        self.__lock = threading.Lock()                              # for the counts of this process
+
+        self.__request_count = 0                                    # int
+        self.__throttle_count = 0                                   # int
+
+
+    def __initial_state(self):
+        return LimiterState(self.__max_rate, self.__burst, time.time(), 0.0, 0)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def acquire(self):
+        """
+        blocks until a request may be made
+        """
+        while True:
+            with self.__store.transaction(self.__initial_state) as state:
+                now = time.time()
+
+                # another process may have a lower maximum rate...
+                state.rate = min(state.rate, self.__max_rate)
+
+                state.tokens = min(self.__burst, state.tokens + max(0.0, now - state.updated) * state.rate)
+                state.updated = now
+
+                if now >= state.hold_until and state.tokens >= 1.0:
+                    state.tokens -= 1.0
+                    break
+
+                wait = max(state.hold_until - now, (1.0 - state.tokens) / state.rate)
+
+            time.sleep(wait)
+
+        with self.__lock:
+            self.__request_count += 1
+
+
+    def healthy(self):
+        with self.__store.transaction(self.__initial_state) as state:
+            state.failures = 0
+            state.rate = min(self.__max_rate, state.rate + self.INCREASE_STEP)
+
+
+    def throttled(self, retry_after=None):
+        """
+        retry_after is in seconds, if given by the server - returns the hold-off period in seconds
+        """
+        with self.__lock:
+            self.__throttle_count += 1
+
+        with self.__store.transaction(self.__initial_state) as state:
+            now = time.time()
+
+            # requests already in flight when the hold-off began do not reduce the rate again...
+            if now >= state.hold_until:
+                state.failures += 1
+                state.rate = max(self.__min_rate, state.rate * self.DECREASE_FACTOR)
+
+            state.tokens = 0.0
+
+            if retry_after is None:
+                delay = self.backoff(state.failures)
+            else:
+                delay = retry_after + random.uniform(0.0, self.BACKOFF_BASE)      # clients do not retry in step
+
+            state.hold_until = max(state.hold_until, now + delay)
+
+            return delay
+
+
+    def close(self):
+        self.__store.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def max_rate(self):
+        return self.__max_rate
+
+
+    @property
+    def min_rate(self):
+        return self.__min_rate
+
+
+    @property
+    def rate(self):
+        with self.__store.transaction(self.__initial_state) as state:
+            return state.rate
+
+
+    @property
+    def store(self):
+        return self.__store
+
+
+    @property
+    def request_count(self):
+        return self.__request_count
+
+
+    @property
+    def throttle_count(self):
+        return self.__throttle_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "RateLimiter:{max_rate:%s, min_rate:%s, rate:%0.2f, request_count:%s, throttle_count:%s, store:%s}" % \
+               (self.max_rate, self.min_rate, self.rate, self.request_count, self.throttle_count, self.store)
@@ -0,0 +1,110 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Holds RateLimiter state in a small file, so that every process that uses the same API key draws from one token bucket.
+Each transaction holds an exclusive flock on the file while the state is read, updated and written back. The lock is
+released by the operating system if a process dies.
+
+One file is kept for each data infrastructure and API key. The key itself is not stored - only a digest of it.
+
+example file:
+~/SCS/limiter/osio-3f2a9c0e1d7b.state
+"""
+
+import fcntl
+import hashlib
+import os
+import threading
+
+from contextlib import contextmanager
+
+from scs_analysis.client.limiter_state import LimiterState
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SharedLimiterStore(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), "SCS", "limiter")
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct(cls, name, api_key, directory=DEFAULT_DIRECTORY):
+        digest = hashlib.sha256(str(api_key).encode()).hexdigest()[:12]
+
+        return cls(os.path.join(directory, "%s-%s.state" % (name, digest)))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename):
+        """
+        Constructor
+        """
+        self.__filename = filename                          # string
+
+        self.__lock = threading.Lock()                      # flock does not exclude threads sharing a descriptor
+        self.__fd = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @contextmanager
+    def transaction(self, initial_state):
+        """
+        yields the shared LimiterState, which is written back when the transaction ends - initial_state() is used if
+        no process has yet stored a state
+        """
+        with self.__lock:
+            fd = self.__open()
+
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+            try:
+                state = LimiterState.construct_from_bytes(os.pread(fd, LimiterState.SIZE, 0))
+
+                if state is None:
+                    state = initial_state()
+
+                yield state
+
+                os.pwrite(fd, state.as_bytes(), 0)
+
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+    def close(self):
+        with self.__lock:
+            if self.__fd is not None:
+                os.close(self.__fd)
+                self.__fd = None
+
+
+    def __open(self):
+        if self.__fd is None:
+            os.makedirs(os.path.dirname(self.__filename) or '.', exist_ok=True)
+            self.__fd = os.open(self.__filename, os.O_RDWR | os.O_CREAT, 0o600)
+
+        return self.__fd
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SharedLimiterStore:{filename:%s}" % self.filename
+
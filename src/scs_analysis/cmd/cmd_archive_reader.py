@@ -0,0 +1,92 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdArchiveReader(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog ARCHIVE [PATH_1 .. PATH_N] [-s START] [-e END] [-v]",
+                                              version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--start", "-s", type="string", nargs=1, action="store", dest="start",
+                                 help="localised datetime start")
+
+        self.__parser.add_option("--end", "-e", type="string", nargs=1, action="store", dest="end",
+                                 help="localised datetime end")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.directory is None:
+            return False
+
+        if self.__opts.start is not None and LocalizedDatetime.construct_from_iso8601(self.__opts.start) is None:
+            return False
+
+        if self.__opts.end is not None and LocalizedDatetime.construct_from_iso8601(self.__opts.end) is None:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def paths(self):
+        return self.__args[1:] if len(self.__args) > 1 else None
+
+
+    @property
+    def start(self):
+        return LocalizedDatetime.construct_from_iso8601(self.__opts.start) if self.__opts.start else None
+
+
+    @property
+    def end(self):
+        return LocalizedDatetime.construct_from_iso8601(self.__opts.end) if self.__opts.end else None
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdArchiveReader:{directory:%s, paths:%s, start:%s, end:%s, verbose:%s, args:%s}" % \
+                    (self.directory, self.paths, self.start, self.end, self.verbose, self.args)
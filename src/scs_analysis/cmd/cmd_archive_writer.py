@@ -0,0 +1,93 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_analysis.archive.column_archive_writer import ColumnArchiveWriter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdArchiveWriter(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog ARCHIVE [-c CHUNK] [-z] [-e] [-v]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--chunk", "-c", type="int", nargs=1, action="store", dest="chunk",
+                                 default=ColumnArchiveWriter.DEFAULT_CHUNK_SIZE,
+                                 help="commit rows in chunks of CHUNK (default %d)" %
+                                      ColumnArchiveWriter.DEFAULT_CHUNK_SIZE)
+
+        self.__parser.add_option("--gorilla", "-z", action="store_true", dest="gorilla", default=False,
+                                 help="compress a new archive with the gorilla codec")
+
+        self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
+                                 help="echo stdin to stdout")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.directory is None:
+            return False
+
+        if self.chunk < 1:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def chunk(self):
+        return self.__opts.chunk
+
+
+    @property
+    def codec(self):
+        return 'gorilla' if self.__opts.gorilla else None
+
+
+    @property
+    def echo(self):
+        return self.__opts.echo
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdArchiveWriter:{directory:%s, chunk:%s, codec:%s, echo:%s, verbose:%s, args:%s}" % \
+                    (self.directory, self.chunk, self.codec, self.echo, self.verbose, self.args)
@@ -6,6 +6,8 @@ Created on 2 Aug 2016
 
 import optparse
 
+from scs_analysis.archive.compressed_file import CompressedFile
+
 
 # --------------------------------------------------------------------------------------------------------------------
 
@@ -16,7 +18,8 @@ class CmdCSVWriter(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog [FILENAME] [-c] [-a] [-e] [-v]", version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog [FILENAME] [-c] [-a] [-l LEVEL] [-e] [-v]",
+                                              version="%prog 1.0")
 
         # optional...
         self.__parser.add_option("--cache", "-c", action="store_true", dest="cache", default=False,
@@ -25,6 +28,11 @@ class CmdCSVWriter(object):
         self.__parser.add_option("--append", "-a", action="store_true", dest="append", default=False,
                                  help="append rows to existing file")
 
+        self.__parser.add_option("--level", "-l", type="int", nargs=1, action="store", dest="level",
+                                 default=CompressedFile.DEFAULT_LEVEL,
+                                 help="compression level 1 - 9 for .gz, .bz2 or .xz files (default %d)" %
+                                      CompressedFile.DEFAULT_LEVEL)
+
         self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
                                  help="echo stdin to stdout")
 
@@ -34,6 +42,18 @@ class CmdCSVWriter(object):
         self.__opts, self.__args = self.__parser.parse_args()
 
 
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.level < 1 or self.level > 9:
+            return False
+
+        if self.append and CompressedFile.compression_for_name(self.filename) is not None:
+            return False
+
+        return True
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     @property
@@ -51,6 +71,11 @@ class CmdCSVWriter(object):
         return self.__opts.append
 
 
+    @property
+    def level(self):
+        return self.__opts.level
+
+
     @property
     def echo(self):
         return self.__opts.echo
@@ -68,6 +93,10 @@ class CmdCSVWriter(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
     def __str__(self, *args, **kwargs):
-        return "CmdCSVWriter:{filename:%s, cache:%s, append:%s, echo:%s, verbose:%s, args:%s}" % \
-                    (self.filename, self.cache, self.append, self.echo, self.verbose, self.args)
+        return "CmdCSVWriter:{filename:%s, cache:%s, append:%s, level:%s, echo:%s, verbose:%s, args:%s}" % \
+                    (self.filename, self.cache, self.append, self.level, self.echo, self.verbose, self.args)
@@ -6,6 +6,13 @@ Created on 23 Mar 2017
 
 import optparse
 
+from scs_analysis.client.async_publisher import AsyncPublisher
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+from scs_analysis.comms.latency_stats import LatencyStats
+from scs_analysis.comms.publication_spool import PublicationSpool
+from scs_analysis.comms.route_sink import RouteSink
+from scs_analysis.comms.topic_router import TopicRouter
+
 
 # --------------------------------------------------------------------------------------------------------------------
 
@@ -16,17 +23,69 @@ class CmdMQTTClient(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog [-p UDS_PUB] "
+        self.__parser = optparse.OptionParser(usage="%prog [-p UDS_PUB] [-w WINDOW] [-o SPOOL [-z MB] [-y SYNC]] "
                                                     "[-s] [SUB_TOPIC_1 (UDS_SUB_1) .. SUB_TOPIC_N (UDS_SUB_N)] "
-                                                    "[-e] [-v]", version="%prog 1.0")
+                                                    "[-t FILTER SINK] [-c UDS_CTRL] [-l STATS [-i INTERVAL]] "
+                                                    "[-n SHARDS] [-q LENGTH] [-d POLICY] [-r] [-e] [-v]",
+                                              version="%prog 1.0")
 
         # optional...
         self.__parser.add_option("--pub-addr", "-p", type="string", nargs=1, action="store", dest="uds_pub_addr",
                                  help="read publications from UDS instead of stdin")
 
+        self.__parser.add_option("--window", "-w", type="int", nargs=1, action="store", dest="window",
+                                 default=AsyncPublisher.DEFAULT_WINDOW,
+                                 help="keep at most WINDOW publications in flight (default %d)" %
+                                      AsyncPublisher.DEFAULT_WINDOW)
+
+        self.__parser.add_option("--spool", "-o", type="string", nargs=1, action="store", dest="spool",
+                                 help="spool publications in directory SPOOL before publishing")
+
+        self.__parser.add_option("--spool-size", "-z", type="int", nargs=1, action="store", dest="spool_size",
+                                 default=PublicationSpool.DEFAULT_MAX_SIZE // (1024 * 1024),
+                                 help="spool at most MB megabytes (default %d)" %
+                                      (PublicationSpool.DEFAULT_MAX_SIZE // (1024 * 1024)))
+
+        self.__parser.add_option("--sync", "-y", type="choice", choices=PublicationSpool.SYNC_POLICIES,
+                                 action="store", dest="sync", default=PublicationSpool.DEFAULT_SYNC,
+                                 help="sync the spool to disk: %s (default %s)" %
+                                      (' | '.join(PublicationSpool.SYNC_POLICIES), PublicationSpool.DEFAULT_SYNC))
+
         self.__parser.add_option("--sub", "-s", action="store_true", dest="uds_sub",
                                  help="write subscriptions to UDS instead of stdout")
 
+        self.__parser.add_option("--route", "-t", type="string", nargs=2, action="append", dest="routes",
+                                 default=[], help="also route subscribed topics matching FILTER to SINK - "
+                                                  "uds:PATH, file:PATH or stdout (repeatable)")
+
+        self.__parser.add_option("--control", "-c", type="string", nargs=1, action="store", dest="uds_ctrl_addr",
+                                 help="accept route and subscription changes on UDS_CTRL while running")
+
+        self.__parser.add_option("--latency", "-l", type="string", nargs=1, action="store", dest="stats_file",
+                                 help="save per-topic latency statistics to file STATS")
+
+        self.__parser.add_option("--interval", "-i", type="float", nargs=1, action="store", dest="stats_interval",
+                                 default=LatencyStats.DEFAULT_INTERVAL,
+                                 help="save latency statistics every INTERVAL seconds (default %d)" %
+                                      LatencyStats.DEFAULT_INTERVAL)
+
+        self.__parser.add_option("--shards", "-n", type="int", nargs=1, action="store", dest="shards", default=1,
+                                 help="decode and write subscriptions in SHARDS worker processes "
+                                      "(default 1 - in this process)")
+
+        self.__parser.add_option("--queue-length", "-q", type="int", nargs=1, action="store", dest="queue_length",
+                                 default=DeliveryQueue.DEFAULT_MAX_LENGTH,
+                                 help="queue at most LENGTH messages per subscription (default %d)" %
+                                      DeliveryQueue.DEFAULT_MAX_LENGTH)
+
+        self.__parser.add_option("--drop-policy", "-d", type="choice", choices=DeliveryQueue.POLICIES,
+                                 action="store", dest="drop_policy", default=DeliveryQueue.DEFAULT_POLICY,
+                                 help="when a queue is full: %s (default %s)" %
+                                      (' | '.join(DeliveryQueue.POLICIES), DeliveryQueue.DEFAULT_POLICY))
+
+        self.__parser.add_option("--raw", "-r", action="store_true", dest="raw", default=False,
+                                 help="pass subscription payloads through without decoding them (AWS only)")
+
         self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
                                  help="echo input to stdout (if writing subscriptions to DomainSocket)")
 
@@ -39,12 +98,31 @@ class CmdMQTTClient(object):
     # ----------------------------------------------------------------------------------------------------------------
 
     def is_valid(self):
-        if self.echo and not self.__opts.uds_sub:
+        if self.echo and not self.__opts.uds_sub and not self.routes:
             return False
 
+        for topic_filter, spec in self.routes:
+            if not TopicRouter.is_valid_filter(topic_filter) or not RouteSink.is_valid_spec(spec):
+                return False
+
         if self.__opts.uds_sub and len(self.__args) % 2 != 0:
             return False
 
+        if self.window < 1:
+            return False
+
+        if self.stats_interval <= 0:
+            return False
+
+        if self.shards < 1:
+            return False
+
+        if self.spool_size < 1 or self.sync not in PublicationSpool.SYNC_POLICIES:
+            return False
+
+        if self.queue_length < 1 or self.drop_policy not in DeliveryQueue.POLICIES:
+            return False
+
         return True
 
 
@@ -69,6 +147,66 @@ class CmdMQTTClient(object):
         return self.__opts.uds_pub_addr
 
 
+    @property
+    def routes(self):
+        return [tuple(route) for route in self.__opts.routes]
+
+
+    @property
+    def uds_ctrl_addr(self):
+        return self.__opts.uds_ctrl_addr
+
+
+    @property
+    def stats_file(self):
+        return self.__opts.stats_file
+
+
+    @property
+    def stats_interval(self):
+        return self.__opts.stats_interval
+
+
+    @property
+    def window(self):
+        return self.__opts.window
+
+
+    @property
+    def spool(self):
+        return self.__opts.spool
+
+
+    @property
+    def spool_size(self):
+        return self.__opts.spool_size
+
+
+    @property
+    def sync(self):
+        return self.__opts.sync
+
+
+    @property
+    def shards(self):
+        return self.__opts.shards
+
+
+    @property
+    def queue_length(self):
+        return self.__opts.queue_length
+
+
+    @property
+    def drop_policy(self):
+        return self.__opts.drop_policy
+
+
+    @property
+    def raw(self):
+        return self.__opts.raw
+
+
     @property
     def echo(self):
         return self.__opts.echo
@@ -93,8 +231,12 @@ class CmdMQTTClient(object):
     def __str__(self, *args, **kwargs):
         subscriptions = '[' + ', '.join(str(subscription) for subscription in self.subscriptions) + ']'
 
-        return "CmdMQTTClient:{subscriptions:%s, uds_pub_addr:%s, echo:%s, verbose:%s, args:%s}" % \
-               (subscriptions, self.uds_pub_addr, self.echo, self.verbose, self.args)
+        return "CmdMQTTClient:{subscriptions:%s, uds_pub_addr:%s, routes:%s, uds_ctrl_addr:%s, stats_file:%s, " \
+               "stats_interval:%s, window:%s, spool:%s, spool_size:%s, sync:%s, shards:%s, queue_length:%s, " \
+               "drop_policy:%s, raw:%s, echo:%s, verbose:%s, args:%s}" % \
+               (subscriptions, self.uds_pub_addr, self.routes, self.uds_ctrl_addr, self.stats_file,
+                self.stats_interval, self.window, self.spool, self.spool_size, self.sync, self.shards,
+                self.queue_length, self.drop_policy, self.raw, self.echo, self.verbose, self.args)
 
 
 # --------------------------------------------------------------------------------------------------------------------
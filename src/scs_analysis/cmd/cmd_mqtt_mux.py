@@ -0,0 +1,118 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_analysis.client.async_publisher import AsyncPublisher
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+from scs_analysis.comms.topic_router import TopicRouter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdMQTTMux(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog -c UDS_CTRL [-w WINDOW] [-q LENGTH] [-d POLICY] [-r] [-v] "
+                                                    "SUB_TOPIC_1 .. SUB_TOPIC_N", version="%prog 1.0")
+
+        # compulsory...
+        self.__parser.add_option("--control", "-c", type="string", nargs=1, action="store", dest="uds_ctrl_addr",
+                                 help="accept local clients on UDS_CTRL")
+
+        # optional...
+        self.__parser.add_option("--window", "-w", type="int", nargs=1, action="store", dest="window",
+                                 default=AsyncPublisher.DEFAULT_WINDOW,
+                                 help="keep at most WINDOW publications in flight (default %d)" %
+                                      AsyncPublisher.DEFAULT_WINDOW)
+
+        self.__parser.add_option("--queue-length", "-q", type="int", nargs=1, action="store", dest="queue_length",
+                                 default=DeliveryQueue.DEFAULT_MAX_LENGTH,
+                                 help="queue at most LENGTH messages per local client (default %d)" %
+                                      DeliveryQueue.DEFAULT_MAX_LENGTH)
+
+        self.__parser.add_option("--drop-policy", "-d", type="choice", choices=DeliveryQueue.POLICIES,
+                                 action="store", dest="drop_policy", default=DeliveryQueue.DEFAULT_POLICY,
+                                 help="when a queue is full: %s (default %s)" %
+                                      (' | '.join(DeliveryQueue.POLICIES), DeliveryQueue.DEFAULT_POLICY))
+
+        self.__parser.add_option("--raw", "-r", action="store_true", dest="raw", default=False,
+                                 help="pass subscription payloads through without decoding them")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.uds_ctrl_addr is None or not self.topics:
+            return False
+
+        for topic in self.topics:
+            if not TopicRouter.is_valid_filter(topic):
+                return False
+
+        if self.window < 1 or self.queue_length < 1:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def uds_ctrl_addr(self):
+        return self.__opts.uds_ctrl_addr
+
+
+    @property
+    def topics(self):
+        return self.__args
+
+
+    @property
+    def window(self):
+        return self.__opts.window
+
+
+    @property
+    def queue_length(self):
+        return self.__opts.queue_length
+
+
+    @property
+    def drop_policy(self):
+        return self.__opts.drop_policy
+
+
+    @property
+    def raw(self):
+        return self.__opts.raw
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdMQTTMux:{uds_ctrl_addr:%s, topics:%s, window:%s, queue_length:%s, drop_policy:%s, raw:%s, " \
+               "verbose:%s}" % \
+               (self.uds_ctrl_addr, self.topics, self.window, self.queue_length, self.drop_policy, self.raw,
+                self.verbose)
@@ -0,0 +1,92 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_analysis.archive.file_pool import FilePool
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdPartitionedWriter(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog ROOT [-f MAX_FILES] [-w] [-e] [-v]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--max-files", "-f", type="int", nargs=1, action="store", dest="max_files",
+                                 default=FilePool.DEFAULT_MAX_OPEN,
+                                 help="keep at most MAX_FILES files open (default %d)" % FilePool.DEFAULT_MAX_OPEN)
+
+        self.__parser.add_option("--wrapping", "-w", action="store_true", dest="include_wrapping", default=False,
+                                 help="include publication wrapper")
+
+        self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
+                                 help="echo stdin to stdout")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.root is None:
+            return False
+
+        if self.max_files < 1:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def root(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def max_files(self):
+        return self.__opts.max_files
+
+
+    @property
+    def include_wrapping(self):
+        return self.__opts.include_wrapping
+
+
+    @property
+    def echo(self):
+        return self.__opts.echo
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdPartitionedWriter:{root:%s, max_files:%s, include_wrapping:%s, echo:%s, verbose:%s, args:%s}" % \
+                    (self.root, self.max_files, self.include_wrapping, self.echo, self.verbose, self.args)
@@ -0,0 +1,116 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdSQLiteReader(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog DATABASE { -l | [-t TOPIC] [-s START] [-e END] [-w] } "
+                                                    "[-v]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--list", "-l", action="store_true", dest="list", default=False,
+                                 help="list the stored topics")
+
+        self.__parser.add_option("--topic", "-t", type="string", nargs=1, action="store", dest="topic",
+                                 help="topic path")
+
+        self.__parser.add_option("--start", "-s", type="string", nargs=1, action="store", dest="start",
+                                 help="localised datetime start")
+
+        self.__parser.add_option("--end", "-e", type="string", nargs=1, action="store", dest="end",
+                                 help="localised datetime end")
+
+        self.__parser.add_option("--wrapping", "-w", action="store_true", dest="include_wrapping", default=False,
+                                 help="include publication wrapper")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.filename is None:
+            return False
+
+        if self.list and (self.__opts.topic or self.__opts.start or self.__opts.end or self.include_wrapping):
+            return False
+
+        if self.__opts.start is not None and LocalizedDatetime.construct_from_iso8601(self.__opts.start) is None:
+            return False
+
+        if self.__opts.end is not None and LocalizedDatetime.construct_from_iso8601(self.__opts.end) is None:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def list(self):
+        return self.__opts.list
+
+
+    @property
+    def topic(self):
+        return self.__opts.topic
+
+
+    @property
+    def start(self):
+        return LocalizedDatetime.construct_from_iso8601(self.__opts.start) if self.__opts.start else None
+
+
+    @property
+    def end(self):
+        return LocalizedDatetime.construct_from_iso8601(self.__opts.end) if self.__opts.end else None
+
+
+    @property
+    def include_wrapping(self):
+        return self.__opts.include_wrapping
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdSQLiteReader:{filename:%s, list:%s, topic:%s, start:%s, end:%s, include_wrapping:%s, " \
+               "verbose:%s, args:%s}" % \
+                    (self.filename, self.list, self.topic, self.start, self.end, self.include_wrapping,
+                     self.verbose, self.args)
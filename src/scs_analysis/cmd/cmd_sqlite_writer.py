@@ -0,0 +1,120 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_analysis.archive.sample_database import SampleDatabase
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdSQLiteWriter(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog DATABASE { -t TOPIC | -p } [-b BATCH] [-f FLUSH] [-e] [-v]",
+                                              version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--topic", "-t", type="string", nargs=1, action="store", dest="topic",
+                                 help="store documents under TOPIC")
+
+        self.__parser.add_option("--publications", "-p", action="store_true", dest="publications", default=False,
+                                 help="input is publications - store payloads under their topics")
+
+        self.__parser.add_option("--batch", "-b", type="int", nargs=1, action="store", dest="batch",
+                                 default=SampleDatabase.DEFAULT_BATCH_SIZE,
+                                 help="commit documents in transactions of BATCH (default %d)" %
+                                      SampleDatabase.DEFAULT_BATCH_SIZE)
+
+        self.__parser.add_option("--flush", "-f", type="float", nargs=1, action="store", dest="flush",
+                                 default=SampleDatabase.DEFAULT_FLUSH_INTERVAL,
+                                 help="commit pending documents after at most FLUSH seconds (default %0.1f)" %
+                                      SampleDatabase.DEFAULT_FLUSH_INTERVAL)
+
+        self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
+                                 help="echo stdin to stdout")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.filename is None:
+            return False
+
+        if bool(self.topic) == bool(self.publications):
+            return False
+
+        if self.batch < 1:
+            return False
+
+        if self.flush <= 0:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def topic(self):
+        return self.__opts.topic
+
+
+    @property
+    def publications(self):
+        return self.__opts.publications
+
+
+    @property
+    def batch(self):
+        return self.__opts.batch
+
+
+    @property
+    def flush(self):
+        return self.__opts.flush
+
+
+    @property
+    def echo(self):
+        return self.__opts.echo
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdSQLiteWriter:{filename:%s, topic:%s, publications:%s, batch:%s, flush:%s, echo:%s, verbose:%s, " \
+               "args:%s}" % \
+                    (self.filename, self.topic, self.publications, self.batch, self.flush, self.echo, self.verbose,
+                     self.args)
@@ -0,0 +1,195 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+The command line of the aws_topic_history and osio_topic_history utilities - see CmdAWSTopicHistory and
+CmdOSIOTopicHistory.
+"""
+
+import optparse
+
+from scs_analysis.client.rate_limiter import RateLimiter
+from scs_analysis.history.history_cache import HistoryCache
+from scs_analysis.history.parallel_fetcher import ParallelFetcher
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdTopicHistory(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog PATH_1 .. PATH_N [{ -m MINUTES | -s START [-e END] }] "
+                                                    "[{ -k FILE | -f }] [-r RATE] [-n PARALLEL] [-l SLICE] "
+                                                    "[-c [-z MB]] [-w] [-v]",
+                                              version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--minutes", "-m", type="int", nargs=1, action="store", dest="minutes",
+                                 help="starting minutes ago")
+
+        self.__parser.add_option("--start", "-s", type="string", nargs=1, action="store", dest="start",
+                                 help="localised datetime start")
+
+        self.__parser.add_option("--end", "-e", type="string", nargs=1, action="store", dest="end",
+                                 help="localised datetime end")
+
+        self.__parser.add_option("--checkpoint", "-k", type="string", nargs=1, action="store", dest="checkpoint",
+                                 help="record progress in FILE - if FILE exists, resume the pull that it records")
+
+        self.__parser.add_option("--follow", "-f", action="store_true", dest="follow", default=False,
+                                 help="after the period, keep polling for new messages")
+
+        self.__parser.add_option("--rate", "-r", type="float", nargs=1, action="store", dest="rate",
+                                 default=RateLimiter.DEFAULT_MAX_RATE,
+                                 help="at most RATE requests per second - reduced while the server is throttling "
+                                      "(default %0.1f)" % RateLimiter.DEFAULT_MAX_RATE)
+
+        self.__parser.add_option("--parallel", "-n", type="int", nargs=1, action="store", dest="parallel", default=1,
+                                 help="fetch N time slices concurrently (default 1)")
+
+        self.__parser.add_option("--slice", "-l", type="int", nargs=1, action="store", dest="slice",
+                                 default=ParallelFetcher.DEFAULT_SLICE_MINUTES,
+                                 help="length of each time slice in MINUTES (default %d)" %
+                                      ParallelFetcher.DEFAULT_SLICE_MINUTES)
+
+        self.__parser.add_option("--cache", "-c", action="store_true", dest="cache", default=False,
+                                 help="use the local cache of hourly buckets")
+
+        self.__parser.add_option("--cache-size", "-z", type="int", nargs=1, action="store", dest="cache_size",
+                                 default=HistoryCache.DEFAULT_MAX_SIZE,
+                                 help="evict least-recently-used buckets above MB (default %d)" %
+                                      HistoryCache.DEFAULT_MAX_SIZE)
+
+        self.__parser.add_option("--wrapping", "-w", action="store_true", dest="include_wrapping", default=False,
+                                 help="include message wrapper")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if not self.paths:
+            return False
+
+        if self.__opts.start is None and self.minutes is None and self.checkpoint is None and not self.follow:
+            return False
+
+        if self.follow and (self.checkpoint is not None or self.__opts.end is not None):
+            return False
+
+        if self.__opts.start is not None and LocalizedDatetime.construct_from_iso8601(self.__opts.start) is None:
+            return False
+
+        if self.__opts.end is not None and LocalizedDatetime.construct_from_iso8601(self.__opts.end) is None:
+            return False
+
+        if self.rate <= 0.0:
+            return False
+
+        if self.parallel < 1 or self.slice < 1 or self.cache_size < 1:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def use_offset(self):
+        return self.minutes is not None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def paths(self):
+        return self.__args
+
+
+    @property
+    def minutes(self):
+        return self.__opts.minutes
+
+
+    @property
+    def start(self):
+        return LocalizedDatetime.construct_from_iso8601(self.__opts.start) if self.__opts.start else None
+
+
+    @property
+    def end(self):
+        return LocalizedDatetime.construct_from_iso8601(self.__opts.end) if self.__opts.end else None
+
+
+    @property
+    def checkpoint(self):
+        return self.__opts.checkpoint
+
+
+    @property
+    def follow(self):
+        return self.__opts.follow
+
+
+    @property
+    def rate(self):
+        return self.__opts.rate
+
+
+    @property
+    def parallel(self):
+        return self.__opts.parallel
+
+
+    @property
+    def slice(self):
+        return self.__opts.slice
+
+
+    @property
+    def cache(self):
+        return self.__opts.cache
+
+
+    @property
+    def cache_size(self):
+        return self.__opts.cache_size
+
+
+    @property
+    def include_wrapping(self):
+        return self.__opts.include_wrapping
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "%s:{paths:%s, minutes:%s, start:%s, end:%s, checkpoint:%s, follow:%s, rate:%s, parallel:%s, " \
+               "slice:%s, cache:%s, cache_size:%s, include_wrapping:%s, verbose:%s, args:%s}" % \
+                    (self.__class__.__name__, self.paths, self.minutes, self.start, self.end, self.checkpoint,
+                     self.follow, self.rate, self.parallel, self.slice, self.cache, self.cache_size,
+                     self.include_wrapping, self.verbose, self.args)
@@ -0,0 +1,195 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A handler for messages from AWS MQTT subscriptions, which routes each message to its sinks.
+
+handle(..) is called on the MQTT client's network thread, and only queues the message. The queue's writer thread
+serialises each message once - by decoding it and re-encoding it with JSONify, or, if raw, by wrapping the payload
+bytes in the topic envelope - and writes it to every sink that the router gives for its topic. A sink has write(..),
+which takes str or, if raw, UTF-8 bytes, and spec.
+
+A sink that fails does not stop the others. ConnectionRefusedError - there is no listener - is reported only if
+verbose; any other OSError, or a ValueError such as UnicodeDecodeError, is always reported on stderr. Latencies are
+recorded whether or not every sink was written.
+
+serialise(..) and write(..) may also be used apart - the worker processes of a ShardPool serialise messages, and each
+writes them with a handler of its own.
+
+If there are LatencyStats, each message is stamped when it is received, and its latencies are recorded once the batch
+has been written.
+"""
+
+import json
+import sys
+import time
+
+from collections import OrderedDict
+
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+from scs_analysis.comms.latency_stats import LatencyStats
+from scs_analysis.comms.route_sink import RouteSink
+
+from scs_core.data.json import JSONify
+from scs_core.data.publication import Publication
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class AWSMQTTHandler(object):
+    """
+    classdocs
+    """
+
+    __EOM = RouteSink.EOM.encode()
+
+    __ENVELOPE_START = b'{'
+    __ENVELOPE_SEPARATOR = b': '                # as JSONify
+    __ENVELOPE_END = b'}'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def envelope(cls, topic, payload):
+        """
+        returns the publication as UTF-8 bytes, with the payload bytes as received - to keep the publication on one
+        line, newlines are replaced with spaces: outside strings, JSON allows a newline as whitespace, and inside
+        strings it forbids a raw newline, so a valid payload keeps its meaning
+        """
+        return cls.__ENVELOPE_START + json.dumps(topic, ensure_ascii=False).encode() + cls.__ENVELOPE_SEPARATOR + \
+            payload.strip().replace(b'\r', b' ').replace(b'\n', b' ') + cls.__ENVELOPE_END
+
+
+    @classmethod
+    def serialise(cls, topic, payload, raw=False, timed=False):
+        """
+        returns (line, rec) for the message - line is None if the payload cannot be used, rec is None unless timed
+        """
+        if raw:
+            if not payload.strip():
+                return None, None
+
+            return cls.envelope(topic, payload), LatencyStats.raw_rec(payload) if timed else None
+
+        try:
+            jdict = json.loads(payload.decode(), object_pairs_hook=OrderedDict)
+        except ValueError:
+            return None, None
+
+        rec = jdict.get('rec') if timed and isinstance(jdict, dict) else None
+
+        return JSONify.dumps(Publication(topic, jdict)), rec
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, router, echo=False, verbose=False, max_length=DeliveryQueue.DEFAULT_MAX_LENGTH,
+                 policy=DeliveryQueue.DEFAULT_POLICY, name=None, raw=False, stats=None):
+        """
+        Constructor
+        """
+        self.__router = router
+
+        self.__echo = echo
+        self.__verbose = verbose
+        self.__raw = raw
+        self.__stats = stats
+
+        self.__queue = DeliveryQueue(self.__deliver, name, max_length, policy)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__queue.start()
+
+
+    def close(self):
+        self.__queue.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    # noinspection PyUnusedLocal,PyShadowingNames
+    def handle(self, client, userdata, message):
+        # on the MQTT network thread - the message is decoded and written by the queue's writer thread...
+        self.__queue.put((message.topic, message.payload, time.time()))
+
+
+    def __deliver(self, messages):
+        timed = self.__stats is not None
+        entries = []
+
+        for topic, payload, received in messages:
+            line, rec = self.serialise(topic, payload, self.__raw, timed)
+
+            if line is not None:
+                entries.append((topic, line, rec, received))
+
+        self.write(entries)
+
+
+    def write(self, entries):
+        """
+        writes entries of (topic, line, rec, received), with lines from serialise(..), on the caller's thread
+        """
+        # each message is serialised once - as bytes, if raw - and shared by its sinks, echo and verbose...
+        lines = []
+        blocks = OrderedDict()                          # dict of sink: list of line
+
+        for topic, line, _, _ in entries:
+            lines.append(line)
+
+            for sink in self.__router.match(topic):
+                blocks.setdefault(sink, []).append(line)
+
+        eom = self.__EOM if self.__raw else RouteSink.EOM
+
+        for sink, sink_lines in blocks.items():
+            try:
+                sink.write(eom.join(sink_lines))
+
+            except ConnectionRefusedError:
+                if self.__verbose:
+                    print("AWSMQTTHandler: connection refused for %s" % sink.spec, file=sys.stderr)
+                    sys.stderr.flush()
+
+            except (OSError, ValueError) as ex:
+                print("AWSMQTTHandler: %s: %s: %s" % (sink.spec, ex.__class__.__name__, ex), file=sys.stderr)
+                sys.stderr.flush()
+
+        if self.__stats is not None and entries:
+            written = time.time()
+            self.__stats.record([(topic, rec, received, written) for topic, _, rec, received in entries])
+
+        if not lines or (not self.__echo and not self.__verbose):
+            return
+
+        text = eom.join(lines)
+        text = text.decode(errors='replace') if self.__raw else text       # a raw payload may not be UTF-8
+
+        if self.__echo:
+            print(text)
+            sys.stdout.flush()
+
+        if self.__verbose:
+            for jstr in text.split(RouteSink.EOM):
+                print("received: %s" % jstr, file=sys.stderr)
+
+            sys.stderr.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def queue(self):
+        return self.__queue
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "AWSMQTTHandler:{echo:%s, verbose:%s, raw:%s, queue:%s}" % \
+               (self.__echo, self.__verbose, self.__raw, self.__queue)
@@ -0,0 +1,160 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A thin wrapper of scs_core's AWS MQTTClient, whose subscriptions can be changed while it is connected, and whose
+offline request queue can be disabled.
+
+The subscriptions given to the constructor are made when the client has connected - the AWS IoT SDK keeps a record of
+each subscription, and makes it again whenever it reconnects. Further subscriptions can be made, and any subscription
+removed, with subscribe(..) and unsubscribe(..), without the client reconnecting.
+
+If offline_queueing is False, the SDK's offline request queue is disabled once the subscriptions are made: while the
+broker cannot be reached, publish(..) raises an exception, rather than holding the publication in memory and returning
+False. A publication is then either acknowledged by the broker, or has failed, and a caller that keeps its own store -
+such as a PublicationSpool - holds it until it can be sent. subscribe(..) and unsubscribe(..) also fail while the
+broker cannot be reached.
+
+SDK exceptions raised by subscribe(..) and unsubscribe(..) are raised as OSError.
+
+https://s3.amazonaws.com/aws-iot-device-sdk-python-docs/sphinx/html/index.html
+"""
+
+import threading
+
+from collections import OrderedDict
+
+from AWSIoTPythonSDK.exception.operationError import operationError
+from AWSIoTPythonSDK.exception.operationTimeoutException import operationTimeoutException
+
+from scs_core.aws.client.mqtt_client import MQTTClient
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class AWSMQTTLiveClient(MQTTClient):
+    """
+    classdocs
+    """
+
+    __SUB_QOS = 1
+    __QUEUE_DISABLED = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, *subscribers, offline_queueing=True):
+        """
+        Constructor
+        """
+        super().__init__()                                          # subscriptions are made here, when connected
+
+        self.__subscribers = OrderedDict((subscriber.topic, subscriber) for subscriber in subscribers)
+        self.__offline_queueing = bool(offline_queueing)            # bool
+
+        self.__lock = threading.RLock()
+        self.__connected = False                                    # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, *args, **kwargs):
+        """
+        takes the arguments of scs_core's MQTTClient.connect(..)
+        """
+        connected = super().connect(*args, **kwargs)
+
+        with self.__lock:
+            client = self.__sdk_client()
+
+            # nothing has been queued - there were no subscriptions to make before connecting...
+            if not self.__offline_queueing:
+                client.configureOfflinePublishQueueing(self.__QUEUE_DISABLED)
+
+            for subscriber in self.__subscribers.values():
+                self.__subscribe(client, subscriber.topic, subscriber.handler)
+
+            self.__connected = True
+
+        return connected
+
+
+    def disconnect(self):
+        with self.__lock:
+            self.__connected = False
+
+        super().disconnect()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def subscribe(self, subscriber):
+        """
+        subscribes the MQTTSubscriber's topic - if the client is not yet connected, the subscription is made when it is
+        """
+        with self.__lock:
+            if self.__connected:
+                self.__subscribe(self.__sdk_client(), subscriber.topic, subscriber.handler)
+
+            self.__subscribers[subscriber.topic] = subscriber
+
+
+    def unsubscribe(self, topic):
+        """
+        returns False if the topic was not subscribed
+        """
+        with self.__lock:
+            if topic not in self.__subscribers:
+                return False
+
+            if self.__connected:
+                try:
+                    self.__sdk_client().unsubscribe(topic)
+
+                except (operationError, operationTimeoutException) as ex:
+                    raise OSError("unsubscribe: %s: %s" % (topic, ex.__class__.__name__))
+
+            del self.__subscribers[topic]
+
+            return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __subscribe(self, client, topic, handler):
+        try:
+            client.subscribe(topic, self.__SUB_QOS, handler)
+
+        except (operationError, operationTimeoutException) as ex:
+            raise OSError("subscribe: %s: %s" % (topic, ex.__class__.__name__))
+
+
+    def __sdk_client(self):
+        # the AWSIoTMQTTClient made by scs_core's MQTTClient.connect(..)...
+        client = getattr(self, '_MQTTClient__client', None)
+
+        if client is None:
+            raise OSError("no client")
+
+        return client
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def topics(self):
+        with self.__lock:
+            return list(self.__subscribers.keys())
+
+
+    @property
+    def offline_queueing(self):
+        return self.__offline_queueing
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "AWSMQTTLiveClient:{topics:%s, offline_queueing:%s, connected:%s}" % \
+               (self.topics, self.offline_queueing, self.__connected)
@@ -0,0 +1,242 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A bounded queue with its own writer thread, which decouples the thread that receives items - such as an MQTT client's
+network thread - from a consumer that may be slow.
+
+put(..) returns at once, unless the queue is full. What happens then depends on the policy:
+
+block           put(..) waits until the writer thread has made space
+drop-oldest     the oldest queued item is discarded, to make space
+drop-newest     the new item is discarded
+
+The writer thread passes the items that have accumulated to deliver(..), as one batch of up to max_batch items.
+Items that deliver(..) fails to deliver - by raising an exception - are counted as failed, and the exception is
+reported on stderr.
+
+close(..) waits a limited time for the queued items to be delivered. Items that are still queued then are discarded,
+counted as dropped, and reported on stderr.
+"""
+
+import sys
+import threading
+import time
+
+from collections import deque
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeliveryQueue(object):
+    """
+    classdocs
+    """
+
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop-oldest'
+    DROP_NEWEST = 'drop-newest'
+
+    POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+    DEFAULT_MAX_LENGTH = 1000                       # items
+    DEFAULT_POLICY = DROP_OLDEST
+    DEFAULT_MAX_BATCH = 256                         # items
+
+    __JOIN_TIMEOUT = 5.0                            # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, deliver, name, max_length=DEFAULT_MAX_LENGTH, policy=DEFAULT_POLICY,
+                 max_batch=DEFAULT_MAX_BATCH):
+        """
+        Constructor - deliver(items) is called by the writer thread with a list of items
+        """
+        if policy not in self.POLICIES:
+            raise ValueError("unknown policy: %s" % policy)
+
+        self.__deliver = deliver                        # callable
+        self.__name = name                              # string
+        self.__max_length = int(max_length)             # int
+        self.__policy = policy                          # string
+        self.__max_batch = int(max_batch)               # int
+
+        self.__items = deque()                          # deque of item
+        self.__condition = threading.Condition()
+
+        self.__thread = None                            # threading.Thread
+        self.__running = False                          # bool
+
+        self.__put_count = 0                            # int
+        self.__delivered_count = 0                      # int
+        self.__drop_count = 0                           # int
+        self.__fail_count = 0                           # int
+        self.__block_time = 0.0                         # float         seconds spent waiting in put(..)
+        self.__max_depth = 0                            # int           high-water mark
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        with self.__condition:
+            if self.__running:
+                return
+
+            self.__running = True
+
+        self.__thread = threading.Thread(target=self.__run, name="DeliveryQueue:%s" % self.name, daemon=True)
+        self.__thread.start()
+
+
+    def close(self):
+        """
+        delivers the items already queued, then stops the writer thread
+        """
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+
+        if self.__thread is None:
+            return
+
+        self.__thread.join(self.__JOIN_TIMEOUT)
+        self.__thread = None
+
+        with self.__condition:
+            undelivered = len(self.__items)
+
+            self.__items.clear()
+            self.__drop_count += undelivered
+
+        if undelivered:
+            print("DeliveryQueue: %s: closed with %d items undelivered" % (self.name, undelivered), file=sys.stderr)
+            sys.stderr.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def put(self, item):
+        """
+        returns True if the item was queued, False if it was discarded
+        """
+        with self.__condition:
+            self.__put_count += 1
+
+            if len(self.__items) >= self.__max_length:
+                if self.__policy == self.DROP_NEWEST:
+                    self.__drop_count += 1
+                    return False
+
+                if self.__policy == self.DROP_OLDEST:
+                    self.__items.popleft()
+                    self.__drop_count += 1
+
+                else:
+                    started = time.time()
+
+                    while self.__running and len(self.__items) >= self.__max_length:
+                        self.__condition.wait()
+
+                    self.__block_time += time.time() - started
+
+            self.__items.append(item)
+            self.__max_depth = max(self.__max_depth, len(self.__items))
+
+            self.__condition.notify_all()
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                while self.__running and not self.__items:
+                    self.__condition.wait()
+
+                if not self.__items:
+                    return
+
+                batch = [self.__items.popleft() for _ in range(min(len(self.__items), self.__max_batch))]
+
+                self.__condition.notify_all()                   # space for a blocked put(..)
+
+            try:
+                self.__deliver(batch)
+                delivered = True
+
+            except Exception as ex:
+                print("DeliveryQueue: %s: %s: %s" % (self.name, ex.__class__.__name__, ex), file=sys.stderr)
+                sys.stderr.flush()
+
+                delivered = False
+
+            with self.__condition:
+                if delivered:
+                    self.__delivered_count += len(batch)
+                else:
+                    self.__fail_count += len(batch)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def max_length(self):
+        return self.__max_length
+
+
+    @property
+    def policy(self):
+        return self.__policy
+
+
+    @property
+    def depth(self):
+        return len(self.__items)
+
+
+    @property
+    def max_depth(self):
+        return self.__max_depth
+
+
+    @property
+    def put_count(self):
+        return self.__put_count
+
+
+    @property
+    def delivered_count(self):
+        return self.__delivered_count
+
+
+    @property
+    def drop_count(self):
+        return self.__drop_count
+
+
+    @property
+    def fail_count(self):
+        return self.__fail_count
+
+
+    @property
+    def block_time(self):
+        return self.__block_time
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "DeliveryQueue:{name:%s, max_length:%s, policy:%s, depth:%s, max_depth:%s, put_count:%s, " \
+               "delivered_count:%s, drop_count:%s, fail_count:%s, block_time:%0.3f}" % \
+               (self.name, self.max_length, self.policy, self.depth, self.max_depth, self.put_count,
+                self.delivered_count, self.drop_count, self.fail_count, self.block_time)
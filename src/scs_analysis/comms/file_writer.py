@@ -0,0 +1,88 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A writer that appends newline-terminated messages to a file, with the same interface as UDSWriter, so that a
+subscription can be routed to a file.
+
+Each write is flushed to the operating system at once, so that the file can be followed - for example, with tail -f.
+"""
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FileWriter(object):
+    """
+    classdocs
+    """
+
+    EOM = '\n'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename):
+        """
+        Constructor
+        """
+        self.__filename = filename                      # string
+
+        self.__file = None                              # file
+
+        self.__write_count = 0                          # int               messages written
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, wait_for_availability=True):
+        if self.__file is None:
+            self.__file = open(self.filename, "ab")
+
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, message, wait_for_availability=True):
+        """
+        appends one message, or several separated by EOM, as str or as UTF-8 bytes
+        """
+        if isinstance(message, bytes):
+            data = message.strip() + self.EOM.encode()
+        else:
+            data = (message.strip() + self.EOM).encode()
+
+        self.connect()
+
+        self.__file.write(data)
+        self.__file.flush()
+
+        self.__write_count += data.count(self.EOM.encode())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def address(self):
+        return self.__filename
+
+
+    @property
+    def write_count(self):
+        return self.__write_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "FileWriter:{filename:%s, write_count:%s}" % (self.filename, self.write_count)
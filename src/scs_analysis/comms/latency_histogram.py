@@ -0,0 +1,169 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A histogram of latencies, in the style of HdrHistogram: values are held in whole milliseconds, in log-linear buckets
+of 2 ** SUB_BUCKET_BITS sub-buckets per power of two, so that every value is held to within 1 / 2 ** (SUB_BUCKET_BITS
+- 1) of its magnitude - about 3% - whatever its range. Recording is one shift and one dictionary update; the memory
+needed grows with the range of the values, not their number.
+
+Negative latencies - where a message was recorded after it was received, by clocks that disagree - are counted, but not
+held in the histogram.
+"""
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LatencyHistogram(object):
+    """
+    classdocs
+    """
+
+    SUB_BUCKET_BITS = 6
+
+    PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def index(cls, value):
+        """
+        returns the bucket index for a value in milliseconds - values below 2 ** SUB_BUCKET_BITS have their own bucket
+        """
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+
+        if shift <= 0:
+            return value
+
+        return (shift << cls.SUB_BUCKET_BITS) + (value >> shift)
+
+
+    @classmethod
+    def highest_equivalent(cls, index):
+        """
+        returns the highest value in milliseconds held by the bucket
+        """
+        shift = index >> cls.SUB_BUCKET_BITS
+        sub_bucket = index & ((1 << cls.SUB_BUCKET_BITS) - 1)
+
+        return ((sub_bucket + 1) << shift) - 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__counts = {}                              # dict of index: int
+
+        self.__count = 0                                # int
+        self.__negative_count = 0                       # int
+        self.__total = 0                                # int               milliseconds
+        self.__min = None                               # int               milliseconds
+        self.__max = None                               # int               milliseconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def record(self, latency):
+        """
+        latency is in seconds
+        """
+        value = int(latency * 1000)
+
+        if value < 0:
+            self.__negative_count += 1
+            return
+
+        index = self.index(value)
+        self.__counts[index] = self.__counts.get(index, 0) + 1
+
+        self.__count += 1
+        self.__total += value
+
+        if self.__min is None or value < self.__min:
+            self.__min = value
+
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+
+    def percentile(self, percentile):
+        """
+        returns the latency in seconds at or below which percentile % of the recorded latencies lie, or None
+        """
+        if self.__count == 0:
+            return None
+
+        threshold = self.__count * percentile / 100.0
+        cumulative = 0
+
+        for index in sorted(self.__counts):
+            cumulative += self.__counts[index]
+
+            if cumulative >= threshold:
+                return min(self.highest_equivalent(index), self.__max) / 1000.0
+
+        return self.__max / 1000.0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['count'] = self.count
+        jdict['negative'] = self.negative_count
+        jdict['min'] = self.min
+        jdict['mean'] = self.mean
+        jdict['max'] = self.max
+
+        for percentile in self.PERCENTILES:
+            jdict['p%g' % percentile] = self.percentile(percentile)
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def count(self):
+        return self.__count
+
+
+    @property
+    def negative_count(self):
+        return self.__negative_count
+
+
+    @property
+    def min(self):
+        return None if self.__min is None else self.__min / 1000.0
+
+
+    @property
+    def max(self):
+        return None if self.__max is None else self.__max / 1000.0
+
+
+    @property
+    def mean(self):
+        return None if self.__count == 0 else round(self.__total / self.__count / 1000.0, 3)
+
+
+    @property
+    def bucket_count(self):
+        return len(self.__counts)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LatencyHistogram:{count:%s, negative_count:%s, min:%s, mean:%s, max:%s, p99:%s, bucket_count:%s}" % \
+               (self.count, self.negative_count, self.min, self.mean, self.max, self.percentile(99.0),
+                self.bucket_count)
@@ -0,0 +1,246 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Per-topic latency and rate statistics for the messages of MQTT subscriptions.
+
+For each message, the rec field of its payload is compared with the time at which the message was received by the
+MQTT client, and with the time at which it had been written to its sinks. Each latency is recorded in a
+LatencyHistogram for its topic; messages without a valid rec field are counted, but not timed. The handlers' writer
+threads record whole batches of messages, so the lock is taken once per batch, not once per message.
+
+Where the rec fields are parsed elsewhere - such as by the worker processes of a ShardPool - the times are recorded
+with record_timestamps(..).
+
+If a filename is given, the statistics are saved to it every interval, and when the statistics are closed. The file
+is replaced atomically. The rate for each topic is given over the interval since the last save, and since start.
+
+example document:
+{"rec": "2026-10-19T12:00:00Z", "period": 60.0, "topics": {"south-coast-science-dev/production-test/loc/1/gases":
+{"count": 600, "untimed": 0, "rate": 10.0, "mean-rate": 9.8, "receive": {"count": 600, "negative": 0, "min": 0.101,
+"mean": 0.205, "max": 1.43, "p50": 0.191, "p90": 0.327, "p99": 0.879, "p99.9": 1.43}, "write": {...}}}}
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from collections import OrderedDict
+
+from scs_analysis.comms.latency_histogram import LatencyHistogram
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LatencyStats(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_INTERVAL = 60.0                         # seconds
+
+    __REC = re.compile(rb'"rec"\s*:\s*"([^"]+)"')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def rec_timestamp(rec):
+        """
+        returns the ISO 8601 rec as epoch seconds, or None if it is not valid
+        """
+        localised = LocalizedDatetime.construct_from_iso8601(rec) if isinstance(rec, str) else None
+
+        return None if localised is None else localised.timestamp()
+
+
+    @classmethod
+    def raw_rec(cls, payload):
+        """
+        returns the rec field of a JSON payload given as bytes, without decoding the payload, or None
+        """
+        match = cls.__REC.search(payload)
+
+        return None if match is None else match.group(1).decode()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename=None, interval=DEFAULT_INTERVAL):
+        """
+        Constructor
+        """
+        self.__filename = filename                      # string (may be None)
+        self.__interval = interval                      # float             seconds
+
+        self.__topics = OrderedDict()                   # dict of topic: _TopicStats
+        self.__lock = threading.Lock()
+
+        self.__started = time.time()                    # float
+        self.__saved = self.__started                   # float
+        self.__saved_counts = {}                        # dict of topic: int
+
+        self.__running = threading.Event()
+        self.__thread = None                            # threading.Thread
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        if self.__filename is None:
+            return
+
+        self.__running.set()
+
+        self.__thread = threading.Thread(target=self.__run, name="LatencyStats", daemon=True)
+        self.__thread.start()
+
+
+    def close(self):
+        self.__running.clear()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        if self.__filename is not None:
+            self.save()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def record(self, timings):
+        """
+        timings is a list of (topic, rec, received, written) - rec is ISO 8601 or None, the times are epoch seconds
+        """
+        self.record_timestamps([(topic, self.rec_timestamp(rec), received, written)
+                                for topic, rec, received, written in timings])
+
+
+    def record_timestamps(self, timings):
+        """
+        timings is a list of (topic, rec_time, received, written) - rec_time is from rec_timestamp(..), or None
+        """
+        with self.__lock:
+            for topic, rec_time, received, written in timings:
+                try:
+                    stats = self.__topics[topic]
+
+                except KeyError:
+                    stats = self.__topics[topic] = _TopicStats()
+
+                stats.count += 1
+
+                if rec_time is None:
+                    stats.untimed_count += 1
+                    continue
+
+                stats.receive.record(received - rec_time)
+                stats.write.record(written - rec_time)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def save(self):
+        now = time.time()
+        jdict = self.as_json(now, self.__saved, self.__saved_counts)
+
+        tmp_filename = self.__filename + '.tmp'
+
+        with open(tmp_filename, "w") as f:
+            f.write(json.dumps(jdict))
+
+        os.replace(tmp_filename, self.__filename)
+
+        self.__saved = now
+        self.__saved_counts = OrderedDict((topic, stats['count']) for topic, stats in jdict['topics'].items())
+
+
+    def as_json(self, now=None, since=None, since_counts=None):
+        now = time.time() if now is None else now
+        since = self.__started if since is None else since
+
+        with self.__lock:
+            topics = OrderedDict()
+
+            for topic, stats in self.__topics.items():
+                period_count = stats.count - (0 if since_counts is None else since_counts.get(topic, 0))
+
+                topic_jdict = OrderedDict()
+
+                topic_jdict['count'] = stats.count
+                topic_jdict['untimed'] = stats.untimed_count
+                topic_jdict['rate'] = round(period_count / (now - since), 3) if now > since else None
+                topic_jdict['mean-rate'] = round(stats.count / (now - self.__started), 3) \
+                    if now > self.__started else None
+                topic_jdict['receive'] = stats.receive.as_json()
+                topic_jdict['write'] = stats.write.as_json()
+
+                topics[topic] = topic_jdict
+
+        jdict = OrderedDict()
+
+        jdict['rec'] = LocalizedDatetime.construct_from_timestamp(now).as_iso8601()
+        jdict['period'] = round(now - since, 3)
+        jdict['topics'] = topics
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while self.__running.is_set():
+            time.sleep(min(self.__interval, 1.0))
+
+            if time.time() - self.__saved >= self.__interval:
+                try:
+                    self.save()
+
+                except OSError:
+                    pass                                        # tried again at the next interval
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def interval(self):
+        return self.__interval
+
+
+    @property
+    def topics(self):
+        return list(self.__topics.keys())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LatencyStats:{filename:%s, interval:%s, topics:%s}" % \
+               (self.filename, self.interval, len(self.__topics))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _TopicStats(object):
+    """
+    classdocs
+    """
+
+    __slots__ = ('count', 'untimed_count', 'receive', 'write')
+
+    def __init__(self):
+        self.count = 0                                  # int
+        self.untimed_count = 0                          # int
+        self.receive = LatencyHistogram()               # LatencyHistogram  rec to receipt
+        self.write = LatencyHistogram()                 # LatencyHistogram  rec to write
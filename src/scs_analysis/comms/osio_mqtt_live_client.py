@@ -0,0 +1,124 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A thin wrapper of scs_host's OpenSensors.io MQTTClient, whose subscriptions can be changed while it is connected.
+
+Once the client has been connected, further subscriptions can be made, and any subscription removed, with
+subscribe(..) and unsubscribe(..), without the client reconnecting. Whenever the paho client connects, or reconnects,
+every current subscription is made - so a subscription made while the broker cannot be reached is made when it is
+reached again, and a subscription that has been removed is not made again.
+
+Errors returned by paho are raised as OSError, as is a change made before the client has been connected.
+
+https://pypi.python.org/pypi/paho-mqtt
+"""
+
+import threading
+
+from collections import OrderedDict
+
+import paho.mqtt.client as paho
+
+from scs_host.client.mqtt_client import MQTTClient
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class OSIOMQTTLiveClient(MQTTClient):
+    """
+    classdocs
+    """
+
+    __SUB_QOS = 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, *subscribers):
+        """
+        Constructor
+        """
+        super().__init__(*subscribers)
+
+        self.__subscribers = OrderedDict((subscriber.topic, subscriber) for subscriber in subscribers)
+        self.__topics = tuple(self.__subscribers.keys())           # read by the paho network thread
+
+        self.__lock = threading.RLock()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def subscribe(self, subscriber):
+        """
+        subscribes the MQTTSubscriber's topic
+        """
+        with self.__lock:
+            client = self.__paho_client()
+
+            client.message_callback_add(subscriber.topic, MQTTClient.on_message_handler(subscriber))
+
+            result, _ = client.subscribe(subscriber.topic, qos=self.__SUB_QOS)
+
+            # while the broker cannot be reached, the subscription is made by on_connect(..)...
+            if result not in (paho.MQTT_ERR_SUCCESS, paho.MQTT_ERR_NO_CONN):
+                client.message_callback_remove(subscriber.topic)
+                raise OSError("subscribe: %s: %s" % (subscriber.topic, paho.error_string(result)))
+
+            self.__subscribers[subscriber.topic] = subscriber
+            self.__topics = tuple(self.__subscribers.keys())
+
+
+    def unsubscribe(self, topic):
+        """
+        returns False if the topic was not subscribed
+        """
+        with self.__lock:
+            if topic not in self.__subscribers:
+                return False
+
+            client = self.__paho_client()
+
+            result, _ = client.unsubscribe(topic)
+
+            if result not in (paho.MQTT_ERR_SUCCESS, paho.MQTT_ERR_NO_CONN):
+                raise OSError("unsubscribe: %s: %s" % (topic, paho.error_string(result)))
+
+            client.message_callback_remove(topic)
+
+            del self.__subscribers[topic]
+            self.__topics = tuple(self.__subscribers.keys())
+
+            return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def on_connect(self, _client, _userdata, _flags, _rc):
+        # on the paho network thread, which may hold paho's callback lock - so the lock is not taken here...
+        for topic in self.__topics:
+            _client.subscribe(topic, qos=self.__SUB_QOS)
+
+
+    def __paho_client(self):
+        # the paho Client made by scs_host's MQTTClient.connect(..)...
+        client = getattr(self, '_MQTTClient__client', None)
+
+        if client is None:
+            raise OSError("no client")
+
+        return client
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def topics(self):
+        return list(self.__topics)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "OSIOMQTTLiveClient:{topics:%s}" % self.topics
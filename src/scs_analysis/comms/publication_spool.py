@@ -0,0 +1,478 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+An append-only, disk-backed spool of outbound messages, so that messages are accepted at once - whether or not the
+broker can be reached - and are not lost when the process is restarted.
+
+The spool is a directory of segment files, each holding newline-terminated messages, and a cursor file. append(..)
+writes to the last segment, which is rolled over when it reaches segment_size. read() yields each message after the
+cursor, in order, with its position, and waits for more when it has caught up. When a message has been dealt with,
+its position is passed to acknowledge(..); the cursor advances over messages that have been acknowledged, in order,
+and segments wholly before the cursor are deleted.
+
+Appends are flushed to the operating system at once. The sync policy sets when they are also written to disk:
+
+always          every append is synced
+interval        the spool is synced at most once per SYNC_INTERVAL_TIME (the default)
+never           syncing is left to the operating system
+
+The cursor file is replaced atomically, at most once per SYNC_INTERVAL_TIME, and when the spool is closed. Messages
+that were read but not acknowledged when the process stopped are read again on restart, so delivery is at least
+once.
+
+The spool is bounded by max_size: when it is full, its oldest segment is deleted, and the unread messages that it
+held are counted as dropped.
+
+example cursor document:
+{"segment": 12, "offset": 52436}
+"""
+
+import json
+import os
+import threading
+import time
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PublicationSpool(object):
+    """
+    classdocs
+    """
+
+    SYNC_ALWAYS = 'always'
+    SYNC_INTERVAL = 'interval'
+    SYNC_NEVER = 'never'
+
+    SYNC_POLICIES = (SYNC_ALWAYS, SYNC_INTERVAL, SYNC_NEVER)
+
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024             # bytes
+    DEFAULT_SEGMENT_SIZE = 1024 * 1024              # bytes
+    DEFAULT_SYNC = SYNC_INTERVAL
+
+    SYNC_INTERVAL_TIME = 1.0                        # seconds
+
+    EOM = '\n'
+
+    __CURSOR_FILENAME = 'cursor.json'
+    __SEGMENT_SUFFIX = '.spool'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def __segment_number(cls, filename):
+        if not filename.endswith(cls.__SEGMENT_SUFFIX):
+            return None
+
+        try:
+            return int(filename[:-len(cls.__SEGMENT_SUFFIX)])
+
+        except ValueError:
+            return None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE, segment_size=DEFAULT_SEGMENT_SIZE, sync=DEFAULT_SYNC):
+        """
+        Constructor
+        """
+        if sync not in self.SYNC_POLICIES:
+            raise ValueError("unknown sync policy: %s" % sync)
+
+        if int(segment_size) > int(max_size):
+            raise ValueError("segment_size %s exceeds max_size %s" % (segment_size, max_size))
+
+        self.__directory = directory                    # string
+        self.__max_size = int(max_size)                 # int               bytes
+        self.__segment_size = int(segment_size)         # int               bytes
+        self.__sync = sync                              # string
+
+        self.__condition = threading.Condition()
+        self.__running = False                          # bool
+
+        self.__sizes = OrderedDict()                    # dict of segment: bytes, in segment order
+        self.__tail = None                              # file              last segment, for append
+
+        self.__cursor = (0, 0)                          # (segment, offset) acknowledged up to
+        self.__outstanding = OrderedDict()              # dict of (segment, offset): acknowledged, in read order
+
+        self.__read_position = (0, 0)                   # (segment, offset)
+        self.__reader = None                            # file
+        self.__reader_segment = None                    # int
+
+        self.__synced = 0.0                             # float             epoch seconds
+        self.__saved = 0.0                              # float             epoch seconds
+
+        self.__append_count = 0                         # int
+        self.__read_count = 0                           # int
+        self.__acknowledged_count = 0                   # int
+        self.__drop_count = 0                           # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        """
+        opens the spool, resuming from its cursor - a message left incomplete by a crash is discarded
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        segments = sorted(number for number in (self.__segment_number(name) for name in os.listdir(self.directory))
+                          if number is not None)
+
+        self.__sizes = OrderedDict((segment, os.path.getsize(self.__path(segment))) for segment in segments)
+
+        # cursor...
+        try:
+            with open(os.path.join(self.directory, self.__CURSOR_FILENAME), "r") as f:
+                jdict = json.loads(f.read())
+
+            self.__cursor = (jdict['segment'], jdict['offset'])
+
+        except (FileNotFoundError, ValueError, KeyError):
+            self.__cursor = (segments[0], 0) if segments else (0, 0)
+
+        # the segments before the cursor have gone...
+        if not segments:
+            self.__cursor = (self.__cursor[0], 0)
+
+        elif self.__cursor[0] < segments[0]:
+            self.__cursor = (segments[0], 0)
+
+        # tail...
+        if not self.__sizes:
+            self.__sizes[self.__cursor[0]] = 0
+
+        tail_segment = next(reversed(self.__sizes))
+
+        self.__tail = open(self.__path(tail_segment), "ab+")
+        self.__truncate_incomplete(tail_segment)
+
+        self.__read_position = self.__cursor
+        self.__outstanding = OrderedDict()
+
+        self.__running = True
+
+        self.__delete_acknowledged()
+
+
+    def close(self):
+        """
+        stops read(), syncs the spool and saves the cursor - messages not acknowledged are read again on reopen
+        """
+        with self.__condition:
+            if not self.__running:
+                return
+
+            self.__running = False
+            self.__condition.notify_all()
+
+            self.__sync_tail()
+            self.__save_cursor()
+            self.__delete_acknowledged()
+
+            self.__tail.close()
+            self.__close_reader()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def append(self, message):
+        """
+        spools the message - a message is one line of text
+        """
+        data = (message.strip() + self.EOM).encode()
+
+        with self.__condition:
+            tail_segment = next(reversed(self.__sizes))
+
+            if self.__sizes[tail_segment] > 0 and self.__sizes[tail_segment] + len(data) > self.__segment_size:
+                tail_segment = self.__roll(tail_segment)
+
+            self.__tail.write(data)
+            self.__tail.flush()
+
+            self.__sizes[tail_segment] += len(data)
+            self.__append_count += 1
+
+            if self.__sync == self.SYNC_ALWAYS or \
+                    (self.__sync == self.SYNC_INTERVAL and time.time() - self.__synced >= self.SYNC_INTERVAL_TIME):
+                self.__sync_tail()
+
+            self.__enforce_max_size()
+
+            self.__condition.notify_all()
+
+
+    def read(self):                                             # blocking
+        """
+        yields (message, position) for each message after the cursor, until the spool is closed
+        """
+        while True:
+            with self.__condition:
+                while True:
+                    if not self.__running:
+                        return
+
+                    record = self.__read_record()
+
+                    if record is not None:
+                        break
+
+                    self.__condition.wait()
+
+                message, position = record
+
+                self.__outstanding[position] = False
+                self.__read_count += 1
+
+            yield message, position
+
+
+    def acknowledge(self, position):
+        """
+        records that the message read at position has been dealt with
+        """
+        with self.__condition:
+            if position not in self.__outstanding:
+                return                                          # dropped with its segment
+
+            self.__outstanding[position] = True
+            self.__acknowledged_count += 1
+
+            # the cursor advances over acknowledged messages, in order...
+            while self.__outstanding:
+                first_position = next(iter(self.__outstanding))
+
+                if not self.__outstanding[first_position]:
+                    break
+
+                del self.__outstanding[first_position]
+                self.__cursor = first_position
+
+            if not self.__running or time.time() - self.__saved >= self.SYNC_INTERVAL_TIME:
+                self.__save_cursor()
+                self.__delete_acknowledged()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __read_record(self):
+        """
+        returns (message, position after message) for the next complete message, or None
+        """
+        segment, offset = self.__read_position
+
+        # skip deleted segments...
+        if segment not in self.__sizes:
+            later = [number for number in self.__sizes if number > segment]
+
+            if not later:
+                return None
+
+            segment, offset = later[0], 0
+
+        if offset >= self.__sizes[segment]:
+            later = [number for number in self.__sizes if number > segment]
+
+            if not later:
+                self.__read_position = (segment, offset)
+                return None
+
+            segment, offset = later[0], 0
+
+            if offset >= self.__sizes[segment]:
+                self.__read_position = (segment, offset)
+                return None
+
+        if self.__reader_segment != segment:
+            self.__close_reader()
+
+            self.__reader = open(self.__path(segment), "rb")
+            self.__reader_segment = segment
+
+        self.__reader.seek(offset)
+        line = self.__reader.readline()
+
+        if not line.endswith(self.EOM.encode()):
+            self.__read_position = (segment, offset)
+            return None
+
+        self.__read_position = (segment, offset + len(line))
+
+        return line.decode().strip(), self.__read_position
+
+
+    def __roll(self, tail_segment):
+        self.__sync_tail()
+        self.__tail.close()
+
+        tail_segment += 1
+
+        self.__tail = open(self.__path(tail_segment), "ab+")
+        self.__sizes[tail_segment] = 0
+
+        return tail_segment
+
+
+    def __enforce_max_size(self):
+        while len(self.__sizes) > 1 and sum(self.__sizes.values()) > self.__max_size:
+            segment = next(iter(self.__sizes))
+
+            # unread messages are lost...
+            read_segment, read_offset = self.__read_position
+
+            if segment >= read_segment:
+                with open(self.__path(segment), "rb") as f:
+                    f.seek(read_offset if segment == read_segment else 0)
+                    self.__drop_count += f.read().count(self.EOM.encode())
+
+            self.__delete_segment(segment)
+
+            # messages read from the segment are in flight, and are no longer held by the cursor...
+            for position in [position for position in self.__outstanding if position[0] == segment]:
+                del self.__outstanding[position]
+
+            next_segment = next(iter(self.__sizes))
+
+            if self.__cursor[0] <= segment:
+                self.__cursor = (next_segment, 0)
+
+            if read_segment <= segment:
+                self.__read_position = (next_segment, 0)
+
+
+    def __delete_acknowledged(self):
+        tail_segment = next(reversed(self.__sizes))
+
+        for segment in [segment for segment in self.__sizes if segment < self.__cursor[0] and segment != tail_segment]:
+            self.__delete_segment(segment)
+
+
+    def __delete_segment(self, segment):
+        if self.__reader_segment == segment:
+            self.__close_reader()
+
+        del self.__sizes[segment]
+
+        try:
+            os.remove(self.__path(segment))
+
+        except FileNotFoundError:
+            pass
+
+
+    def __truncate_incomplete(self, segment):
+        self.__tail.seek(0)
+        data = self.__tail.read()
+
+        complete = data.rfind(self.EOM.encode()) + 1
+
+        if complete < len(data):
+            self.__tail.truncate(complete)
+
+        self.__sizes[segment] = complete
+
+
+    def __sync_tail(self):
+        if self.__sync != self.SYNC_NEVER:
+            os.fsync(self.__tail.fileno())
+
+        self.__synced = time.time()
+
+
+    def __save_cursor(self):
+        jdict = OrderedDict([('segment', self.__cursor[0]), ('offset', self.__cursor[1])])
+
+        filename = os.path.join(self.directory, self.__CURSOR_FILENAME)
+        tmp_filename = filename + '.tmp'
+
+        with open(tmp_filename, "w") as f:
+            f.write(json.dumps(jdict))
+            f.flush()
+
+            if self.__sync != self.SYNC_NEVER:
+                os.fsync(f.fileno())
+
+        os.replace(tmp_filename, filename)
+
+        self.__saved = time.time()
+
+
+    def __close_reader(self):
+        if self.__reader is not None:
+            self.__reader.close()
+
+        self.__reader = None
+        self.__reader_segment = None
+
+
+    def __path(self, segment):
+        return os.path.join(self.directory, "%012d%s" % (segment, self.__SEGMENT_SUFFIX))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__directory
+
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+
+    @property
+    def sync(self):
+        return self.__sync
+
+
+    @property
+    def size(self):
+        return sum(self.__sizes.values())
+
+
+    @property
+    def segment_count(self):
+        return len(self.__sizes)
+
+
+    @property
+    def cursor(self):
+        return self.__cursor
+
+
+    @property
+    def append_count(self):
+        return self.__append_count
+
+
+    @property
+    def read_count(self):
+        return self.__read_count
+
+
+    @property
+    def acknowledged_count(self):
+        return self.__acknowledged_count
+
+
+    @property
+    def drop_count(self):
+        return self.__drop_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PublicationSpool:{directory:%s, max_size:%s, sync:%s, size:%s, segment_count:%s, cursor:%s, " \
+               "append_count:%s, read_count:%s, acknowledged_count:%s, drop_count:%s}" % \
+               (self.directory, self.max_size, self.sync, self.size, self.segment_count, self.cursor,
+                self.append_count, self.read_count, self.acknowledged_count, self.drop_count)
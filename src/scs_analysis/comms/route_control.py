@@ -0,0 +1,228 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A control channel for the routes and subscriptions of a running MQTT client, on a Unix domain socket.
+
+Each command is one JSON document per line, and is answered with one JSON document per line:
+
+{"cmd": "route", "topic": FILTER, "sink": SINK}
+{"cmd": "unroute", "topic": FILTER, "sink": SINK}
+{"cmd": "routes"}
+{"cmd": "subscribe", "topic": FILTER}
+{"cmd": "unsubscribe", "topic": FILTER}
+{"cmd": "subscriptions"}
+
+Routes are changed on the router that the subscription handlers use, so a change takes effect with the next message,
+without the client reconnecting. A route is answered with covered: false if no broker subscription covers its filter -
+the route is made, but receives nothing until a subscription that covers it is made. Sinks are made with the client's
+sink(spec) function, so that routes share sinks; a sink is kept until the client stops.
+
+Broker subscriptions are changed with the client's subscribe(topic) and unsubscribe(topic) functions, on the live
+connection. A subscription's messages are written to the sinks of the routes that match them, as for the subscriptions
+made at startup. Without these functions, subscribe and unsubscribe commands are refused.
+"""
+
+import json
+import sys
+import threading
+
+from collections import OrderedDict
+
+from scs_analysis.comms.route_sink import RouteSink
+from scs_analysis.comms.topic_router import TopicRouter
+from scs_analysis.comms.uds_server import UDSServer
+
+from scs_core.data.json import JSONify
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class RouteControl(object):
+    """
+    classdocs
+    """
+
+    ROUTE = 'route'
+    UNROUTE = 'unroute'
+    ROUTES = 'routes'
+
+    SUBSCRIBE = 'subscribe'
+    UNSUBSCRIBE = 'unsubscribe'
+    SUBSCRIPTIONS = 'subscriptions'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, address, router, sink, subscriptions, verbose=False, subscribe=None, unsubscribe=None):
+        """
+        Constructor - sink(spec) returns the connected RouteSink for spec, subscriptions are the broker's topic filters,
+        subscribe(topic) and unsubscribe(topic) change the broker's subscriptions
+        """
+        self.__router = router                          # TopicRouter
+        self.__sink = sink                              # callable
+        self.__subscriptions = list(subscriptions)      # list of string
+        self.__verbose = verbose                        # bool
+
+        self.__subscribe = subscribe                    # callable (may be None)
+        self.__unsubscribe = unsubscribe                # callable (may be None)
+
+        self.__server = UDSServer(address)
+        self.__thread = None                            # threading.Thread
+
+        self.__command_count = 0                        # int
+        self.__error_count = 0                          # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__server.connect()
+
+        self.__thread = threading.Thread(target=self.__run, name="RouteControl", daemon=True)
+        self.__thread.start()
+
+
+    def close(self):
+        self.__server.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def command(self, jdict):
+        """
+        returns the reply to the command, as an OrderedDict
+        """
+        self.__command_count += 1
+
+        reply = OrderedDict()
+        reply['cmd'] = jdict.get('cmd')
+
+        try:
+            if reply['cmd'] == self.ROUTES:
+                reply['routes'] = OrderedDict((topic_filter, [sink.spec for sink in sinks])
+                                              for topic_filter, sinks in list(self.__router.routes.items()))
+                reply['ok'] = True
+                return reply
+
+            if reply['cmd'] == self.SUBSCRIPTIONS:
+                reply['subscriptions'] = list(self.__subscriptions)
+                reply['ok'] = True
+                return reply
+
+            if reply['cmd'] in (self.SUBSCRIBE, self.UNSUBSCRIBE):
+                return self.__change_subscription(reply, jdict)
+
+            if reply['cmd'] not in (self.ROUTE, self.UNROUTE):
+                raise ValueError("unknown command: %s" % reply['cmd'])
+
+            topic_filter = reply['topic'] = jdict['topic']
+            spec = reply['sink'] = jdict['sink']
+
+            if not TopicRouter.is_valid_filter(topic_filter):
+                raise ValueError("invalid topic filter: %s" % topic_filter)
+
+            if not RouteSink.is_valid_spec(spec):
+                raise ValueError("invalid sink: %s" % spec)
+
+            if reply['cmd'] == self.ROUTE:
+                self.__router.add(topic_filter, self.__sink(spec))
+
+                reply['ok'] = True
+                reply['covered'] = any(TopicRouter.covers(subscription, topic_filter)
+                                       for subscription in self.__subscriptions)
+
+            else:
+                sinks = [sink for sink in self.__router.sinks if sink.spec == spec]
+
+                reply['ok'] = bool(sinks) and self.__router.remove(topic_filter, sinks[0])
+
+        except (ValueError, KeyError, TypeError, AttributeError, OSError) as ex:
+            self.__error_count += 1
+
+            reply['ok'] = False
+            reply['error'] = "%s: %s" % (ex.__class__.__name__, ex)
+
+        return reply
+
+
+    def __change_subscription(self, reply, jdict):
+        topic_filter = reply['topic'] = jdict['topic']
+
+        if not TopicRouter.is_valid_filter(topic_filter):
+            raise ValueError("invalid topic filter: %s" % topic_filter)
+
+        if self.__subscribe is None or self.__unsubscribe is None:
+            raise ValueError("subscriptions cannot be changed")
+
+        if reply['cmd'] == self.SUBSCRIBE:
+            if topic_filter not in self.__subscriptions:
+                self.__subscribe(topic_filter)
+                self.__subscriptions.append(topic_filter)
+
+            reply['ok'] = True
+
+        else:
+            reply['ok'] = topic_filter in self.__subscriptions
+
+            if reply['ok']:
+                self.__unsubscribe(topic_filter)
+                self.__subscriptions.remove(topic_filter)
+
+        return reply
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        for connection, line in self.__server.read():
+            if line is None:
+                connection.close()
+                continue
+
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+
+                if not isinstance(jdict, dict):
+                    raise ValueError(line)
+
+            except ValueError:
+                jdict = OrderedDict()
+
+            reply = self.command(jdict)
+
+            if self.__verbose:
+                print("RouteControl: %s" % JSONify.dumps(reply), file=sys.stderr)
+                sys.stderr.flush()
+
+            connection.write(JSONify.dumps(reply))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def address(self):
+        return self.__server.address
+
+
+    @property
+    def subscriptions(self):
+        return list(self.__subscriptions)
+
+
+    @property
+    def command_count(self):
+        return self.__command_count
+
+
+    @property
+    def error_count(self):
+        return self.__error_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "RouteControl:{address:%s, subscriptions:%s, command_count:%s, error_count:%s}" % \
+               (self.address, self.subscriptions, self.command_count, self.error_count)
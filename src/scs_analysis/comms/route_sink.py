@@ -0,0 +1,139 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A destination for routed messages, specified as:
+
+uds:PATH        a Unix domain socket, written with UDSWriter
+file:PATH       a file, appended with FileWriter
+stdout          stdout
+
+A sink may be written by the writer threads of several subscriptions, so each write is made under the sink's lock. A
+write may hold several messages, separated by EOM, as str or as UTF-8 bytes. Writes to a domain socket with no reader
+raise ConnectionRefusedError, as UDSWriter.
+"""
+
+import sys
+import threading
+
+from scs_analysis.comms.file_writer import FileWriter
+from scs_analysis.comms.uds_writer import UDSWriter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class RouteSink(object):
+    """
+    classdocs
+    """
+
+    UDS = 'uds'
+    FILE = 'file'
+    STDOUT = 'stdout'
+
+    EOM = '\n'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def is_valid_spec(cls, spec):
+        kind, _, path = spec.partition(':')
+
+        if kind == cls.STDOUT:
+            return not path
+
+        return kind in (cls.UDS, cls.FILE) and bool(path)
+
+
+    @classmethod
+    def construct(cls, spec):
+        if not cls.is_valid_spec(spec):
+            raise ValueError("invalid sink: %s" % spec)
+
+        kind, _, path = spec.partition(':')
+
+        if kind == cls.UDS:
+            return cls(spec, UDSWriter(path))
+
+        if kind == cls.FILE:
+            return cls(spec, FileWriter(path))
+
+        return cls(spec, None)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, spec, comms):
+        """
+        Constructor - comms is None for stdout
+        """
+        self.__spec = spec                              # string
+        self.__comms = comms                            # UDSWriter, FileWriter or None
+
+        self.__lock = threading.Lock()
+
+        self.__write_count = 0                          # int               writes
+        self.__refused_count = 0                        # int               writes refused
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self):
+        if self.__comms is not None:
+            self.__comms.connect()
+
+
+    def close(self):
+        with self.__lock:
+            if self.__comms is not None:
+                self.__comms.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, message):
+        with self.__lock:
+            if self.__comms is None:
+                print(message.decode().strip() if isinstance(message, bytes) else message.strip())
+                sys.stdout.flush()
+
+            else:
+                try:
+                    self.__comms.write(message, False)
+
+                except ConnectionRefusedError:
+                    self.__refused_count += 1
+                    raise
+
+            self.__write_count += 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def spec(self):
+        return self.__spec
+
+
+    @property
+    def comms(self):
+        return self.__comms
+
+
+    @property
+    def write_count(self):
+        return self.__write_count
+
+
+    @property
+    def refused_count(self):
+        return self.__refused_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "RouteSink:{spec:%s, comms:%s, write_count:%s, refused_count:%s}" % \
+               (self.spec, self.comms, self.write_count, self.refused_count)
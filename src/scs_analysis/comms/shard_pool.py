@@ -0,0 +1,399 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A pool of worker processes that serialise and write the messages of MQTT subscriptions, with the subscribed topics
+sharded across the workers.
+
+The MQTT client keeps its one broker connection. handle(..) is called on the MQTT client's network thread, and only
+queues the message, with the time at which it was received. A dispatcher thread takes up to MAX_BATCH queued messages
+at once, and sends each worker its part of the batch in one put, so that the cost of a put is shared by many
+messages. A topic always goes to the same worker - by CRC-32 of the topic - and each worker takes its batches
+in order, so the messages of each topic are written in the order in which they were received. As without shards,
+where each subscription has its own queue, there is no order between topics.
+
+Each worker is a pipeline of its own: it decodes and re-encodes the payloads, with AWSMQTTHandler.serialise(..), writes
+them to its own sinks, with AWSMQTTHandler.write(..), and parses their rec fields. The workers' routes are copies of
+the router's routes, made again by the dispatcher whenever the router's version changes, so that routes changed by a
+RouteControl are followed. Each worker has its own connection to each domain socket - UDSReader reads several
+connections - and appends to each file with one write per batch. Lines for stdout, and echoed lines, are returned to
+the parent, which writes them, so that stdout has one writer. The parent records the times of the messages, as
+parsed by the workers, in the LatencyStats, if there are any.
+
+Each worker takes at most MAX_BATCHES batches ahead of its work; when the workers fall behind, the dispatcher waits,
+and the pool's queue fills, so that its drop policy applies. A worker that dies is restarted - messages lost with it
+remain in the pending count.
+
+Workers are spawned, not forked, since the MQTT client and the writer threads may already be running.
+"""
+
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+import time
+import zlib
+
+from scs_analysis.comms.aws_mqtt_handler import AWSMQTTHandler
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+from scs_analysis.comms.latency_stats import LatencyStats
+from scs_analysis.comms.route_sink import RouteSink
+from scs_analysis.comms.topic_router import TopicRouter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ShardPool(object):
+    """
+    classdocs
+    """
+
+    MAX_BATCH = 2048                                # messages dispatched at once
+    MAX_BATCHES = 64                                # per worker
+    JOIN_TIMEOUT = 10.0                             # seconds
+
+    __POLL_INTERVAL = 1.0                           # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def shard(cls, topic, shards):
+        return zlib.crc32(topic.encode()) % shards
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, shards, router, raw=False, stats=None, echo=False, verbose=False,
+                 max_length=DeliveryQueue.DEFAULT_MAX_LENGTH, policy=DeliveryQueue.DEFAULT_POLICY, name="shards"):
+        """
+        Constructor - router is a TopicRouter of RouteSinks, stats is a LatencyStats (may be None)
+        """
+        self.__shards = shards                          # int
+        self.__router = router                          # TopicRouter
+        self.__raw = raw                                # bool
+        self.__stats = stats                            # LatencyStats
+        self.__echo = echo                              # bool
+        self.__verbose = verbose                        # bool
+
+        self.__queue = DeliveryQueue(self.__dispatch, name, max_length, policy, self.MAX_BATCH)
+
+        self.__context = multiprocessing.get_context('spawn')
+
+        self.__in_queues = []                           # list of multiprocessing.Queue
+        self.__out_queue = None                         # multiprocessing.Queue
+        self.__workers = []                             # list of multiprocessing.Process
+        self.__collector = None                         # threading.Thread
+        self.__running = False                          # bool
+
+        self.__topic_shards = {}                        # dict of topic: int    dispatcher thread only
+        self.__routes_version = None                    # int                   dispatcher thread only
+
+        self.__dispatch_counts = [0] * shards           # list of int           messages per shard
+        self.__write_count = 0                          # int                   messages done by the workers
+        self.__restart_count = 0                        # int
+        self.__fail_count = 0                           # int                   parent writes that raised
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__out_queue = self.__context.Queue()
+        self.__in_queues = [self.__context.Queue(self.MAX_BATCHES) for _ in range(self.__shards)]
+        self.__workers = [self.__worker(shard) for shard in range(self.__shards)]
+
+        self.__running = True
+
+        self.__collector = threading.Thread(target=self.__collect, name="ShardPool", daemon=True)
+        self.__collector.start()
+
+        self.__queue.start()
+
+
+    def close(self):
+        """
+        serialises and writes the messages already queued, then stops the workers
+        """
+        if not self.__running:
+            return
+
+        self.__queue.close()
+        self.__running = False                                  # workers that stop now are not restarted
+
+        for in_queue in self.__in_queues:
+            in_queue.put(None)
+
+        self.__collector.join(self.JOIN_TIMEOUT)
+
+        for worker in self.__workers:
+            worker.join(self.JOIN_TIMEOUT)
+
+            if worker.is_alive():
+                worker.terminate()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    # noinspection PyUnusedLocal
+    def handle(self, client, userdata, message):
+        # on the MQTT network thread - the message is sharded by the dispatcher thread...
+        self.__queue.put((message.topic, message.payload, time.time()))
+
+
+    def __dispatch(self, messages):
+        # routes - copied to the workers when they have changed...
+        version = self.__router.version
+        routes = None
+
+        if version != self.__routes_version:
+            self.__routes_version, snapshot = self.__router.snapshot()
+            routes = self.__routes(snapshot)
+
+        # messages...
+        parts = [[] for _ in range(self.__shards)]
+
+        for message in messages:
+            try:
+                shard = self.__topic_shards[message[0]]
+
+            except KeyError:
+                shard = self.__topic_shards[message[0]] = self.shard(message[0], self.__shards)
+
+            parts[shard].append(message)
+
+        for shard, part in enumerate(parts):
+            if part or routes is not None:
+                self.__dispatch_counts[shard] += len(part)
+                self.__in_queues[shard].put((routes, part))     # blocks while the worker is MAX_BATCHES behind
+
+
+    def __collect(self):
+        finished = 0
+
+        while finished < self.__shards:
+            try:
+                result = self.__out_queue.get(timeout=self.__POLL_INTERVAL)
+
+            except queue.Empty:
+                self.__restart()
+                continue
+
+            if result is None:
+                finished += 1
+                continue
+
+            count, stdout_blocks, echo_text, timings = result
+
+            self.__write_count += count
+
+            try:
+                self.__write_parent(stdout_blocks, echo_text)
+
+            except Exception as ex:
+                self.__fail_count += count
+
+                print("ShardPool: %s: %s" % (ex.__class__.__name__, ex), file=sys.stderr)
+                sys.stderr.flush()
+
+            if self.__stats is not None and timings:
+                self.__stats.record_timestamps(timings)
+
+
+    def __write_parent(self, stdout_blocks, echo_text):
+        if stdout_blocks:
+            sinks = [sink for sink in self.__router.sinks if sink.spec == RouteSink.STDOUT]
+
+            for block in stdout_blocks:
+                for sink in sinks:
+                    sink.write(block)
+
+        if echo_text is not None:
+            print(echo_text)
+            sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __routes(snapshot):
+        # the routes by sink spec, for the workers...
+        return [(topic_filter, [sink.spec for sink in sinks]) for topic_filter, sinks in snapshot]
+
+
+    def __worker(self, shard):
+        # the current routes - a restarted worker may take batches that were queued before the routes changed...
+        routes = self.__routes(self.__router.snapshot()[1])
+
+        worker = self.__context.Process(target=_ShardWorker.run, name="ShardPool:%d" % shard, daemon=True,
+                                        args=(self.__in_queues[shard], self.__out_queue, routes, self.__raw,
+                                              self.__stats is not None, self.__echo, self.__verbose))
+        worker.start()
+
+        return worker
+
+
+    def __restart(self):
+        if not self.__running:
+            return
+
+        for shard, worker in enumerate(self.__workers):
+            if not worker.is_alive():
+                self.__workers[shard] = self.__worker(shard)
+                self.__restart_count += 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def shards(self):
+        return self.__shards
+
+
+    @property
+    def queue(self):
+        return self.__queue
+
+
+    @property
+    def dispatch_counts(self):
+        return list(self.__dispatch_counts)
+
+
+    @property
+    def pending_count(self):
+        return sum(self.__dispatch_counts) - self.__write_count
+
+
+    @property
+    def write_count(self):
+        return self.__write_count
+
+
+    @property
+    def restart_count(self):
+        return self.__restart_count
+
+
+    @property
+    def fail_count(self):
+        return self.__fail_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ShardPool:{shards:%s, raw:%s, timed:%s, dispatch_counts:%s, pending_count:%s, write_count:%s, " \
+               "restart_count:%s, fail_count:%s, queue:%s}" % \
+               (self.shards, self.__raw, self.__stats is not None, self.dispatch_counts, self.pending_count,
+                self.write_count, self.restart_count, self.fail_count, self.queue)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _ShardWorker(object):
+    """
+    classdocs
+    """
+
+    @staticmethod
+    def run(in_queue, out_queue, routes, raw, timed, echo, verbose):
+        # in the worker process - signals are for the parent, which stops the workers...
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+
+        sinks = {}                                              # dict of spec: RouteSink
+        parent = _ParentWriter()                                # stdout, written by the parent
+
+        router = _ShardWorker.router(routes, sinks, parent)
+        handler = AWSMQTTHandler(router, False, verbose, raw=raw)
+
+        while True:
+            item = in_queue.get()
+
+            if item is None:
+                break
+
+            routes, batch = item
+
+            if routes is not None:
+                router = _ShardWorker.router(routes, sinks, parent)
+                handler = AWSMQTTHandler(router, False, verbose, raw=raw)
+
+            entries = []
+
+            for topic, payload, received in batch:
+                line, rec = AWSMQTTHandler.serialise(topic, payload, raw, timed)
+
+                if line is not None:
+                    entries.append((topic, line, rec, received))
+
+            handler.write(entries)
+            written = time.time()
+
+            echo_text = None
+
+            if echo and entries:
+                eom = RouteSink.EOM.encode() if raw else RouteSink.EOM
+                echo_text = eom.join(line for _, line, _, _ in entries)
+                echo_text = echo_text.decode(errors='replace') if raw else echo_text       # may not be UTF-8
+
+            timings = None
+
+            if timed:
+                timings = [(topic, LatencyStats.rec_timestamp(rec), received, written)
+                           for topic, _, rec, received in entries]
+
+            out_queue.put((len(batch), parent.take(), echo_text, timings))
+
+        for sink in sinks.values():
+            sink.close()
+
+        out_queue.put(None)
+
+
+    @staticmethod
+    def router(routes, sinks, parent):
+        router = TopicRouter()
+
+        for topic_filter, specs in routes:
+            for spec in specs:
+                if spec not in sinks:
+                    sinks[spec] = RouteSink(spec, parent) if spec == RouteSink.STDOUT else RouteSink.construct(spec)
+                    sinks[spec].connect()
+
+                router.add(topic_filter, sinks[spec])
+
+        return router
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _ParentWriter(object):
+    """
+    classdocs
+    """
+
+    def __init__(self):
+        self.__blocks = []                              # list of str or bytes
+
+
+    def connect(self):
+        pass
+
+
+    def close(self):
+        pass
+
+
+    # noinspection PyUnusedLocal
+    def write(self, message, wait_for_availability=True):
+        self.__blocks.append(message)
+
+
+    def take(self):
+        blocks = self.__blocks
+        self.__blocks = []
+
+        return blocks
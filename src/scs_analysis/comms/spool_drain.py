@@ -0,0 +1,220 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A thread that drains a PublicationSpool into an AsyncPublisher.
+
+Each spooled message is submitted as it is read, so that the spool drains as fast as the publisher's window allows;
+while the broker cannot be reached, the window stays full, and messages wait in the spool. A message is acknowledged
+to the spool only when its publication succeeds, or if it cannot be parsed. A publication that fails is submitted
+again after an exponential backoff, and until it succeeds, the drain holds - no more messages are read from the spool.
+A message that has not been acknowledged is read again when the spool is re-opened, so it survives a restart.
+Publications that were already in flight when one failed may be published before it is retried.
+
+Note that success is as reported by the publisher, so its publish(..) should succeed only when the broker has
+acknowledged the publication. The AWS IoT SDK's offline publish queue should be disabled - see AWSMQTTLiveClient - so
+that while the broker cannot be reached, publish(..) fails, and the publication stays in the spool, rather than being
+held in memory by the SDK.
+
+The drain stops when it is closed, or when the spool or the publisher is closed.
+"""
+
+import json
+import random
+import threading
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SpoolDrain(object):
+    """
+    classdocs
+    """
+
+    RETRY_BASE = 1.0                                # seconds
+    RETRY_MAX = 60.0                                # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def backoff(cls, failures):
+        """
+        returns an exponential backoff period in seconds, with "equal jitter", after the given consecutive failures
+        """
+        ceiling = min(cls.RETRY_MAX, cls.RETRY_BASE * 2 ** (max(failures, 1) - 1))
+
+        return ceiling / 2 + random.uniform(0.0, ceiling / 2)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, spool, publisher, construct, callback=None):
+        """
+        Constructor - construct(jdict) returns a publication, callback is as AsyncPublisher
+        """
+        self.__spool = spool                            # PublicationSpool
+        self.__publisher = publisher                    # AsyncPublisher
+        self.__construct = construct                    # callable
+        self.__callback = callback                      # callable (may be None)
+
+        self.__thread = None                            # threading.Thread
+        self.__condition = threading.Condition()
+        self.__running = False                          # bool
+
+        self.__held = set()                             # set of int        positions failed, not yet published
+        self.__failures = 0                             # int               consecutive failed publications
+        self.__timers = set()                           # set of threading.Timer
+
+        self.__submit_count = 0                         # int
+        self.__bad_count = 0                            # int
+        self.__retry_count = 0                          # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        with self.__condition:
+            self.__running = True
+
+        self.__thread = threading.Thread(target=self.__run, name="SpoolDrain", daemon=True)
+        self.__thread.start()
+
+
+    def close(self):
+        """
+        stops reading and retrying - publications not yet acknowledged stay in the spool
+        """
+        with self.__condition:
+            self.__running = False
+
+            for timer in self.__timers:
+                timer.cancel()
+
+            self.__timers.clear()
+            self.__condition.notify_all()
+
+
+    def join(self, timeout=None):
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        for message, position in self.__spool.read():
+            try:
+                publication = self.__construct(json.loads(message, object_pairs_hook=OrderedDict))
+
+            except (ValueError, KeyError, TypeError):
+                self.__bad_count += 1
+                self.__spool.acknowledge(position)
+                continue
+
+            # hold while a publication is failing...
+            with self.__condition:
+                while self.__running and self.__held:
+                    self.__condition.wait()
+
+                if not self.__running:
+                    return
+
+            if not self.__submit(publication, position):
+                return                                          # the publisher is closed
+
+            self.__submit_count += 1
+
+
+    def __submit(self, publication, position):
+        try:
+            self.__publisher.submit(publication, self.__completion(position))
+
+        except RuntimeError:
+            return False
+
+        return True
+
+
+    def __completion(self, position):
+        def completed(publication, success, ex):
+            try:
+                if self.__callback is not None:
+                    self.__callback(publication, success, ex)
+
+            finally:
+                if success:
+                    self.__succeeded(position)
+                else:
+                    self.__failed(publication, position)
+
+        return completed
+
+
+    def __succeeded(self, position):
+        self.__spool.acknowledge(position)
+
+        with self.__condition:
+            self.__held.discard(position)
+            self.__failures = 0
+
+            self.__condition.notify_all()
+
+
+    def __failed(self, publication, position):
+        with self.__condition:
+            if not self.__running:
+                return                                          # read again when the spool is re-opened
+
+            self.__held.add(position)
+            self.__failures += 1
+            self.__retry_count += 1
+
+            timer = threading.Timer(self.backoff(self.__failures), self.__retry, (publication, position))
+            timer.daemon = True
+
+            self.__timers.add(timer)
+
+        timer.start()
+
+
+    def __retry(self, publication, position):
+        with self.__condition:
+            self.__timers.discard(threading.current_thread())
+
+            if not self.__running:
+                return
+
+        self.__submit(publication, position)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def submit_count(self):
+        return self.__submit_count
+
+
+    @property
+    def bad_count(self):
+        return self.__bad_count
+
+
+    @property
+    def retry_count(self):
+        return self.__retry_count
+
+
+    @property
+    def held(self):
+        return len(self.__held)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SpoolDrain:{submit_count:%s, bad_count:%s, retry_count:%s, held:%s}" % \
+               (self.submit_count, self.bad_count, self.retry_count, self.held)
@@ -0,0 +1,127 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Status on demand: report() is called when the process receives a signal - by default, SIGUSR1.
+
+report() is not called by the signal handler. The handler does nothing; Python writes the number of each signal that
+it receives to a wakeup socket - see signal.set_wakeup_fd(..) - and report() is called by a thread that reads that
+socket. The main thread is therefore never interrupted part-way through a write to stderr, or while it holds the lock
+of an object that report() reads.
+
+start() must be called from the main thread.
+"""
+
+import signal
+import socket
+import sys
+import threading
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class StatusSignal(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __ignore(signum, frame):
+        pass                                            # the wakeup socket does the work
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, report, signum=signal.SIGUSR1):
+        """
+        Constructor - report() is called by the status thread
+        """
+        self.__report = report                          # callable
+        self.__signum = signum                          # int
+
+        self.__receiver = None                          # socket.socket
+        self.__sender = None                            # socket.socket
+        self.__thread = None                            # threading.Thread
+
+        self.__previous_handler = None                  # callable or int
+        self.__previous_fd = -1                         # int
+
+        self.__report_count = 0                         # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__receiver, self.__sender = socket.socketpair()
+        self.__sender.setblocking(False)
+
+        self.__previous_fd = signal.set_wakeup_fd(self.__sender.fileno())
+        self.__previous_handler = signal.signal(self.__signum, self.__ignore)
+
+        self.__thread = threading.Thread(target=self.__run, name="StatusSignal", daemon=True)
+        self.__thread.start()
+
+
+    def close(self):
+        if self.__thread is None:
+            return
+
+        signal.signal(self.__signum, self.__previous_handler)
+        signal.set_wakeup_fd(self.__previous_fd)
+
+        self.__receiver.shutdown(socket.SHUT_RDWR)
+        self.__thread.join()
+
+        self.__receiver.close()
+        self.__sender.close()
+
+        self.__thread = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while True:
+            try:
+                data = self.__receiver.recv(64)
+
+            except OSError:
+                return
+
+            if not data:
+                return                                  # closed
+
+            # the wakeup socket carries every signal handled by Python - such as SIGINT...
+            if self.__signum not in data:
+                continue
+
+            try:
+                self.__report()
+
+            except Exception as ex:
+                print("StatusSignal: %s: %s" % (ex.__class__.__name__, ex), file=sys.stderr)
+
+            sys.stderr.flush()
+
+            self.__report_count += 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def signum(self):
+        return self.__signum
+
+
+    @property
+    def report_count(self):
+        return self.__report_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "StatusSignal:{signum:%s, report_count:%s}" % (self.signum, self.report_count)
@@ -0,0 +1,304 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A routing table from MQTT topic filters to sinks, compiled into a trie of topic levels.
+
+Filters follow MQTT: + matches exactly one level, and # - as the last level - matches the parent level and any number
+of levels below it. As for a broker, wildcards at the first level do not match topics that start with $. A topic is
+routed to every sink whose filter matches it, in the order in which the sinks were first added, and to each sink once.
+Routes may be added and removed while the router is in use, by any thread. The version is incremented by every
+change, so that a copy of the routes - see snapshot() - can be kept up to date.
+
+The trie is walked once per topic - every filter is matched in that walk - and the result is cached, so that a topic
+that has been seen before is routed with one dictionary lookup.
+"""
+
+import threading
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TopicRouter(object):
+    """
+    classdocs
+    """
+
+    SEPARATOR = '/'
+    SINGLE = '+'
+    MULTI = '#'
+
+    __CACHE_SIZE = 4096                             # topics
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def is_valid_filter(cls, topic_filter):
+        if not topic_filter:
+            return False
+
+        levels = topic_filter.split(cls.SEPARATOR)
+
+        for i, level in enumerate(levels):
+            if cls.MULTI in level and (level != cls.MULTI or i != len(levels) - 1):
+                return False
+
+            if cls.SINGLE in level and level != cls.SINGLE:
+                return False
+
+        return True
+
+
+    @classmethod
+    def covers(cls, topic_filter, other):
+        """
+        returns True if every topic matched by the other filter is matched by topic_filter
+        """
+        levels = topic_filter.split(cls.SEPARATOR)
+        other_levels = other.split(cls.SEPARATOR)
+
+        for i, level in enumerate(levels):
+            if level == cls.MULTI:
+                return i > 0 or not other_levels[0].startswith('$')
+
+            if i == len(other_levels):
+                return False
+
+            other_level = other_levels[i]
+
+            if level == cls.SINGLE:
+                if other_level == cls.MULTI or (i == 0 and other_level.startswith('$')):
+                    return False
+
+            elif level != other_level:
+                return False
+
+        return len(levels) == len(other_levels)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__root = _TopicNode()                      # _TopicNode
+        self.__routes = OrderedDict()                   # dict of filter: list of sink
+        self.__order = OrderedDict()                    # dict of id(sink): (index, sink)
+        self.__next_index = 0                           # int
+        self.__version = 0                              # int               incremented by every change
+
+        self.__cache = {}                               # dict of topic: tuple of sink
+        self.__lock = threading.RLock()
+
+        self.__lookup_count = 0                         # int
+        self.__walk_count = 0                           # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def add(self, topic_filter, sink):
+        if not self.is_valid_filter(topic_filter):
+            raise ValueError("invalid topic filter: %s" % topic_filter)
+
+        with self.__lock:
+            self.__add(topic_filter, sink)
+
+
+    def remove(self, topic_filter, sink):
+        """
+        returns True if the route was removed, False if there was no such route
+        """
+        with self.__lock:
+            return self.__remove(topic_filter, sink)
+
+
+    def remove_sink(self, sink):
+        """
+        removes every route to the sink
+        """
+        with self.__lock:
+            for topic_filter in [topic_filter for topic_filter, sinks in self.__routes.items() if sink in sinks]:
+                self.__remove(topic_filter, sink)
+
+
+    def snapshot(self):
+        """
+        returns the version, and a list of (filter, list of sink) for the routes, taken together
+        """
+        with self.__lock:
+            return self.__version, [(topic_filter, list(sinks)) for topic_filter, sinks in self.__routes.items()]
+
+
+    def match(self, topic):
+        """
+        returns the tuple of sinks for the topic
+        """
+        with self.__lock:
+            self.__lookup_count += 1
+
+            try:
+                return self.__cache[topic]
+
+            except KeyError:
+                pass
+
+            self.__walk_count += 1
+
+            found = {}
+            levels = topic.split(self.SEPARATOR)
+
+            self.__walk(self.__root, levels, 0, found, topic.startswith('$'))
+
+            sinks = tuple(sink for _, sink in sorted(found.values(), key=lambda entry: entry[0]))
+
+            if len(self.__cache) >= self.__CACHE_SIZE:
+                self.__cache = {}
+
+            self.__cache[topic] = sinks
+
+            return sinks
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __add(self, topic_filter, sink):
+        node = self.__root
+
+        for level in topic_filter.split(self.SEPARATOR):
+            node = node.children.setdefault(level, _TopicNode())
+
+        if sink in node.sinks:
+            return
+
+        node.sinks.append(sink)
+
+        self.__routes.setdefault(topic_filter, []).append(sink)
+
+        if id(sink) not in self.__order:
+            self.__order[id(sink)] = (self.__next_index, sink)
+            self.__next_index += 1
+
+        self.__version += 1
+        self.__cache = {}
+
+
+    def __remove(self, topic_filter, sink):
+        sinks = self.__routes.get(topic_filter)
+
+        if sinks is None or sink not in sinks:
+            return False
+
+        sinks.remove(sink)
+
+        if not sinks:
+            del self.__routes[topic_filter]
+
+        # remove the sink from its node, and nodes that are no longer needed...
+        levels = topic_filter.split(self.SEPARATOR)
+        nodes = [self.__root]
+
+        for level in levels:
+            nodes.append(nodes[-1].children[level])
+
+        nodes[-1].sinks.remove(sink)
+
+        for depth in range(len(levels), 0, -1):
+            if nodes[depth].sinks or nodes[depth].children:
+                break
+
+            del nodes[depth - 1].children[levels[depth - 1]]
+
+        if not any(sink in route_sinks for route_sinks in self.__routes.values()):
+            del self.__order[id(sink)]
+
+        self.__version += 1
+        self.__cache = {}
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __walk(self, node, levels, depth, found, system):
+        wildcards = not (system and depth == 0)
+
+        # # matches this level and every level below it...
+        multi = node.children.get(self.MULTI) if wildcards else None
+
+        if multi is not None:
+            self.__found(multi.sinks, found)
+
+        if depth == len(levels):
+            self.__found(node.sinks, found)
+            return
+
+        child = node.children.get(levels[depth])
+
+        if child is not None:
+            self.__walk(child, levels, depth + 1, found, system)
+
+        single = node.children.get(self.SINGLE) if wildcards else None
+
+        if single is not None:
+            self.__walk(single, levels, depth + 1, found, system)
+
+
+    def __found(self, sinks, found):
+        for sink in sinks:
+            found[id(sink)] = self.__order[id(sink)]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def routes(self):
+        return self.__routes
+
+
+    @property
+    def sinks(self):
+        return [sink for _, sink in self.__order.values()]
+
+
+    @property
+    def version(self):
+        return self.__version
+
+
+    @property
+    def lookup_count(self):
+        return self.__lookup_count
+
+
+    @property
+    def walk_count(self):
+        return self.__walk_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        routes = '{' + ', '.join('%s: [%s]' % (topic_filter, ', '.join(str(sink) for sink in sinks))
+                                 for topic_filter, sinks in self.routes.items()) + '}'
+
+        return "TopicRouter:{routes:%s, version:%s, lookup_count:%s, walk_count:%s}" % \
+               (routes, self.version, self.lookup_count, self.walk_count)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _TopicNode(object):
+    """
+    classdocs
+    """
+
+    __slots__ = ('children', 'sinks')
+
+    def __init__(self):
+        self.children = {}                              # dict of level: _TopicNode
+        self.sinks = []                                 # list of sink
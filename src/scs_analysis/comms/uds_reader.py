@@ -0,0 +1,125 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A reader of a Unix domain socket, for writers that keep their connections open - such as UDSWriter.
+
+The stream of each connection is split into messages at DomainSocket.EOM. The text that remains when a connection is
+closed is also a message, so writers that connect, write and close for every message - such as DomainSocket - are
+read as before. Several connections may be open at once.
+"""
+
+import os
+import selectors
+import socket
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class UDSReader(object):
+    """
+    classdocs
+    """
+
+    EOM = '\n'                                      # as DomainSocket
+
+    __PERMISSIONS = 0o666                           # srw-rw-rw-
+    __BACKLOG = 8                                   # unaccepted connections before refusing new connections
+    __BUFFER_SIZE = 65536
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, address):
+        """
+        Constructor
+        """
+        self.__address = address                        # string
+
+        self.__socket = None                            # socket.socket
+        self.__selector = None                          # selectors.BaseSelector
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, wait_for_availability=True):
+        self.__socket = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+
+
+    def close(self):
+        if self.__selector is not None:
+            for key in list(self.__selector.get_map().values()):
+                key.fileobj.close()
+
+            self.__selector.close()
+            self.__selector = None
+
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def read(self):                                             # blocking
+        self.__socket.bind(self.address)
+        self.__socket.listen(self.__BACKLOG)
+
+        os.chmod(self.address, self.__PERMISSIONS)
+
+        self.__selector = selectors.DefaultSelector()
+        self.__selector.register(self.__socket, selectors.EVENT_READ)
+
+        buffers = {}                                            # dict of connection: bytes
+
+        try:
+            while True:
+                for key, _ in self.__selector.select():
+                    sock = key.fileobj
+
+                    # new connection...
+                    if sock is self.__socket:
+                        connection, _ = sock.accept()
+
+                        self.__selector.register(connection, selectors.EVENT_READ)
+                        buffers[connection] = b''
+                        continue
+
+                    # data...
+                    try:
+                        data = sock.recv(self.__BUFFER_SIZE)
+
+                    except OSError:
+                        data = b''
+
+                    if data:
+                        *messages, buffers[sock] = (buffers[sock] + data).split(self.EOM.encode())
+
+                    else:
+                        messages = [buffers.pop(sock)]
+
+                        self.__selector.unregister(sock)
+                        sock.close()
+
+                    for message in messages:
+                        message = message.decode().strip()
+
+                        if message:
+                            yield message
+
+        finally:
+            os.unlink(self.address)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def address(self):
+        return self.__address
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "UDSReader:{address:%s, socket:%s}" % (self.address, self.__socket)
@@ -0,0 +1,282 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A Unix domain socket server for local clients that both send and receive newline-terminated messages.
+
+read() accepts connections, and yields (connection, line) for each line that a client sends, and (connection, None)
+when a client goes away - the connection should then be closed. Each connection is a sink: messages written to it are
+queued, and sent by the connection's own writer thread, so that a client that reads slowly - or not at all - holds up
+nothing but its own queue, whose drop policy then applies. A client that does not read within SEND_TIMEOUT is
+disconnected.
+"""
+
+import os
+import selectors
+import socket
+
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class UDSServer(object):
+    """
+    classdocs
+    """
+
+    EOM = '\n'
+
+    __PERMISSIONS = 0o666                           # srw-rw-rw-
+    __BACKLOG = 32
+    __BUFFER_SIZE = 65536
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, address, max_length=DeliveryQueue.DEFAULT_MAX_LENGTH, policy=DeliveryQueue.DEFAULT_POLICY):
+        """
+        Constructor - max_length and policy are for each connection's queue
+        """
+        self.__address = address                        # string
+        self.__max_length = max_length                  # int
+        self.__policy = policy                          # string
+
+        self.__socket = None                            # socket.socket
+        self.__selector = None                          # selectors.BaseSelector
+
+        self.__connections = {}                         # dict of socket: UDSConnection
+        self.__connection_count = 0                     # int               connections accepted
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, wait_for_availability=True):
+        self.__socket = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+
+
+    def close(self):
+        for connection in list(self.__connections.values()):
+            connection.close()
+
+        self.__connections = {}
+
+        if self.__selector is not None:
+            self.__selector.close()
+            self.__selector = None
+
+            # the reader may be blocked on another thread, and not reach its finally...
+            self.__unlink()
+
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def read(self):                                             # blocking
+        self.__socket.bind(self.address)
+        self.__socket.listen(self.__BACKLOG)
+
+        os.chmod(self.address, self.__PERMISSIONS)
+
+        self.__selector = selectors.DefaultSelector()
+        self.__selector.register(self.__socket, selectors.EVENT_READ)
+
+        buffers = {}                                            # dict of socket: bytes
+
+        try:
+            while True:
+                selector = self.__selector
+
+                if selector is None:
+                    return                                      # closed, on another thread
+
+                try:
+                    events = selector.select()
+
+                except (OSError, ValueError):
+                    return
+
+                for key, _ in events:
+                    if self.__selector is None:
+                        return
+
+                    sock = key.fileobj
+
+                    # new connection...
+                    if sock is self.__socket:
+                        client, _ = sock.accept()
+
+                        self.__connection_count += 1
+
+                        connection = UDSConnection(client, "%s:%d" % (self.address, self.__connection_count),
+                                                   self.__max_length, self.__policy)
+                        connection.start()
+
+                        selector.register(client, selectors.EVENT_READ)
+                        self.__connections[client] = connection
+                        buffers[client] = b''
+                        continue
+
+                    # data...
+                    connection = self.__connections[sock]
+
+                    try:
+                        data = sock.recv(self.__BUFFER_SIZE)
+
+                    except OSError:
+                        data = b''
+
+                    if data:
+                        *lines, buffers[sock] = (buffers[sock] + data).split(self.EOM.encode())
+
+                    else:
+                        lines = [buffers.pop(sock)]
+
+                    for line in lines:
+                        line = line.decode().strip()
+
+                        if line:
+                            yield connection, line
+
+                    # gone...
+                    if not data and self.__selector is not None:
+                        selector.unregister(sock)
+                        del self.__connections[sock]
+
+                        yield connection, None
+
+        finally:
+            self.__unlink()
+
+
+    def __unlink(self):
+        try:
+            os.unlink(self.address)
+
+        except FileNotFoundError:
+            pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def address(self):
+        return self.__address
+
+
+    @property
+    def connections(self):
+        return list(self.__connections.values())
+
+
+    @property
+    def connection_count(self):
+        return self.__connection_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "UDSServer:{address:%s, max_length:%s, policy:%s, connections:%s, connection_count:%s}" % \
+               (self.address, self.__max_length, self.__policy, len(self.__connections), self.connection_count)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class UDSConnection(object):
+    """
+    classdocs
+    """
+
+    EOM = '\n'
+
+    SEND_TIMEOUT = 10.0                             # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, sock, name, max_length=DeliveryQueue.DEFAULT_MAX_LENGTH, policy=DeliveryQueue.DEFAULT_POLICY):
+        """
+        Constructor
+        """
+        self.__socket = sock                            # socket.socket
+        self.__name = name                              # string
+
+        self.__socket.settimeout(self.SEND_TIMEOUT)
+
+        self.__queue = DeliveryQueue(self.__deliver, name, max_length, policy)
+        self.__broken = False                           # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__queue.start()
+
+
+    def close(self):
+        self.__queue.close()
+
+        try:
+            self.__socket.close()
+
+        except OSError:
+            pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, message):
+        """
+        queues one message, or several separated by EOM, as str or as UTF-8 bytes
+        """
+        self.__queue.put(message if isinstance(message, bytes) else message.encode())
+
+
+    def __deliver(self, blocks):
+        if self.__broken:
+            raise ConnectionResetError(self.name)               # counted as failed by the queue
+
+        data = self.EOM.encode().join(block.strip() for block in blocks) + self.EOM.encode()
+
+        try:
+            self.__socket.sendall(data)
+
+        except OSError:
+            # the reader sees the connection close...
+            self.__broken = True
+
+            try:
+                self.__socket.shutdown(socket.SHUT_RDWR)
+
+            except OSError:
+                pass
+
+            raise
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def spec(self):
+        return self.__name
+
+
+    @property
+    def queue(self):
+        return self.__queue
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "UDSConnection:{name:%s, broken:%s, queue:%s}" % (self.name, self.__broken, self.queue)
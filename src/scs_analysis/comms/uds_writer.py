@@ -0,0 +1,208 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A writer to a Unix domain socket that keeps its connection open, in place of a DomainSocket that is connected, written
+and closed for every message.
+
+Each write is terminated by DomainSocket.EOM. A write may hold several messages, separated by EOM, so that a batch of
+messages is sent with one system call. The connection is made lazily, on the first write. If the reader goes away,
+the connection is re-made on a later write, after an exponential backoff with jitter. Writes made while there is no
+reader raise ConnectionRefusedError, and their messages are counted as lost - as they were lost with DomainSocket.
+
+If a connection fails part-way through a write, the messages that were sent in full are not sent again; the message
+that was cut, and those after it, are sent on the new connection. A message is therefore not duplicated, but a cut
+message - or complete messages that were still buffered when the reader closed - may be lost.
+
+Note that this changes the protocol of the socket: DomainSocket.read() treats everything sent on a connection as one
+message, so it cannot read a UDSWriter. The reader must split the stream into messages at EOM - see UDSReader.
+
+Writes should be made by one thread - see DeliveryQueue.
+"""
+
+import random
+import socket
+import time
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class UDSWriter(object):
+    """
+    classdocs
+    """
+
+    EOM = '\n'                                      # as DomainSocket
+
+    BACKOFF_BASE = 0.1                              # seconds
+    BACKOFF_MAX = 10.0                              # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def backoff(cls, failures):
+        """
+        returns an exponential backoff period in seconds, with "equal jitter", after the given consecutive failures
+        """
+        ceiling = min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * 2 ** (max(failures, 1) - 1))
+
+        return ceiling / 2 + random.uniform(0.0, ceiling / 2)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, address):
+        """
+        Constructor
+        """
+        self.__address = address                        # string
+
+        self.__socket = None                            # socket.socket
+
+        self.__failures = 0                             # int               consecutive failed connects
+        self.__retry_at = 0.0                           # float             epoch seconds
+
+        self.__write_count = 0                          # int               messages sent
+        self.__batch_count = 0                          # int               writes sent
+        self.__connect_count = 0                        # int
+        self.__drop_count = 0                           # int               messages lost
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self, wait_for_availability=True):
+        pass                                            # the connection is made by the first write
+
+
+    def close(self):
+        self.__disconnect()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, message, wait_for_availability=True):
+        """
+        sends one message, or several separated by EOM, as str or as UTF-8 bytes - raises ConnectionRefusedError if
+        there is no reader
+        """
+        if isinstance(message, bytes):
+            data = message.strip() + self.EOM.encode()
+        else:
+            data = (message.strip() + self.EOM).encode()
+
+        count = data.count(self.EOM.encode())
+
+        # a connection whose reader has gone is replaced once...
+        for _ in range(2):
+            if self.__socket is None and not self.__connect():
+                break
+
+            sent = self.__send(data)
+
+            if sent == len(data):
+                self.__write_count += count
+                self.__batch_count += 1
+
+                return
+
+            # messages sent in full are not sent again - the cut message and those after it are...
+            delivered = data.rfind(self.EOM.encode(), 0, sent) + 1
+
+            self.__write_count += data.count(self.EOM.encode(), 0, delivered)
+            count -= data.count(self.EOM.encode(), 0, delivered)
+            data = data[delivered:]
+
+            self.__disconnect()
+
+        self.__drop_count += count
+
+        raise ConnectionRefusedError("no reader at %s" % self.address)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __send(self, data):
+        sent = 0
+
+        try:
+            while sent < len(data):
+                sent += self.__socket.send(data[sent:])
+
+        except OSError:
+            pass
+
+        return sent
+
+
+    def __connect(self):
+        if self.__failures and time.time() < self.__retry_at:
+            return False
+
+        sock = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+
+        try:
+            sock.connect(self.address)
+
+        except OSError:
+            sock.close()
+
+            self.__failures += 1
+            self.__retry_at = time.time() + self.backoff(self.__failures)
+
+            return False
+
+        self.__failures = 0
+        self.__connect_count += 1
+
+        self.__socket = sock
+
+        return True
+
+
+    def __disconnect(self):
+        if self.__socket is None:
+            return
+
+        try:
+            self.__socket.close()
+
+        except OSError:
+            pass
+
+        self.__socket = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def address(self):
+        return self.__address
+
+
+    @property
+    def write_count(self):
+        return self.__write_count
+
+
+    @property
+    def batch_count(self):
+        return self.__batch_count
+
+
+    @property
+    def connect_count(self):
+        return self.__connect_count
+
+
+    @property
+    def drop_count(self):
+        return self.__drop_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "UDSWriter:{address:%s, write_count:%s, batch_count:%s, connect_count:%s, drop_count:%s}" % \
+               (self.address, self.write_count, self.batch_count, self.connect_count, self.drop_count)
@@ -14,18 +14,23 @@ The names of columns given in the header row indicate paths into the JSON docume
 The first row of the CSV file (or stdin input) is assumed to be a header row. If there are more columns in the body of
 the CSV than in the header, excess values are ignored.
 
+Input files or stdin streams that are gzip, bz2 or xz compressed are identified by their magic bytes, and are
+decompressed transparently.
+
 EXAMPLES
 ./csv_reader.py temp.csv
 
+./csv_reader.py temp.csv.gz
+
 SEE ALSO
 scs_analysis/csv_writer
 """
 
 import sys
 
+from scs_analysis.archive.compressed_file import CompressedCSVReader
 from scs_analysis.cmd.cmd_csv_reader import CmdCSVReader
 
-from scs_core.csv.csv_reader import CSVReader
 from scs_core.data.json import JSONify
 from scs_core.sys.exception_report import ExceptionReport
 
@@ -50,7 +55,7 @@ if __name__ == '__main__':
         # ------------------------------------------------------------------------------------------------------------
         # resources...
 
-        csv = CSVReader(cmd.filename)
+        csv = CompressedCSVReader(cmd.filename)
 
         if cmd.verbose:
             print(csv, file=sys.stderr)
@@ -60,7 +65,7 @@ if __name__ == '__main__':
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
-        for datum in csv.rows:
+        for datum in csv.rows():
             print(datum)
             sys.stdout.flush()
 
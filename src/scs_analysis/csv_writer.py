@@ -12,20 +12,26 @@ The path into the JSON document is used to name the column in the header row, wi
 ('.') character.
 
 All the leaf nodes of the first JSON document are included in the CSV. If subsequent JSON documents in the input stream
-contain fields that were not in this first document, these extra fields are ignored.
+contain fields that were not in this first document, these extra fields are ignored. With the --cache option, the
+documents are held until the input closes, and the leaf nodes of every document are included.
+
+If the filename ends in .gz, .bz2 or .xz, the output is compressed accordingly, at the given compression level. Append
+mode is not available for compressed files.
 
 EXAMPLES
 ./socket_receiver.py | ./csv_writer.py temp.csv -e
 
+./aws_topic_history.py south-coast-science-dev/production-test/loc/1/gases -m60 | ./csv_writer.py gases.csv.gz -l 9
+
 SEE ALSO
 scs_analysis/csv_reader
 """
 
 import sys
 
+from scs_analysis.archive.compressed_file import CompressedCSVWriter
 from scs_analysis.cmd.cmd_csv_writer import CmdCSVWriter
 
-from scs_core.csv.csv_writer import CSVWriter
 from scs_core.data.json import JSONify
 from scs_core.sys.exception_report import ExceptionReport
 
@@ -43,6 +49,10 @@ if __name__ == '__main__':
 
         cmd = CmdCSVWriter()
 
+        if not cmd.is_valid():
+            cmd.print_help(sys.stderr)
+            exit(2)
+
         if cmd.verbose:
             print(cmd, file=sys.stderr)
             sys.stderr.flush()
@@ -51,7 +61,7 @@ if __name__ == '__main__':
         # ------------------------------------------------------------------------------------------------------------
         # resources...
 
-        csv = CSVWriter(cmd.filename, cmd.cache, cmd.append)
+        csv = CompressedCSVWriter(cmd.filename, cmd.cache, cmd.append, cmd.level)
 
         if cmd.verbose:
             print(csv, file=sys.stderr)
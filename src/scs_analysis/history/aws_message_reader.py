@@ -0,0 +1,162 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Reads the stored messages of a topic from the South Coast Science / AWS history API - as scs_core's MessageManager
+does - but parses each page of the response incrementally, as it arrives. Messages are constructed from the page
+while it is being transferred, and the page is never held as a whole.
+
+The http_client must provide stream(..), as PooledHTTPClient does.
+
+The API host is the endpoint held by the APIAuth - the aws_api_auth.json configuration - as scs_core's own RESTClient
+uses it. Where the installed scs_core's APIAuth holds no endpoint, DEFAULT_HOST is used. The path may be given to the
+constructor.
+
+https://xy1eszuu23.execute-api.us-west-2.amazonaws.com/staging/topicMessages?
+topic=south-coast-science-dev/production-test/loc/1/gases&
+startTime=2018-03-31T07:50:59.712Z&
+endTime=2018-03-31T07:55:59.712Z
+
+example page:
+{"Items": [{"device": "scs-bbe-002", "topic": "...", "upload": "...", "payload": {...}}, ...], "next": "https://..."}
+"""
+
+import sys
+import time
+
+from http import HTTPStatus
+from urllib.parse import urlparse, parse_qs
+
+from scs_analysis.client.json_stream_parser import JSONStreamParser
+
+from scs_core.aws.data.message import Message
+
+from scs_core.sys.http_exception import HTTPException
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class AWSMessageReader(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_HOST = "xy1eszuu23.execute-api.us-west-2.amazonaws.com"
+    DEFAULT_PATH = "/staging/topicMessages"
+
+    __TIMEOUT = 60                                  # seconds
+
+    __ITEMS = 'Items'
+    __NEXT = 'next'
+
+    __TOPIC = 'topic'
+    __START = 'startTime'
+    __END = 'endTime'
+
+    __HEADER_ACCEPT = "application/json"
+    __HEADER_AUTHORIZATION = "api-key "
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def host(cls, api_auth):
+        """
+        returns the endpoint of the APIAuth, or DEFAULT_HOST if the installed scs_core's APIAuth has no endpoint
+        """
+        endpoint = getattr(api_auth, 'endpoint', None)
+
+        return cls.DEFAULT_HOST if endpoint is None else endpoint
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, http_client, api_auth, verbose=False, path=DEFAULT_PATH):
+        """
+        Constructor
+        """
+        self.__http_client = http_client                # PooledHTTPClient
+        self.__api_key = api_auth.api_key               # string
+        self.__verbose = verbose                        # bool
+
+        self.__host = self.host(api_auth)               # string
+        self.__path = path                              # string
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def find_for_topic(self, topic, start_date, end_date):
+        """
+        yields Message, as each arrives - with the signature of MessageManager.find_for_topic(..)
+        """
+        yield from self.find(topic, start_date, end_date)
+
+
+    def find(self, topic, start_date, end_date):
+        """
+        yields Message, as each arrives
+        """
+        params = {self.__TOPIC: topic,
+                  self.__START: start_date.utc().as_iso8601(),
+                  self.__END: end_date.utc().as_iso8601()}
+
+        total = 0
+
+        self.__http_client.connect(self.__host, timeout=self.__TIMEOUT)
+
+        try:
+            while True:
+                parser = JSONStreamParser(self.__ITEMS)
+
+                try:
+                    for text in self.__http_client.stream(self.__path, params, self.__headers):
+                        for jdict in parser.feed(text):
+                            yield Message.construct_from_jdict(jdict)
+
+                except HTTPException as ex:
+                    if ex.status == HTTPStatus.NOT_FOUND:
+                        return
+
+                    raise
+
+                parser.close()
+
+                # report...
+                if self.__verbose:
+                    total += parser.item_count
+                    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+                    print("%s: batch: %d total: %d" % (now, parser.item_count, total), file=sys.stderr)
+                    sys.stderr.flush()
+
+                # next...
+                next_url = parser.fields.get(self.__NEXT)
+
+                if not next_url:
+                    return
+
+                next_params = parse_qs(urlparse(next_url).query)
+
+                if self.__START not in next_params:
+                    return
+
+                params[self.__START] = next_params[self.__START][0]
+
+        finally:
+            self.__http_client.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def __headers(self):
+        return {"Accept": self.__HEADER_ACCEPT,
+                "Authorization": self.__HEADER_AUTHORIZATION + self.__api_key}
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "AWSMessageReader:{host:%s, path:%s, http_client:%s, verbose:%s}" % \
+               (self.__host, self.__path, self.__http_client, self.__verbose)
@@ -0,0 +1,282 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A local cache of topic history, held as one gzip-compressed file of JSON message lines for each topic and hourly bucket.
+
+Only whole buckets that closed more than SETTLE_MINUTES ago are cached - these are treated as immutable. Partial
+buckets, at either end of a query, and buckets that are still open are always fetched.
+
+A bucket that cannot be read in full - truncated, or otherwise corrupt - is reported on stderr, deleted and treated as
+a miss.
+
+Fetched messages are passed on as they arrive. The messages of a cacheable bucket are also buffered, and the bucket is
+stored only when it has been fetched in full.
+
+The total size of the cache is limited. When the limit is exceeded, the least-recently-used buckets are evicted.
+
+example file:
+~/SCS/cache/aws/south-coast-science-dev%2Fproduction-test%2Floc%2F1%2Fgases/1508932800.jsonl.gz
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
+from urllib.parse import quote
+
+from scs_core.data.json import JSONify
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class HistoryCache(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), "SCS", "cache")
+    DEFAULT_MAX_SIZE = 1024                         # MB
+
+    BUCKET_MINUTES = 60
+    SETTLE_MINUTES = 10                             # allows for late uploads
+
+    __FILENAME_EXTENSION = ".jsonl.gz"
+    __COMPRESS_LEVEL = 6
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct(cls, name, construct_message, max_size=DEFAULT_MAX_SIZE):
+        """
+        name identifies the data infrastructure - construct_message(jdict) re-constructs a cached message
+        """
+        return cls(cls.DEFAULT_ROOT, name, construct_message, max_size * 1024 * 1024)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, root, name, construct_message, max_bytes):
+        """
+        Constructor
+        """
+        self.__root = root                                      # string        shared by all data infrastructures
+        self.__name = name                                      # string
+        self.__construct_message = construct_message            # callable
+        self.__max_bytes = int(max_bytes)                       # int
+
+        self.__lock = threading.Lock()
+
+        self.__files = OrderedDict()                            # dict of filename: size, least-recently-used first
+        self.__size = 0
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+        self.__scan()
+
+
+    def __scan(self):
+        entries = []
+
+        for directory, _, filenames in os.walk(self.__root):
+            for filename in filenames:
+                if not filename.endswith(self.__FILENAME_EXTENSION):
+                    continue
+
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+
+                entries.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self.__files[path] = size
+            self.__size += size
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def cached(self, fetch):
+        """
+        returns a function with the signature of fetch(topic, start, end) that consults the cache
+        """
+        return lambda topic, start, end: self.find(fetch, topic, start, end)
+
+
+    def find(self, fetch, topic, start, end):
+        bucket = self.__bucket(start, end)
+
+        if bucket is None:
+            return fetch(topic, start, end)
+
+        filename = os.path.join(self.__root, self.__name, quote(topic, safe=''),
+                                "%d%s" % (bucket, self.__FILENAME_EXTENSION))
+
+        messages = self.__load(filename)
+
+        if messages is not None:
+            return messages
+
+        return self.__fetch_bucket(filename, fetch(topic, start, end))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __bucket(self, start, end):
+        """
+        returns the bucket start as epoch seconds, or None if [start, end] is not a whole, settled bucket
+        """
+        seconds = self.BUCKET_MINUTES * 60
+
+        bucket = round(start.timestamp())
+
+        if bucket % seconds != 0 or round(end.timestamp()) - bucket != seconds:
+            return None
+
+        if bucket + seconds > time.time() - self.SETTLE_MINUTES * 60:
+            return None
+
+        return bucket
+
+
+    def __fetch_bucket(self, filename, messages):
+        bucket = []
+
+        for message in messages:
+            bucket.append(message)
+            yield message
+
+        self.__store(filename, bucket)                      # not reached if the fetch fails, or is abandoned
+
+
+    def __load(self, filename):
+        try:
+            with open(filename, "rb") as f:
+                text = gzip.decompress(f.read()).decode()
+
+            messages = [self.__construct_message(json.loads(line, object_pairs_hook=OrderedDict))
+                        for line in text.splitlines()]
+
+        except FileNotFoundError:
+            with self.__lock:
+                self.__misses += 1
+
+            return None
+
+        except (EOFError, OSError, zlib.error, ValueError, KeyError, TypeError) as ex:
+            # a truncated or corrupt bucket is a miss - it is re-fetched, and replaced...
+            print("HistoryCache: %s: %s: %s" % (filename, ex.__class__.__name__, ex), file=sys.stderr)
+
+            self.__discard(filename)
+
+            with self.__lock:
+                self.__misses += 1
+
+            return None
+
+        os.utime(filename)                                  # marks the bucket as recently used
+
+        with self.__lock:
+            self.__hits += 1
+
+            if filename in self.__files:
+                self.__files.move_to_end(filename)
+
+        return messages
+
+
+    def __store(self, filename, messages):
+        text = ''.join(JSONify.dumps(message) + '\n' for message in messages)
+        data = gzip.compress(text.encode(), self.__COMPRESS_LEVEL)
+
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        tmp_filename = "%s.%d.tmp" % (filename, threading.get_ident())
+
+        with open(tmp_filename, "wb") as f:
+            f.write(data)
+
+        os.replace(tmp_filename, filename)
+
+        with self.__lock:
+            self.__size += len(data) - self.__files.pop(filename, 0)
+            self.__files[filename] = len(data)
+
+            self.__evict()
+
+
+    def __discard(self, filename):
+        try:
+            os.remove(filename)
+
+        except OSError:
+            pass
+
+        with self.__lock:
+            self.__size -= self.__files.pop(filename, 0)
+
+
+    def __evict(self):
+        while self.__size > self.__max_bytes and self.__files:
+            filename, size = self.__files.popitem(last=False)
+
+            try:
+                os.remove(filename)
+
+            except FileNotFoundError:
+                pass
+
+            self.__size -= size
+            self.__evictions += 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def root(self):
+        return self.__root
+
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def max_bytes(self):
+        return self.__max_bytes
+
+
+    @property
+    def size(self):
+        return self.__size
+
+
+    @property
+    def hits(self):
+        return self.__hits
+
+
+    @property
+    def misses(self):
+        return self.__misses
+
+
+    @property
+    def evictions(self):
+        return self.__evictions
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "HistoryCache:{root:%s, name:%s, max_bytes:%s, size:%s, hits:%s, misses:%s, evictions:%s}" % \
+               (self.root, self.name, self.max_bytes, self.size, self.hits, self.misses, self.evictions)
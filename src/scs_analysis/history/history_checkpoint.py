@@ -0,0 +1,196 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A checkpoint records the progress of a history pull, so that an interrupted pull can be resumed without repeating or
+losing output.
+
+The checkpoint holds the query - topics, period and slicing - and, for each topic, the position after the last message
+that was fully written: the start of its time slice, and the index of the next message in that slice. On resume, the
+slice is fetched again, and the messages before the index are passed over. The rec of the last message is recorded
+for reference.
+
+Times are held, and returned, as epoch seconds: the caller constructs its own datetimes from them.
+
+The checkpoint file is replaced atomically. It is saved at most once per SAVE_INTERVAL while messages are written, and
+whenever the pull stops. It is deleted when the pull is complete.
+
+example document:
+{"paths": ["south-coast-science-dev/production-test/loc/1/gases"], "start": 1508976000.0, "end": 1509062400.0,
+"slice": 60, "aligned": false, "positions": {"south-coast-science-dev/production-test/loc/1/gases":
+{"slice": 1508990400.0, "index": 112, "rec": "2017-10-26T04:18:40Z"}}}
+"""
+
+import json
+import os
+import time
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class HistoryCheckpoint(object):
+    """
+    classdocs
+    """
+
+    SAVE_INTERVAL = 1.0                             # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, filename):
+        """
+        returns the checkpoint saved in filename, or None if there is none
+        """
+        try:
+            with open(filename, "r") as f:
+                jdict = json.loads(f.read())
+
+        except FileNotFoundError:
+            return None
+
+        positions = OrderedDict((topic, (position['slice'], position['index'], position.get('rec')))
+                                for topic, position in jdict['positions'].items())
+
+        return cls(filename, jdict['paths'], jdict['start'], jdict['end'], jdict['slice'], jdict['aligned'],
+                   positions)
+
+
+    @classmethod
+    def construct(cls, filename, paths, start, end, slice_minutes, aligned):
+        return cls(filename, paths, start.timestamp(), end.timestamp(), slice_minutes, aligned, OrderedDict())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename, paths, start, end, slice_minutes, aligned, positions):
+        """
+        Constructor
+        """
+        self.__filename = filename                      # string
+        self.__paths = list(paths)                      # list of string
+        self.__start = float(start)                     # float                 epoch seconds
+        self.__end = float(end)                         # float                 epoch seconds
+        self.__slice_minutes = int(slice_minutes)       # int
+        self.__aligned = bool(aligned)                  # bool
+
+        self.__positions = positions                    # dict of topic: (slice start, index, rec)
+
+        self.__saved = time.time()                      # float
+        self.__complete = False                         # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def position(self, topic):
+        """
+        returns (slice start, index) for the topic - the start of the period, and 0, if nothing has been written - the
+        slice start is in epoch seconds
+        """
+        position = self.__positions.get(topic)
+
+        if position is None:
+            return self.start, 0
+
+        return position[0], position[1]
+
+
+    def update(self, topic, slice_start, index, rec=None):
+        """
+        records that the message before index in the slice starting at slice_start has been written
+        """
+        self.__positions[topic] = (slice_start.timestamp(), index, rec)
+
+        if time.time() - self.__saved >= self.SAVE_INTERVAL:
+            self.save()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def save(self):
+        if self.__complete:
+            return
+
+        jdict = OrderedDict()
+
+        jdict['paths'] = self.paths
+        jdict['start'] = self.__start
+        jdict['end'] = self.__end
+        jdict['slice'] = self.slice_minutes
+        jdict['aligned'] = self.aligned
+        jdict['positions'] = OrderedDict((topic, OrderedDict([('slice', slice_start), ('index', index), ('rec', rec)]))
+                                         for topic, (slice_start, index, rec) in self.__positions.items())
+
+        tmp_filename = self.filename + '.tmp'
+
+        with open(tmp_filename, "w") as f:
+            f.write(json.dumps(jdict))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_filename, self.filename)
+
+        self.__saved = time.time()
+
+
+    def delete(self):
+        """
+        marks the pull as complete - the checkpoint file is removed, and is not saved again
+        """
+        self.__complete = True
+
+        try:
+            os.remove(self.filename)
+
+        except FileNotFoundError:
+            pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def start(self):
+        return self.__start
+
+
+    @property
+    def end(self):
+        return self.__end
+
+
+    @property
+    def slice_minutes(self):
+        return self.__slice_minutes
+
+
+    @property
+    def aligned(self):
+        return self.__aligned
+
+
+    @property
+    def complete(self):
+        return self.__complete
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "HistoryCheckpoint:{filename:%s, paths:%s, start:%s, end:%s, slice_minutes:%s, aligned:%s, " \
+               "positions:%s, complete:%s}" % \
+               (self.filename, self.paths, self.start, self.end, self.slice_minutes, self.aligned,
+                dict(self.__positions), self.complete)
@@ -0,0 +1,194 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Follows the history of one or more topics, as tail -f follows a file, by polling the history API.
+
+Each poll requests the period from the latest rec seen for the topic - less an overlap, to pick up messages that
+arrive late - up to now. Messages that have been seen already are identified by their rec and a digest of their
+payload, and are passed over. Digests are kept only for the overlap period, so memory is bounded.
+
+The interval between polls adapts to the traffic: it is halved after a poll that finds new messages, down to
+min_interval, and increased by half after a poll that finds none, up to max_interval.
+
+All times are epoch seconds: the fetch function constructs whatever datetimes its API needs.
+"""
+
+import hashlib
+import time
+
+from scs_analysis.history.topic_merger import TopicMerger
+
+from scs_core.data.json import JSONify
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class HistoryFollower(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_MIN_INTERVAL = 5.0                      # seconds
+    DEFAULT_MAX_INTERVAL = 120.0                    # seconds
+
+    DEFAULT_OVERLAP = 60.0                          # seconds
+
+    DECREASE_FACTOR = 0.5
+    INCREASE_FACTOR = 1.5
+
+    __PRUNE_SIZE = 1024                             # digests held before the first prune
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def digest(payload):
+        return hashlib.sha1(JSONify.dumps(payload).encode()).hexdigest()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, fetch, payload, paths, start, min_interval=DEFAULT_MIN_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, overlap=DEFAULT_OVERLAP):
+        """
+        Constructor - fetch(topic, start, end) returns the messages for the period, payload(message) returns the
+        document - start, here and for fetch, is in epoch seconds
+        """
+        self.__fetch = fetch                                            # callable
+        self.__payload = payload                                        # callable
+        self.__paths = list(paths)                                      # list of string
+
+        self.__min_interval = float(min_interval)                       # float         seconds
+        self.__max_interval = float(max_interval)                       # float         seconds
+        self.__overlap = float(overlap)                                 # float         seconds
+
+        self.__latest = {path: float(start) for path in paths}          # dict of topic: epoch seconds
+        self.__seen = {path: {} for path in paths}                      # dict of topic: dict of (rec, digest): rec
+
+        self.__interval = self.__min_interval                           # float         seconds
+        self.__prune_size = self.__PRUNE_SIZE                           # int
+
+        self.__poll_count = 0                                           # int
+        self.__message_count = 0                                        # int
+        self.__duplicate_count = 0                                      # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def follow(self):
+        """
+        yields (topic, message) for new messages, in order of rec within each poll - does not return
+        """
+        while True:
+            messages = self.poll()
+
+            yield from messages
+
+            if messages:
+                self.__interval = max(self.__min_interval, self.__interval * self.DECREASE_FACTOR)
+            else:
+                self.__interval = min(self.__max_interval, self.__interval * self.INCREASE_FACTOR)
+
+            time.sleep(self.__interval)
+
+
+    def poll(self):
+        """
+        returns a list of (topic, message) for messages not seen before, in order of rec
+        """
+        end = time.time()
+        found = []
+
+        for path in self.__paths:
+            start = self.__latest[path] - self.__overlap
+
+            for message in self.__fetch(path, start, end):
+                if self.seen(path, message, end):
+                    self.__duplicate_count += 1
+                    continue
+
+                found.append((self.__rec(message, end), len(found), path, message))
+
+            self.__prune(path)
+
+        self.__poll_count += 1
+        self.__message_count += len(found)
+
+        return [(path, message) for _, _, path, message in sorted(found)]
+
+
+    def seen(self, topic, message, default_rec=None):
+        """
+        records the message, returning True if it had been seen before - default_rec is used for messages with no rec
+        """
+        rec = self.__rec(message, time.time() if default_rec is None else default_rec)
+        key = (rec, self.digest(self.__payload(message)))
+
+        seen = self.__seen[topic]
+
+        if key in seen:
+            return True
+
+        if rec < self.__latest[topic] - self.__overlap:            # before any future poll
+            return False
+
+        seen[key] = rec
+
+        if rec > self.__latest[topic]:
+            self.__latest[topic] = rec
+
+        if len(seen) > self.__prune_size:
+            self.__prune(topic)
+
+        return False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __rec(self, message, default_rec):
+        rec = TopicMerger.rec_timestamp(self.__payload(message))
+
+        return default_rec if rec is None else rec
+
+
+    def __prune(self, topic):
+        horizon = self.__latest[topic] - self.__overlap
+        seen = self.__seen[topic]
+
+        for key in [key for key, rec in seen.items() if rec < horizon]:
+            del seen[key]
+
+        self.__prune_size = max(self.__PRUNE_SIZE, len(seen) * 2)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def interval(self):
+        return self.__interval
+
+
+    @property
+    def poll_count(self):
+        return self.__poll_count
+
+
+    @property
+    def message_count(self):
+        return self.__message_count
+
+
+    @property
+    def duplicate_count(self):
+        return self.__duplicate_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "HistoryFollower:{paths:%s, min_interval:%s, max_interval:%s, overlap:%s, interval:%s, " \
+               "poll_count:%s, message_count:%s, duplicate_count:%s}" % \
+               (self.__paths, self.__min_interval, self.__max_interval, self.__overlap, self.interval,
+                self.poll_count, self.message_count, self.duplicate_count)
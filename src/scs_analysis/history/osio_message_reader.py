@@ -0,0 +1,138 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Reads the stored messages of a topic from the OpenSensors.io history API - as scs_core's MessageManager does - but
+parses each page of the response incrementally, as it arrives. Messages are constructed from the page while it is
+being transferred, and the page is never held as a whole.
+
+The http_client must provide stream(..), as PooledHTTPClient does.
+
+example page:
+{"messages": [{"topic": "...", "date": "...", "payload": {"text": "..."}, ...}, ...],
+"next": "/v1/messages/topic/...?start-date=2016-11-13T07:11:14.779Z&end-date=2016-11-13T08:48:08.901+00:00"}
+"""
+
+import sys
+import urllib.parse
+
+from http import HTTPStatus
+
+from scs_analysis.client.json_stream_parser import JSONStreamParser
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+from scs_core.osio.data.message import Message
+
+from scs_core.sys.http_exception import HTTPException
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class OSIOMessageReader(object):
+    """
+    classdocs
+    """
+
+    __HOST = "api.opensensors.io"
+    __VERIFIED = False                              # False - ignore invalid SSL certificates
+    __PATH = "/v1/messages/topic/"
+
+    __ITEMS = 'messages'
+    __NEXT = 'next'
+
+    __START = 'start-date'
+    __END = 'end-date'
+
+    __HEADER_ACCEPT = "application/json"
+    __HEADER_AUTHORIZATION = "api-key "
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, http_client, api_key, verbose=False):
+        """
+        Constructor
+        """
+        self.__http_client = http_client                # PooledHTTPClient
+        self.__api_key = api_key                        # string
+        self.__verbose = verbose                        # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def find_for_topic(self, topic, start_date, end_date):
+        """
+        yields Message, as each arrives - with the signature of MessageManager.find_for_topic(..)
+        """
+        yield from self.find(topic, start_date, end_date)
+
+
+    def find(self, topic, start_date, end_date):
+        """
+        yields Message, as each arrives
+        """
+        request_path = self.__PATH + topic
+        params = {self.__START: start_date.as_iso8601(), self.__END: end_date.as_iso8601()}
+
+        total = 0
+
+        self.__http_client.connect(self.__HOST, verified=self.__VERIFIED)
+
+        try:
+            while True:
+                parser = JSONStreamParser(self.__ITEMS)
+
+                try:
+                    for text in self.__http_client.stream(request_path, params, self.__headers):
+                        for jdict in parser.feed(text):
+                            yield Message.construct_from_jdict(jdict)
+
+                except HTTPException as ex:
+                    if ex.status == HTTPStatus.NOT_FOUND:
+                        return
+
+                    raise
+
+                parser.close()
+
+                # report...
+                if self.__verbose:
+                    total += parser.item_count
+                    now = LocalizedDatetime.now().utc()
+
+                    print("%s: batch: %d total: %d" % (now.as_iso8601(), parser.item_count, total), file=sys.stderr)
+                    sys.stderr.flush()
+
+                # next...
+                next_uri = parser.fields.get(self.__NEXT)
+
+                if not next_uri:
+                    return
+
+                next_params = urllib.parse.parse_qs(urllib.parse.urlparse(urllib.parse.unquote(next_uri)).query)
+
+                if self.__START not in next_params or self.__END not in next_params:
+                    return
+
+                # a '+' in a UTC offset is read as a space...
+                params[self.__START] = next_params[self.__START][0].replace(' ', '+')
+                params[self.__END] = next_params[self.__END][0].replace(' ', '+')
+
+        finally:
+            self.__http_client.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def __headers(self):
+        return {"Accept": self.__HEADER_ACCEPT,
+                "Authorization": self.__HEADER_AUTHORIZATION + self.__api_key}
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "OSIOMessageReader:{http_client:%s, verbose:%s}" % (self.__http_client, self.__verbose)
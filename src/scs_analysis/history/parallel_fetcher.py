@@ -0,0 +1,278 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Fetches a topic history as a sequence of consecutive time slices, several slices at a time, on a pool of worker
+threads. Each worker thread has its own fetch function - and therefore its own manager and HTTP connection.
+
+Slices are returned strictly in order. The fetch function may return its messages as a generator: the slice at the
+head of the order is then streamed to the caller as its messages arrive, and the slices behind it - at most depth -
+are buffered until it is done. Each slice buffers at most capacity messages: when its buffer is full, its worker waits
+for the consumer, so memory use is bounded however long the history is, and however long each slice is. Even with one
+worker, the slices that follow are fetched while the current slice is consumed.
+
+An exception raised by the fetch factory, by the fetch function or by its messages iterator is raised to the consumer
+when it reaches that slice.
+
+A message that falls exactly on the boundary between two slices may be returned by both fetches. Such duplicates are
+removed by comparing the leading messages of each slice with the trailing messages of its predecessor.
+"""
+
+import queue
+import threading
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ParallelFetcher(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_SLICE_MINUTES = 60
+    DEFAULT_CAPACITY = 1000                     # messages buffered per slice
+
+    __BOUNDARY_MESSAGES = 16                    # trailing messages compared with the leading messages of the next slice
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def slices(start, end, minutes=DEFAULT_SLICE_MINUTES, aligned=False):
+        """
+        yields (start, end) LocalizedDatetime pairs that exactly cover [start, end] - if aligned, boundaries between
+        slices fall on whole multiples of the slice length since the epoch
+        """
+        seconds = minutes * 60
+        duration = end.timestamp() - start.timestamp()
+
+        offset = 0
+        step = seconds - start.timestamp() % seconds if aligned else seconds
+
+        while True:
+            slice_start = start.timedelta(seconds=offset)
+
+            if offset + step >= duration:
+                yield slice_start, end
+                return
+
+            offset += step
+            step = seconds
+
+            yield slice_start, start.timedelta(seconds=offset)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, fetch_factory, workers=1, depth=None, capacity=DEFAULT_CAPACITY):
+        """
+        Constructor - fetch_factory() returns a function fetch(topic, start, end) that returns an iterable of messages
+        """
+        self.__fetch_factory = fetch_factory                            # callable
+        self.__workers = int(workers)                                   # int
+        self.__depth = self.__workers * 2 if depth is None else int(depth)     # int       slices in flight
+        self.__capacity = int(capacity)                                 # int       messages buffered per slice
+
+        self.__local = threading.local()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def find_slices(self, topic, slices):
+        """
+        yields ((start, end), messages) for each slice, in order - messages is an iterator, that must be consumed
+        before the next slice is taken
+        """
+        slices = iter(slices)
+        reorder_buffer = deque()                                        # of (slice, future, stream), in slice order
+
+        stream = None                                                   # the slice being consumed
+
+        executor = ThreadPoolExecutor(max_workers=self.__workers)
+
+        try:
+            for _ in range(self.__depth):
+                if not self.__submit(executor, reorder_buffer, topic, slices):
+                    break
+
+            while reorder_buffer:
+                time_slice, _, stream = reorder_buffer.popleft()
+
+                self.__submit(executor, reorder_buffer, topic, slices)
+
+                yield time_slice, stream.messages()                     # waits for this slice only
+
+                stream.cancel()                                         # in case it was not consumed
+
+        finally:
+            if stream is not None:
+                stream.cancel()
+
+            for _, future, buffered_stream in reorder_buffer:
+                future.cancel()
+                buffered_stream.cancel()
+
+            executor.shutdown(wait=False)
+
+
+    def find(self, topic, slices, key=None):
+        """
+        yields messages in order - if key is given, key(message) identifies messages duplicated across a boundary
+        """
+        for _, _, message in self.find_positions(topic, slices, key):
+            yield message
+
+
+    def find_positions(self, topic, slices, key=None, skip=0):
+        """
+        yields ((start, end), index, message) in order, where index is the position of the message in its slice - the
+        first skip messages of the first slice are passed over
+        """
+        boundary = set()
+
+        for time_slice, messages in self.find_slices(topic, slices):
+            trailing = deque(maxlen=self.__BOUNDARY_MESSAGES)
+            leading = key is not None
+
+            for index, message in enumerate(messages):
+                trailing.append(message)
+
+                if index < skip:
+                    continue
+
+                if leading and key(message) in boundary:
+                    continue
+
+                leading = False
+
+                yield time_slice, index, message
+
+            skip = 0
+
+            if key is not None and trailing:
+                boundary = set(key(message) for message in trailing)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __submit(self, executor, reorder_buffer, topic, slices):
+        try:
+            time_slice = next(slices)
+
+        except StopIteration:
+            return False
+
+        stream = _SliceStream(self.__capacity)
+        future = executor.submit(stream.run, self.__fetch, topic, time_slice[0], time_slice[1])
+
+        reorder_buffer.append((time_slice, future, stream))
+
+        return True
+
+
+    def __fetch(self, topic, start, end):
+        # on a worker thread...
+        fetch = getattr(self.__local, 'fetch', None)
+
+        if fetch is None:
+            fetch = self.__fetch_factory()
+            self.__local.fetch = fetch
+
+        return fetch(topic, start, end)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def workers(self):
+        return self.__workers
+
+
+    @property
+    def depth(self):
+        return self.__depth
+
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ParallelFetcher:{workers:%s, depth:%s, capacity:%s}" % (self.workers, self.depth, self.capacity)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _SliceStream(object):
+    """
+    classdocs
+    """
+
+    __MESSAGE = 0
+    __END = 1
+    __FAILURE = 2
+
+    __PUT_TIMEOUT = 0.5                                 # seconds - a full buffer is re-checked for cancellation
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, capacity):
+        """
+        Constructor
+        """
+        self.__queue = queue.Queue(maxsize=capacity)    # of (kind, value)
+        self.__cancelled = False                        # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def run(self, fetch, *args):
+        # on a worker thread - fetch(*args) returns an iterable of messages...
+        try:
+            for message in fetch(*args):
+                if not self.__put((self.__MESSAGE, message)):
+                    return
+
+        except Exception as ex:
+            self.__put((self.__FAILURE, ex))
+            return
+
+        self.__put((self.__END, None))
+
+
+    def cancel(self):
+        self.__cancelled = True
+
+
+    def __put(self, item):
+        # returns False if the stream was cancelled - the consumer will never empty a full buffer...
+        while not self.__cancelled:
+            try:
+                self.__queue.put(item, timeout=self.__PUT_TIMEOUT)
+                return True
+
+            except queue.Full:
+                continue
+
+        return False
+
+
+    def messages(self):
+        while True:
+            kind, value = self.__queue.get()
+
+            if kind == self.__END:
+                return
+
+            if kind == self.__FAILURE:
+                raise value
+
+            yield value
@@ -0,0 +1,221 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+The retrieval of topic history that is common to the aws_topic_history and osio_topic_history utilities: the period
+or checkpoint, the time slices of each topic, the merge of several topics, the checkpoint updates and the follow.
+
+The data infrastructure is given by fetch_factory() - which returns a function fetch(topic, start, end) for a worker
+- and by payload(message), which returns the document carried by one of its messages.
+"""
+
+import sys
+
+from scs_analysis.history.history_cache import HistoryCache
+from scs_analysis.history.history_checkpoint import HistoryCheckpoint
+from scs_analysis.history.history_follower import HistoryFollower
+from scs_analysis.history.parallel_fetcher import ParallelFetcher
+from scs_analysis.history.topic_merger import TopicMerger
+
+from scs_core.data.json import JSONify
+from scs_core.data.localized_datetime import LocalizedDatetime
+from scs_core.data.publication import Publication
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TopicHistory(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, cmd, fetch_factory, payload, cache=None):
+        """
+        Constructor - cmd is a CmdTopicHistory
+        """
+        self.__cmd = cmd                                                # CmdTopicHistory
+        self.__fetch_factory = fetch_factory                            # callable
+        self.__payload = payload                                        # callable
+        self.__cache = cache                                            # HistoryCache (may be None)
+
+        self.__fetcher = ParallelFetcher(fetch_factory, cmd.parallel)   # ParallelFetcher
+
+        self.__checkpoint = None                                        # HistoryCheckpoint
+        self.__follower = None                                          # HistoryFollower
+
+        self.__start = None                                             # LocalizedDatetime
+        self.__end = None                                               # LocalizedDatetime
+        self.__slice_minutes = None                                     # int
+        self.__aligned = False                                          # bool
+
+        self.__count = 0                                                # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        """
+        establishes the period, from the checkpoint or the cmd - returns False, with a report to stderr, if it cannot
+        """
+        cmd = self.__cmd
+
+        # checkpoint...
+        self.__checkpoint = HistoryCheckpoint.load(cmd.checkpoint) if cmd.checkpoint else None
+
+        if self.__checkpoint is not None:
+            if self.__checkpoint.paths != cmd.paths:
+                print("The checkpoint is for other topics: %s" % self.__checkpoint.paths, file=sys.stderr)
+                return False
+
+            self.__start = LocalizedDatetime.construct_from_timestamp(self.__checkpoint.start)
+            self.__end = LocalizedDatetime.construct_from_timestamp(self.__checkpoint.end)
+            self.__slice_minutes, self.__aligned = self.__checkpoint.slice_minutes, self.__checkpoint.aligned
+
+        else:
+            if cmd.start is None and cmd.minutes is None and not cmd.follow:
+                print("No checkpoint was found, and no period was given.", file=sys.stderr)
+                return False
+
+            # time...
+            if cmd.use_offset():
+                self.__end = LocalizedDatetime.now()
+                self.__start = self.__end.timedelta(minutes=-cmd.minutes)
+            elif cmd.start is not None:
+                self.__end = LocalizedDatetime.now() if cmd.end is None else cmd.end
+                self.__start = cmd.start
+            else:
+                self.__end = LocalizedDatetime.now()
+                self.__start = self.__end
+
+            # slices...
+            if self.__cache is None:
+                self.__slice_minutes, self.__aligned = cmd.slice, False
+            else:
+                self.__slice_minutes, self.__aligned = HistoryCache.BUCKET_MINUTES, True
+
+            if cmd.checkpoint:
+                self.__checkpoint = HistoryCheckpoint.construct(cmd.checkpoint, cmd.paths, self.__start, self.__end,
+                                                                self.__slice_minutes, self.__aligned)
+
+        if cmd.verbose:
+            print("start: %s" % self.__start, file=sys.stderr)
+            print("end: %s" % self.__end, file=sys.stderr)
+
+            if self.__checkpoint:
+                print(self.__checkpoint, file=sys.stderr)
+
+            sys.stderr.flush()
+
+        return True
+
+
+    def run(self):
+        """
+        writes the messages of the period to stdout, then - if following - new messages, until interrupted
+        """
+        cmd = self.__cmd
+
+        # messages - each stream resumes at its checkpointed position, if there is one...
+        streams = []
+
+        for path in cmd.paths:
+            if self.__checkpoint is None:
+                slice_start, skip = self.__start, 0
+            else:
+                slice_timestamp, skip = self.__checkpoint.position(path)
+                slice_start = LocalizedDatetime.construct_from_timestamp(slice_timestamp)
+
+            slices = ParallelFetcher.slices(slice_start, self.__end, self.__slice_minutes, self.__aligned)
+
+            streams.append((path, self.__fetcher.find_positions(path, slices, key=JSONify.dumps, skip=skip)))
+
+        if cmd.follow:
+            follow_fetch = self.__fetch_factory()
+
+            def fetch_period(topic, period_start, period_end):
+                return follow_fetch(topic, LocalizedDatetime.construct_from_timestamp(period_start),
+                                    LocalizedDatetime.construct_from_timestamp(period_end))
+
+            self.__follower = HistoryFollower(fetch_period, self.__payload, cmd.paths, self.__end.timestamp())
+
+        if len(streams) == 1:
+            messages = ((streams[0][0], position) for position in streams[0][1])
+        else:
+            merger = TopicMerger(lambda position: TopicMerger.rec_timestamp(self.__payload(position[2])))
+            messages = merger.merge(streams)
+
+        for topic, (time_slice, index, message) in messages:
+            payload = self.__write(topic, message)
+            self.__count += 1
+
+            if self.__checkpoint is not None:
+                rec = payload.get('rec') if isinstance(payload, dict) else None
+                self.__checkpoint.update(topic, time_slice[0], index + 1, rec)
+
+            if self.__follower is not None:
+                self.__follower.seen(topic, message)
+
+        if self.__checkpoint is not None:
+            self.__checkpoint.delete()
+
+        # follow - until interrupted...
+        if self.__follower is not None:
+            if cmd.verbose:
+                print("history: %d" % self.__count, file=sys.stderr)
+                print(self.__follower, file=sys.stderr)
+                sys.stderr.flush()
+
+            for topic, message in self.__follower.follow():
+                self.__write(topic, message)
+
+
+    def close(self):
+        if self.__checkpoint is not None:
+            self.__checkpoint.save()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __write(self, topic, message):
+        payload = self.__payload(message)
+        document = message if self.__cmd.include_wrapping else payload
+
+        if len(self.__cmd.paths) > 1:
+            document = Publication(topic, document)
+
+        print(JSONify.dumps(document))
+        sys.stdout.flush()
+
+        return payload
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def fetcher(self):
+        return self.__fetcher
+
+
+    @property
+    def checkpoint(self):
+        return self.__checkpoint
+
+
+    @property
+    def follower(self):
+        return self.__follower
+
+
+    @property
+    def count(self):
+        return self.__count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TopicHistory:{fetcher:%s, checkpoint:%s, follower:%s, count:%s}" % \
+               (self.fetcher, self.checkpoint, self.follower, self.count)
@@ -0,0 +1,105 @@
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Merges the time-ordered message streams of several topics into one time-ordered stream, with a heap-based k-way merge.
+Only the head message of each stream is held by the heap, so memory is bounded by the buffers of the streams
+themselves. Messages with equal times are returned in the order in which their topics were given.
+
+A message without a valid time cannot be placed in time order. It is reported on stderr, and returned immediately
+after its predecessor in its own stream - or, if it is the first message of its stream, before any other message.
+"""
+
+import heapq
+import sys
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TopicMerger(object):
+    """
+    classdocs
+    """
+
+    @staticmethod
+    def rec_timestamp(document):
+        """
+        returns the rec field of the document as epoch seconds - or None if there is no valid rec field
+        """
+        rec = document.get('rec') if isinstance(document, dict) else None
+        datetime = LocalizedDatetime.construct_from_iso8601(rec) if isinstance(rec, str) else None
+
+        return None if datetime is None else datetime.timestamp()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, key):
+        """
+        Constructor - key(message) returns the time of the message, as a comparable value, or None if it has none
+        """
+        self.__key = key                                    # callable
+
+        self.__untimed_count = 0                            # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def merge(self, streams):
+        """
+        streams is a list of (topic, iterable of message) - yields (topic, message) in time order
+        """
+        heap = []
+        iterators = []
+        latest = []                                         # the time of the latest message of each stream
+
+        for index, (topic, messages) in enumerate(streams):
+            iterators.append((topic, iter(messages)))
+            latest.append(float('-inf'))
+
+            self.__push(heap, iterators, latest, index)
+
+        while heap:
+            _, index, message = heapq.heappop(heap)
+
+            yield iterators[index][0], message
+
+            self.__push(heap, iterators, latest, index)
+
+
+    def __push(self, heap, iterators, latest, index):
+        try:
+            message = next(iterators[index][1])
+
+        except StopIteration:
+            return
+
+        key = self.__key(message)
+
+        if key is None:
+            # placed with its predecessor...
+            print("TopicMerger: %s: message has no valid time" % iterators[index][0], file=sys.stderr)
+            self.__untimed_count += 1
+
+            key = latest[index]
+
+        latest[index] = key
+
+        # the stream index breaks ties, so messages are never compared...
+        heapq.heappush(heap, (key, index, message))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def untimed_count(self):
+        return self.__untimed_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TopicMerger:{key:%s, untimed_count:%s}" % (self.__key, self.untimed_count)
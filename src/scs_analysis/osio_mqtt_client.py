@@ -14,6 +14,60 @@ to operate. A specification should be obtained from the user's OpenSensors.io ac
 
 Only one MQTT client should run at any one time, per TCP/IP host.
 
+Where a subscription is written to a Unix domain socket, the connection is kept open, and each message is terminated
+by a newline. Messages that arrive together are written together. If the reader goes away, the connection is re-made
+after a backoff; messages received while there is no reader are lost. If the connection fails part-way through a
+write, the messages not yet sent in full are written on the new connection - no message is written twice.
+
+This is a change of protocol: earlier versions made a connection for each message, and a reader that takes everything
+sent on a connection as one message - such as DomainSocket.read() - will not work. The socket should be read with
+uds_receiver, or another reader that splits the stream at newlines.
+
+Each subscription has its own bounded queue and writer thread, so that a slow reader does not stall the MQTT client,
+or the other subscriptions. When a queue is full, the drop policy applies: drop-oldest (the default) discards the
+oldest queued message, drop-newest discards the new message, and block holds up the MQTT client until there is space.
+The state of the queues is written to stderr when the process receives SIGUSR1 - for example, kill -USR1 PID.
+
+Publications are completed by worker threads, with up to WINDOW publications in flight at once (the default is one),
+so that on a link with a long round trip, publishing is not held to one publication per round trip. Publications on
+the same topic are published one at a time, in order; publications on different topics overlap. The state of the
+publisher is also written on SIGUSR1.
+
+If a spool directory is given, each publication is appended to a disk-backed spool, and published from there, so that
+reading publications never waits on the broker, and publications not yet published survive a restart - they are
+published first when the client is restarted. Publication is at least once: publications in flight when the client
+stopped are published again. A publication is removed from the spool only when it has been published; one that fails
+is retried after a backoff, and the spool is held until it succeeds. The spool is bounded by --spool-size; when it is
+full, the oldest publications are lost.
+The --sync policy sets how often the spool is synced to disk.
+
+Messages can also be routed with --route FILTER SINK, which may be repeated. FILTER is an MQTT topic filter - + matches
+one level and # matches any number of levels - and SINK is uds:PATH, file:PATH or stdout. Each message is written to
+every sink with a matching route, once, so several local consumers can share one subscription. A subscription to a
+domain socket is a route from its topic to that socket. Where routes are given, subscriptions without a domain socket
+are not written to stdout, unless there is a route to stdout.
+
+If a control socket is given with --control, routes and broker subscriptions can be added and removed while the
+client runs, without the client reconnecting. Each command is a JSON document on one line, and is answered on the same
+connection: {"cmd": "route", "topic": FILTER, "sink": SINK}, {"cmd": "unroute", "topic": FILTER, "sink": SINK},
+{"cmd": "routes"}, {"cmd": "subscribe", "topic": TOPIC}, {"cmd": "unsubscribe", "topic": TOPIC} or
+{"cmd": "subscriptions"}.
+
+A subscription made by the control socket must be to a topic that OpenSensors.io reports as available. It is made on
+the live connection, and is made again whenever the client reconnects; it has its own queue, as the subscriptions given
+on the command line do, and its messages are written to the sinks of the routes that match them. A route that no
+subscription covers is answered with "covered": false, and receives nothing until a subscription that covers it is
+made.
+
+For each message received, the rec field of its payload is compared with the time at which the message was received,
+and with the time at which it was written to its sockets, files or stdout. The latencies are held in a histogram for
+each topic, with the count and rate of messages. The statistics are written to stderr on SIGUSR1 and, if a file is
+given with --latency, saved to it every --interval seconds. Latencies include any difference between the clocks of the
+publishing device and this host.
+
+Raw passthrough is not available for OpenSensors.io subscriptions: the --raw option is rejected, and the client exits
+with an error.
+
 Note that there are currently no utilities to manage the OpenSensors client specification document - this
 must be installed or edited by hand. This situation will change. Document example:
 
@@ -22,6 +76,20 @@ must be installed or edited by hand. This situation will change. Document exampl
 EXAMPLES
 ./osio_mqtt_client.py /orgs/south-coast-science-dev/production-test/loc/1/gases
 
+./osio_mqtt_client.py -q 5000 -d block -s /orgs/south-coast-science-dev/production-test/loc/1/gases /tmp/gases.uds
+
+./osio_mqtt_client.py -w 8 -p /tmp/publications.uds
+
+./osio_mqtt_client.py -w 8 -o ~/SCS/osio/spool -y always -p /tmp/publications.uds
+
+./osio_mqtt_client.py -t '#' file:gases.jsonl -t '#' stdout /orgs/south-coast-science-dev/production-test/loc/1/gases
+
+./osio_mqtt_client.py -c /tmp/osio_ctrl.uds -t '#' stdout /orgs/south-coast-science-dev/production-test/loc/1/gases
+
+./osio_mqtt_client.py -l ~/SCS/osio/latency.json /orgs/south-coast-science-dev/production-test/loc/1/gases
+
+echo '{"cmd": "subscribe", "topic": "/orgs/south-coast-science-dev/unep/loc/1/gases"}' | socat - UNIX:/tmp/osio_ctrl.uds
+
 FILES
 ~/SCS/osio/osio_api_auth.json
 ~/SCS/osio/osio_client_auth.json
@@ -30,6 +98,8 @@ SEE ALSO
 scs_analysis/osio_api_auth
 scs_analysis/osio_mqtt_control
 scs_analysis/osio_topic_publisher
+scs_analysis/partitioned_writer
+scs_analysis/uds_receiver
 
 BUGS
 When run as a background process, osio_mqtt_client will exit if it has no stdin stream.
@@ -43,6 +113,19 @@ import time
 from collections import OrderedDict
 
 from scs_analysis.cmd.cmd_mqtt_client import CmdMQTTClient
+from scs_analysis.client.async_publisher import AsyncPublisher
+from scs_analysis.client.http_connection_pool import HTTPConnectionPool
+from scs_analysis.client.pooled_http_client import PooledHTTPClient
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+from scs_analysis.comms.latency_stats import LatencyStats
+from scs_analysis.comms.osio_mqtt_live_client import OSIOMQTTLiveClient
+from scs_analysis.comms.publication_spool import PublicationSpool
+from scs_analysis.comms.route_control import RouteControl
+from scs_analysis.comms.route_sink import RouteSink
+from scs_analysis.comms.spool_drain import SpoolDrain
+from scs_analysis.comms.status_signal import StatusSignal
+from scs_analysis.comms.topic_router import TopicRouter
+from scs_analysis.comms.uds_reader import UDSReader
 
 from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
@@ -54,10 +137,8 @@ from scs_core.osio.manager.topic_manager import TopicManager
 
 from scs_core.sys.exception_report import ExceptionReport
 
-from scs_host.client.http_client import HTTPClient
-from scs_host.client.mqtt_client import MQTTClient, MQTTSubscriber
+from scs_host.client.mqtt_client import MQTTSubscriber
 
-from scs_host.comms.domain_socket import DomainSocket
 from scs_host.comms.stdio import StdIO
 
 from scs_host.sys.host import Host
@@ -73,54 +154,86 @@ class OSIOMQTTHandler(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, comms, echo, verbose):
+    def __init__(self, router, echo, verbose, max_length=DeliveryQueue.DEFAULT_MAX_LENGTH,
+                 policy=DeliveryQueue.DEFAULT_POLICY, name=None, stats=None):
         """
         Constructor
         """
-        self.__comms = comms
+        self.__router = router
 
         self.__echo = echo
         self.__verbose = verbose
+        self.__stats = stats
+
+        self.__queue = DeliveryQueue(self.__deliver, name, max_length, policy)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__queue.start()
+
+
+    def close(self):
+        self.__queue.close()
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def handle(self, pub):
-        try:
-            self.__comms.connect()
-            self.__comms.write(JSONify.dumps(pub), False)
+        # on the MQTT network thread - the publication is written by the queue's writer thread...
+        self.__queue.put((pub, time.time()))
 
-        except ConnectionRefusedError:
-            if self.__verbose:
-                print("OSIOMQTTHandler: connection refused for %s" % self.__comms.address, file=sys.stderr)
-                sys.stderr.flush()
 
-        finally:
-            self.__comms.close()
+    def __deliver(self, items):
+        # each publication is serialised once, and shared by its sinks, echo and verbose...
+        jstrs = []
+        blocks = OrderedDict()                          # dict of sink: list of jstr
+
+        for pub, _ in items:
+            jstr = JSONify.dumps(pub)
+            jstrs.append(jstr)
+
+            for sink in self.__router.match(pub.topic):
+                blocks.setdefault(sink, []).append(jstr)
+
+        for sink, sink_jstrs in blocks.items():
+            try:
+                sink.write(RouteSink.EOM.join(sink_jstrs))
+
+            except ConnectionRefusedError:
+                if self.__verbose:
+                    print("OSIOMQTTHandler: connection refused for %s" % sink.spec, file=sys.stderr)
+                    sys.stderr.flush()
+
+        if self.__stats is not None:
+            written = time.time()
+            self.__stats.record([(pub.topic, pub.payload.get('rec') if isinstance(pub.payload, dict) else None,
+                                  received, written) for pub, received in items])
 
         if self.__echo:
-            print(JSONify.dumps(pub))
+            print(RouteSink.EOM.join(jstrs))
             sys.stdout.flush()
 
         if self.__verbose:
-            print("received: %s" % JSONify.dumps(pub), file=sys.stderr)
+            for jstr in jstrs:
+                print("received: %s" % jstr, file=sys.stderr)
+
             sys.stderr.flush()
 
 
-    def print_status(self, status):
-        if not self.__verbose:
-            return
+    # ----------------------------------------------------------------------------------------------------------------
 
-        now = LocalizedDatetime.now()
-        print("%s:         mqtt: %s" % (now.as_iso8601(), status), file=sys.stderr)
-        sys.stderr.flush()
+    @property
+    def queue(self):
+        return self.__queue
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return "OSIOMQTTHandler:{comms:%s, echo:%s, verbose:%s}" % \
-               (self.__comms, self.__echo, self.__verbose)
+        return "OSIOMQTTHandler:{echo:%s, verbose:%s, queue:%s}" % \
+               (self.__echo, self.__verbose, self.__queue)
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -128,7 +241,15 @@ class OSIOMQTTHandler(object):
 if __name__ == '__main__':
 
     client = None
+    publisher = None
+    spool = None
+    drain = None
+    status_signal = None
     pub_comms = None
+    sinks = {}
+    handlers = []
+    control = None
+    stats = None
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -140,6 +261,15 @@ if __name__ == '__main__':
         cmd.print_help(sys.stderr)
         exit(2)
 
+    # the client decodes each message before it is handled...
+    if cmd.raw:
+        print("osio_mqtt_client: raw passthrough is not available for OpenSensors.io subscriptions.", file=sys.stderr)
+        exit(2)
+
+    if cmd.shards > 1:
+        print("osio_mqtt_client: shards are not available for OpenSensors.io subscriptions.", file=sys.stderr)
+        exit(2)
+
     if cmd.verbose:
         print(cmd, file=sys.stderr)
 
@@ -168,10 +298,10 @@ if __name__ == '__main__':
             print(client_auth, file=sys.stderr)
 
         # comms...
-        pub_comms = DomainSocket(cmd.uds_pub_addr) if cmd.uds_pub_addr else StdIO()
+        pub_comms = UDSReader(cmd.uds_pub_addr) if cmd.uds_pub_addr else StdIO()
 
         # manager...
-        manager = TopicManager(HTTPClient(), api_auth.api_key)
+        manager = TopicManager(PooledHTTPClient(HTTPConnectionPool()), api_auth.api_key)
 
         # check topics...
         unavailable = False
@@ -183,29 +313,154 @@ if __name__ == '__main__':
         if unavailable:
             exit(1)
 
-        # subscribers...
-        subscribers = []
+        # routes - a subscription to a domain socket is a route, and routes may share sinks...
+        router = TopicRouter()
+
+        def sink(spec):
+            if spec not in sinks:
+                sinks[spec] = RouteSink.construct(spec)
+                sinks[spec].connect()
+
+            return sinks[spec]
 
         for subscription in cmd.subscriptions:
-            sub_comms = DomainSocket(subscription.address) if subscription.address else StdIO()
+            if subscription.address:
+                router.add(subscription.topic, sink(RouteSink.UDS + ':' + subscription.address))
+
+            elif not cmd.routes:
+                router.add(subscription.topic, sink(RouteSink.STDOUT))
+
+        for topic_filter, spec in cmd.routes:
+            router.add(topic_filter, sink(spec))
+
+        if cmd.verbose:
+            print(router, file=sys.stderr)
+
+        # latency statistics - shared by the handlers...
+        stats = LatencyStats(cmd.stats_file, cmd.stats_interval)
+
+        # subscribers - at startup, or by the control socket...
+        def subscriber(topic):
+            # handler - with its own queue and writer thread...
+            handler = OSIOMQTTHandler(router, cmd.echo, cmd.verbose, cmd.queue_length, cmd.drop_policy, topic, stats)
+            handler.start()
 
-            # handler...
-            handler = OSIOMQTTHandler(sub_comms, cmd.echo, cmd.verbose)
+            handlers.append(handler)
 
             if cmd.verbose:
                 print(handler, file=sys.stderr)
                 sys.stderr.flush()
 
-            subscribers.append(MQTTSubscriber(subscription.topic, handler.handle))
+            return MQTTSubscriber(topic, handler.handle)
+
+        def close_handler(topic):
+            for closing in [handler for handler in handlers if handler.queue.name == topic]:
+                handlers.remove(closing)
+                closing.close()
+
+        subscribers = [subscriber(subscription.topic) for subscription in cmd.subscriptions]
 
         # client...
-        client = MQTTClient(*subscribers)
+        client = OSIOMQTTLiveClient(*subscribers)
         client.connect(ClientAuth.MQTT_HOST, client_auth.client_id, client_auth.user_id, client_auth.client_password)
 
+        # publisher...
+        def publish(publication):
+            while True:
+                try:
+                    return client.publish(publication, ClientAuth.MQTT_TIMEOUT)
+
+                except Exception as ex:
+                    if cmd.verbose:
+                        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+                        sys.stderr.flush()
+
+                time.sleep(random.uniform(1.0, 2.0))        # Don't hammer the client!
+
+        def published(publication, success, ex):
+            if ex is not None:
+                print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+                sys.stderr.flush()
+
+            if cmd.verbose:
+                now = LocalizedDatetime.now()
+                print("%s:         mqtt: %s" % (now.as_iso8601(), "done" if success else "abandoned"), file=sys.stderr)
+                sys.stderr.flush()
+
+        publisher = AsyncPublisher(publish, cmd.window, published)
+        publisher.start()
+
+        if cmd.verbose:
+            print(publisher, file=sys.stderr)
+            sys.stderr.flush()
+
+        # queue status on demand...
+        def print_status():
+            print(publisher, file=sys.stderr)
+
+            if spool is not None:
+                print(spool, file=sys.stderr)
+
+            for status_handler in list(handlers):
+                print(status_handler.queue, file=sys.stderr)
+
+            for status_sink in list(sinks.values()):
+                print(status_sink, file=sys.stderr)
+
+            if control is not None:
+                print(control, file=sys.stderr)
+
+            print(JSONify.dumps(stats.as_json()), file=sys.stderr)
+
+            sys.stderr.flush()
+
+        status_signal = StatusSignal(print_status)
+        status_signal.start()
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
+        stats.start()
+
+        # control - routes and subscriptions may be changed from here on...
+        if cmd.uds_ctrl_addr:
+            def subscribe(topic):
+                if not manager.find(topic):
+                    raise ValueError("topic not available: %s" % topic)
+
+                try:
+                    client.subscribe(subscriber(topic))
+
+                except OSError:
+                    close_handler(topic)
+                    raise
+
+            def unsubscribe(topic):
+                client.unsubscribe(topic)
+                close_handler(topic)
+
+            control = RouteControl(cmd.uds_ctrl_addr, router, sink,
+                                   [subscription.topic for subscription in cmd.subscriptions], cmd.verbose,
+                                   subscribe, unsubscribe)
+            control.start()
+
+            if cmd.verbose:
+                print(control, file=sys.stderr)
+                sys.stderr.flush()
+
+        # spool - publications held since the last run are published first...
+        if cmd.spool:
+            spool = PublicationSpool(cmd.spool, cmd.spool_size * 1024 * 1024, sync=cmd.sync)
+            spool.open()
+
+            drain = SpoolDrain(spool, publisher, Publication.construct_from_jdict, published)
+            drain.start()
+
+            if cmd.verbose:
+                print(spool, file=sys.stderr)
+                sys.stderr.flush()
+
         # publish...
         pub_comms.connect()
 
@@ -213,31 +468,17 @@ if __name__ == '__main__':
             try:
                 datum = json.loads(message, object_pairs_hook=OrderedDict)
             except ValueError:
-                handler.print_status("bad datum: %s" % message)
+                print("osio_mqtt_client: bad datum: %s" % message, file=sys.stderr)
+                sys.stderr.flush()
                 continue
 
-            success = False
-
-            while True:
-                publication = Publication.construct_from_jdict(datum)
-
-                try:
-                    success = client.publish(publication, ClientAuth.MQTT_TIMEOUT)
-
-                    if not success:
-                        handler.print_status("abandoned")
-
-                    break
-
-                except Exception as ex:
-                    if cmd.verbose:
-                        print(JSONify.dumps(ExceptionReport.construct(ex)))
-                        sys.stderr.flush()
-
-                time.sleep(random.uniform(1.0, 2.0))        # Don't hammer the client!
+            # the publication is spooled, then submitted by the drain...
+            if spool is not None:
+                spool.append(message)
 
-            if success:
-                handler.print_status("done")
+            # ...or completed, or abandoned, by the publisher's worker threads...
+            else:
+                publisher.submit(Publication.construct_from_jdict(datum))
 
             if cmd.echo:
                 print(message)
@@ -255,8 +496,50 @@ if __name__ == '__main__':
         print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
 
     finally:
+        if status_signal:
+            status_signal.close()
+
+        if drain:
+            drain.close()
+
+        if publisher:
+            publisher.close()
+
+            if cmd.verbose:
+                print(publisher, file=sys.stderr)
+
+        if spool:
+            spool.close()
+
+            if cmd.verbose:
+                print(spool, file=sys.stderr)
+
+        if drain:
+            drain.join()
+
         if client:
             client.disconnect()
 
         if pub_comms:
             pub_comms.close()
+
+        if control:
+            control.close()
+
+            if cmd.verbose:
+                print(control, file=sys.stderr)
+
+        for handler in handlers:
+            handler.close()
+
+            if cmd.verbose:
+                print(handler, file=sys.stderr)
+
+        if stats:
+            stats.close()
+
+        for route_sink in list(sinks.values()):
+            route_sink.close()
+
+            if cmd.verbose:
+                print(route_sink, file=sys.stderr)
@@ -37,6 +37,8 @@ import sys
 import time
 
 from scs_analysis.cmd.cmd_mqtt_control import CmdMQTTControl
+from scs_analysis.client.http_connection_pool import HTTPConnectionPool
+from scs_analysis.client.pooled_http_client import PooledHTTPClient
 
 from scs_core.control.control_datum import ControlDatum
 from scs_core.control.control_receipt import ControlReceipt
@@ -51,7 +53,6 @@ from scs_core.osio.manager.topic_manager import TopicManager
 
 from scs_core.sys.exception_report import ExceptionReport
 
-from scs_host.client.http_client import HTTPClient
 from scs_host.client.mqtt_client import MQTTClient
 from scs_host.client.mqtt_client import MQTTSubscriber
 
@@ -151,7 +152,7 @@ if __name__ == '__main__':
             sys.stderr.flush()
 
         # manager...
-        manager = TopicManager(HTTPClient(), api_auth.api_key)
+        manager = TopicManager(PooledHTTPClient(HTTPConnectionPool()), api_auth.api_key)
 
         # check topic...
         if not manager.find(cmd.topic):
@@ -12,8 +12,40 @@ Data can be retrieved by start or start + end localised date / times, or by minu
 An OpenSensors.io API auth document must be installed on the host for the osio_mqtt_client
 to operate. A specification should be obtained from the user's OpenSensors.io account.
 
+The period is divided into time slices, which are written as they arrive - the next slice is fetched while the
+current slice is written. With the --parallel option, several slices are fetched concurrently. Messages are always
+written in order. Each page of a response is parsed as it arrives, and is never held as a whole.
+
+With the --cache option, the slices are hourly buckets. Whole buckets that closed more than ten minutes ago are
+kept in a local cache, and are not fetched again. The cache is limited in size: the least-recently-used buckets are
+evicted first.
+
+Requests are paced by a token-bucket rate limiter, shared by all workers - and, through a lock file, by every process
+that uses the same API key. When the server responds with 429 Too Many Requests or 503 Service Unavailable, the rate
+is halved and requests are held off - for the Retry-After period, if one is given, otherwise for an exponential
+backoff with jitter. The rate then recovers gradually, up to --rate.
+
+If more than one topic is given, the topics are fetched concurrently, and their messages are merged in order of rec.
+Each document is then tagged by its topic, in the form {"topic": document}.
+
+With the --checkpoint option, the position after the last message written for each topic is recorded in FILE, as the
+pull progresses and when it stops. If FILE exists, the pull that it records is resumed - the period given on the
+command line, if any, is ignored - and no message is written twice. FILE is deleted when the pull is complete.
+
+With the --follow option, the tool does not stop at the end of the period - or now, if no period is given - but polls
+for new messages, as tail -f does. Each poll starts a minute before the latest rec seen, to pick up messages that
+arrive late, and messages already written are recognised by their rec and a digest of their payload. The poll
+interval shortens while messages are arriving, and lengthens - up to two minutes - while they are not.
+
 EXAMPLES
 ./osio_topic_history.py -v /orgs/south-coast-science-dev/exhibition/loc/1/particulates -m1
+./osio_topic_history.py /orgs/south-coast-science-dev/exhibition/loc/1/particulates -s 2017-10-01T00:00:00Z -n 8 -v
+./osio_topic_history.py /orgs/south-coast-science-dev/exhibition/loc/1/particulates -m1440 -k pull.json
+./osio_topic_history.py /orgs/south-coast-science-dev/exhibition/loc/1/particulates -f
+
+FILES
+~/SCS/cache/osio/
+~/SCS/limiter/
 
 SEE ALSO
 scs_analysis/osio_api_auth
@@ -22,17 +54,22 @@ scs_analysis/osio_api_auth
 import sys
 
 from scs_analysis.cmd.cmd_osio_topic_history import CmdOSIOTopicHistory
+from scs_analysis.client.http_connection_pool import HTTPConnectionPool
+from scs_analysis.client.pooled_http_client import PooledHTTPClient
+from scs_analysis.client.rate_limiter import RateLimiter
+from scs_analysis.client.shared_limiter_store import SharedLimiterStore
+from scs_analysis.history.osio_message_reader import OSIOMessageReader
+from scs_analysis.history.history_cache import HistoryCache
+from scs_analysis.history.topic_history import TopicHistory
 
 from scs_core.data.json import JSONify
-from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.osio.client.api_auth import APIAuth
+from scs_core.osio.data.message import Message
 from scs_core.osio.manager.topic_manager import TopicManager
-from scs_core.osio.manager.message_manager import MessageManager
 
 from scs_core.sys.exception_report import ExceptionReport
 
-from scs_host.client.http_client import HTTPClient
 from scs_host.sys.host import Host
 
 
@@ -40,7 +77,7 @@ from scs_host.sys.host import Host
 
 if __name__ == '__main__':
 
-    agent = None
+    history = None
 
     # ----------------------------------------------------------------------------------------------------------------
     # cmd...
@@ -69,46 +106,61 @@ if __name__ == '__main__':
             print(api_auth, file=sys.stderr)
             sys.stderr.flush()
 
+        # connection pool - shared by all managers...
+        pool = HTTPConnectionPool()
+
+        # rate limiter - shared by all workers, and all processes using this API key...
+        limiter = RateLimiter(cmd.rate, store=SharedLimiterStore.construct('osio', api_auth.api_key))
+
         # topic manager...
-        topic_manager = TopicManager(HTTPClient(), api_auth.api_key)
+        topic_manager = TopicManager(PooledHTTPClient(pool, limiter), api_auth.api_key)
+
+        # cache...
+        cache = HistoryCache.construct('osio', Message.construct_from_jdict, cmd.cache_size) if cmd.cache else None
+
+        if cmd.verbose and cache:
+            print(cache, file=sys.stderr)
 
-        # message manager...
-        message_manager = MessageManager(HTTPClient(), api_auth.api_key, cmd.verbose)
+        # fetcher - one message reader per worker...
+        def fetch_factory():
+            fetch = OSIOMessageReader(PooledHTTPClient(pool, limiter), api_auth.api_key, cmd.verbose).find_for_topic
+
+            return fetch if cache is None else cache.cached(fetch)
+
+        history = TopicHistory(cmd, fetch_factory, lambda message: message.payload.content, cache)
 
         if cmd.verbose:
-            print(message_manager, file=sys.stderr)
+            print(history.fetcher, file=sys.stderr)
 
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
         # check topics...
-        if not topic_manager.find(cmd.path):
-            print("Topic not available: %s" % cmd.path, file=sys.stderr)
-            exit(1)
+        unavailable = False
 
-        # time...
-        if cmd.use_offset():
-            end = LocalizedDatetime.now()
-            start = end.timedelta(minutes=-cmd.minutes)
-        else:
-            end = LocalizedDatetime.now() if cmd.end is None else cmd.end
-            start = cmd.start
+        for path in cmd.paths:
+            if not topic_manager.find(path):
+                print("Topic not available: %s" % path, file=sys.stderr)
+                unavailable = True
 
-        if cmd.verbose:
-            print("start: %s" % start, file=sys.stderr)
-            print("end: %s" % end, file=sys.stderr)
-            sys.stderr.flush()
+        if unavailable:
+            exit(1)
 
-        # messages...
-        messages = message_manager.find_for_topic(cmd.path, start, end, cmd.pause)
+        # history...
+        if not history.open():
+            exit(1)
 
-        for message in messages:
-            document = message if cmd.include_wrapping else message.payload.content
-            print(JSONify.dumps(document))
+        history.run()
 
         if cmd.verbose:
-            print("total: %d" % len(messages), file=sys.stderr)
+            print("total: %d" % history.count, file=sys.stderr)
+
+            print(pool, file=sys.stderr)
+            print(limiter, file=sys.stderr)
+
+            if cache:
+                print(cache, file=sys.stderr)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -118,5 +170,12 @@ if __name__ == '__main__':
         if cmd.verbose:
             print("osio_topic_history: KeyboardInterrupt", file=sys.stderr)
 
+            if history is not None and history.follower:
+                print(history.follower, file=sys.stderr)
+
     except Exception as ex:
         print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+    finally:
+        if history is not None:
+            history.close()
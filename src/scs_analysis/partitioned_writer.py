@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The partitioned_writer utility is used to store a stream of publications - such as the output of the aws_mqtt_client
+or osio_mqtt_client - in a hierarchy of JSON lines files, with one file per topic per day:
+
+ROOT/TOPIC/YYYY/MM/DD.jsonl
+
+The day is given by the rec field of the publication's payload, in the timezone of the rec field. Payloads without a
+rec field are stored under the host's current date. Payloads are appended to existing files.
+
+Files are held open in a least-recently-used pool, and are written with large buffers. Each file is fsynced when it is
+closed, either on eviction from the pool or on exit.
+
+EXAMPLES
+./aws_mqtt_client.py south-coast-science-dev/production-test/loc/1/gases \
+south-coast-science-dev/production-test/loc/1/climate | ./partitioned_writer.py ~/SCS/archive -v
+
+SEE ALSO
+scs_analysis/aws_mqtt_client
+scs_analysis/osio_mqtt_client
+"""
+
+import json
+import sys
+import time
+
+from collections import OrderedDict
+
+from scs_analysis.archive.file_pool import FilePool
+from scs_analysis.archive.partitioned_writer import PartitionedWriter
+from scs_analysis.cmd.cmd_partitioned_writer import CmdPartitionedWriter
+
+from scs_core.data.json import JSONify
+from scs_core.data.publication import Publication
+
+from scs_core.sys.exception_report import ExceptionReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    writer = None
+    count = 0
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdPartitionedWriter()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print(cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        writer = PartitionedWriter(cmd.root, FilePool(cmd.max_files))
+
+        if cmd.verbose:
+            print(writer, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        for line in sys.stdin:
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+                publication = Publication.construct_from_jdict(jdict) if isinstance(jdict, dict) else None
+
+            except (ValueError, KeyError, TypeError, AttributeError):
+                publication = None
+
+            if publication is None:
+                print("partitioned_writer: bad datum: %s" % line.strip(), file=sys.stderr)
+                sys.stderr.flush()
+                continue
+
+            payload = publication.payload
+            rec = payload.get('rec') if isinstance(payload, dict) else None
+
+            document = publication if cmd.include_wrapping else payload
+
+            try:
+                writer.write(publication.topic, rec, JSONify.dumps(document), time.strftime('%Y-%m-%d').split('-'))
+
+            except (ValueError, TypeError):
+                print("partitioned_writer: bad topic: %s" % line.strip(), file=sys.stderr)
+                sys.stderr.flush()
+                continue
+
+            count += 1
+
+            if cmd.echo:
+                print(line.strip())
+                sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("partitioned_writer: KeyboardInterrupt", file=sys.stderr)
+
+    except Exception as ex:
+        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # close...
+
+    finally:
+        if writer is not None:
+            writer.close()
+
+            if cmd.verbose:
+                print(writer, file=sys.stderr)
+                print("total: %d" % count, file=sys.stderr)
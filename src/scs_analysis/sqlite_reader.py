@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The sqlite_reader utility is used to retrieve documents stored by the sqlite_writer utility. Documents may be selected
+by topic, and by start and / or end localised date / times; they are presented on stdout in rec order, exactly as they
+were stored. Selections use the database indexes, so that only the matching documents are read.
+
+If the wrapping flag is set, each document is presented as a publication, with its topic. Documents that were stored
+without a topic cannot be presented as publications; they are skipped, and their number is written to stderr.
+
+The database is opened read-only: the sqlite_reader does not create it, or change its schema, journal mode or contents.
+(As with any reader of a write-ahead log, SQLite may create the database's -wal and -shm files.)
+
+EXAMPLES
+./sqlite_reader.py ~/SCS/samples.db -t south-coast-science-dev/production-test/loc/1/gases -s 2017-10-01T00:00:00Z
+
+./sqlite_reader.py ~/SCS/samples.db -l
+
+SEE ALSO
+scs_analysis/sqlite_writer
+"""
+
+import json
+import os
+import sys
+
+from scs_analysis.archive.sample_database import SampleDatabase
+from scs_analysis.cmd.cmd_sqlite_reader import CmdSQLiteReader
+
+from scs_core.data.json import JSONify
+from scs_core.sys.exception_report import ExceptionReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    database = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdSQLiteReader()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print(cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        if not os.path.exists(cmd.filename):
+            print("Database not available: %s" % cmd.filename, file=sys.stderr)
+            exit(1)
+
+        database = SampleDatabase(cmd.filename)
+        database.connect(read_only=True)
+
+        if cmd.verbose:
+            print(database, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        if cmd.list:
+            for topic in database.topics():
+                print(topic)
+
+            exit(0)
+
+        start = None if cmd.start is None else round(cmd.start.timestamp() * 1000)
+        end = None if cmd.end is None else round(cmd.end.timestamp() * 1000)
+
+        count = 0
+        untopiced = 0
+
+        for topic, _, document in database.find(cmd.topic, start, end):
+            if cmd.include_wrapping:
+                # a publication needs a topic...
+                if topic is None:
+                    untopiced += 1
+                    continue
+
+                print('{' + json.dumps(topic) + ': ' + document + '}')
+            else:
+                print(document)
+
+            count += 1
+
+        sys.stdout.flush()
+
+        if untopiced:
+            print("sqlite_reader: documents without a topic not presented: %d" % untopiced, file=sys.stderr)
+
+        if cmd.verbose:
+            print("total: %d" % count, file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("sqlite_reader: KeyboardInterrupt", file=sys.stderr)
+
+    except Exception as ex:
+        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # close...
+
+    finally:
+        if database is not None:
+            database.close()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The sqlite_writer utility is used to store a stream of JSON documents in a SQLite database, for indexed retrieval by
+the sqlite_reader utility. Input may be either documents, which are stored under the given topic, or publications -
+such as the output of the aws_mqtt_client - whose payloads are stored under their own topics.
+
+Documents are indexed by topic and by their rec field. Documents without a valid rec field are stored, but can only be
+retrieved by topic.
+
+Documents are committed in batched transactions: when BATCH documents are pending, or when the oldest has waited
+FLUSH seconds, whichever comes first, so that a slow stream is not held back. The database uses write-ahead logging,
+so that it may be queried while the sqlite_writer is running. An existing database is appended to.
+
+EXAMPLES
+./aws_mqtt_client.py south-coast-science-dev/production-test/loc/1/gases | ./sqlite_writer.py ~/SCS/samples.db -p
+
+./csv_reader.py gases.csv.gz | \
+./sqlite_writer.py ~/SCS/samples.db -t south-coast-science-dev/production-test/loc/1/gases
+
+SEE ALSO
+scs_analysis/sqlite_reader
+"""
+
+import json
+import sys
+
+from collections import OrderedDict
+
+from scs_analysis.archive.sample_database import SampleDatabase
+from scs_analysis.cmd.cmd_sqlite_writer import CmdSQLiteWriter
+
+from scs_core.data.json import JSONify
+from scs_core.data.localized_datetime import LocalizedDatetime
+from scs_core.data.publication import Publication
+
+from scs_core.sys.exception_report import ExceptionReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    database = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdSQLiteWriter()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print(cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        database = SampleDatabase(cmd.filename, cmd.batch, cmd.flush)
+        database.connect()
+
+        if cmd.verbose:
+            print(database, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        for line in sys.stdin:
+            datum = line.strip()
+
+            try:
+                jdict = json.loads(datum, object_pairs_hook=OrderedDict)
+            except ValueError:
+                continue
+
+            if cmd.publications:
+                publication = Publication.construct_from_jdict(jdict)
+
+                if publication is None:
+                    continue
+
+                topic = publication.topic
+                payload = publication.payload
+                document = JSONify.dumps(payload)
+
+            else:
+                topic = cmd.topic
+                payload = jdict
+                document = datum
+
+            # rec...
+            rec = payload.get('rec') if isinstance(payload, dict) else None
+            localised = LocalizedDatetime.construct_from_iso8601(rec) if isinstance(rec, str) else None
+
+            database.write(topic, None if localised is None else round(localised.timestamp() * 1000), document)
+
+            if cmd.echo:
+                print(datum)
+                sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("sqlite_writer: KeyboardInterrupt", file=sys.stderr)
+
+    except Exception as ex:
+        print(JSONify.dumps(ExceptionReport.construct(ex)), file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # close...
+
+    finally:
+        if database is not None:
+            database.close()
+
+            if cmd.verbose:
+                print(database, file=sys.stderr)
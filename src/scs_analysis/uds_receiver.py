@@ -23,7 +23,8 @@ scs_analysis/
 
 
 
-Writes socket stream to stdout.
+Writes socket stream to stdout. Messages are split at newlines, so that writers that keep their connection open - such
+as aws_mqtt_client and osio_mqtt_client - are read, as well as writers that make a connection for each message.
 
 command line example:
 ./uds_receiver.py particulates.uds
@@ -32,12 +33,11 @@ command line example:
 import sys
 
 from scs_analysis.cmd.cmd_uds import CmdUDS
+from scs_analysis.comms.uds_reader import UDSReader
 
 from scs_core.data.json import JSONify
 from scs_core.sys.exception_report import ExceptionReport
 
-from scs_host.comms.domain_socket import DomainSocket
-
 
 # --------------------------------------------------------------------------------------------------------------------
 
@@ -59,7 +59,7 @@ if __name__ == '__main__':
     # ----------------------------------------------------------------------------------------------------------------
     # resources...
 
-    uds = DomainSocket(cmd.path)
+    uds = UDSReader(cmd.path)
 
     if cmd.verbose:
         print(uds, file=sys.stderr)
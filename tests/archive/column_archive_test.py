@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import tempfile
+
+from collections import OrderedDict
+
+from scs_analysis.archive.column_archive_reader import ColumnArchiveReader
+from scs_analysis.archive.column_archive_writer import ColumnArchiveWriter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+directory = tempfile.mkdtemp()
+print(directory)
+
+print("-")
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+writer = ColumnArchiveWriter(directory, chunk_size=4)
+print(writer)
+print("=")
+
+for i in range(10):
+    jdict = OrderedDict([('rec', None), ('val', OrderedDict([('hmd', 50 + i), ('tmp', 20.0 + i / 10)]))])
+
+    if i > 5:
+        jdict['val']['pres'] = 101.3
+
+    writer.write(1507284000000 + i * 10000, jdict)
+
+writer.close()
+
+print(writer)
+print("-")
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+reader = ColumnArchiveReader(directory)
+print(reader)
+print("=")
+
+print("rec: %s" % reader.rec())
+print("val.tmp: %s" % reader.column('val.tmp'))
+print("-")
+
+for rec, jdict in reader.rows(1507284020000, 1507284080000):
+    print("%s: %s" % (rec, jdict))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Writes documents for more topics and days than a small FilePool can hold open, in a random order, so that files are
+evicted and re-opened for append many times. Every file should hold all of its lines, in the order written.
+"""
+
+import json
+import os
+import random
+import tempfile
+
+from collections import OrderedDict
+
+from scs_analysis.archive.file_pool import FilePool
+from scs_analysis.archive.partitioned_writer import PartitionedWriter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+DOCUMENTS = 20000
+TOPICS = ["org/loc/%d/gases" % i for i in range(8)]
+DAYS = ["2026-10-%02d" % day for day in range(17, 20)]
+
+
+root = tempfile.mkdtemp()
+
+pool = FilePool(max_open=4, buffer_size=4096)
+writer = PartitionedWriter(root, pool)
+
+expected = OrderedDict()                                # dict of filename: list of string
+
+for i in range(DOCUMENTS):
+    topic = random.choice(TOPICS)
+    rec = "%sT12:00:00Z" % random.choice(DAYS)
+
+    jstr = json.dumps(OrderedDict([('rec', rec), ('seq', i)]))
+    filename = writer.write(topic, rec, jstr, None)
+
+    expected.setdefault(filename, []).append(jstr)
+
+print(pool)
+
+writer.close()
+
+print("files: %d open: %d" % (len(expected), len(pool)))
+print("-")
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+lost = 0
+reordered = 0
+
+for filename, lines in expected.items():
+    with open(filename) as f:
+        written = f.read().splitlines()
+
+    lost += len(lines) - len(written)
+
+    if written != lines:
+        reordered += 1
+
+print("evicted: %s re-opened: %s" % (pool.evict_count, pool.open_count - len(expected)))
+print("lost: %d files out of order: %d" % (lost, reordered))
+print("ok: %s" % (lost == 0 and reordered == 0 and pool.evict_count > 0))
+
+print("example: %s" % os.path.relpath(next(iter(expected)), root))
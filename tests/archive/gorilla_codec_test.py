@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Encodes and decodes a million points of two series, and compares the size of each encoding with that of gzip of the raw
+arrays.
+"""
+
+import gzip
+import time
+
+import numpy as np
+
+from scs_analysis.archive.gorilla_codec import GorillaCodec
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def run(name, timestamps, values):
+    count = len(timestamps)
+
+    print("%s: count: %d" % (name, count))
+
+    start = time.time()
+    encoded = GorillaCodec.encode(timestamps, values)
+    print("encode: %0.3f sec" % (time.time() - start))
+
+    start = time.time()
+    decoded_timestamps, decoded_values = GorillaCodec.decode(encoded)
+    elapsed = time.time() - start
+    print("decode: %0.3f sec (%0.1f million points per second)" % (elapsed, count / elapsed / 1e6))
+
+    print("timestamps equal: %s" % np.array_equal(timestamps, decoded_timestamps))
+    print("values equal: %s" % np.array_equal(values.view(np.uint64), decoded_values.view(np.uint64)))
+
+    raw = timestamps.astype('<i8').tobytes() + values.astype('<f8').tobytes()
+    gzipped = gzip.compress(raw)
+
+    print("raw: %d" % len(raw))
+    print("gzip: %d (%0.2f bits per point)" % (len(gzipped), len(gzipped) * 8 / count))
+    print("gorilla: %d (%0.2f bits per point)" % (len(encoded), len(encoded) * 8 / count))
+    print("gorilla / gzip: %0.3f" % (len(encoded) / len(gzipped)))
+    print("-")
+
+
+COUNT = 1000000
+
+# 10-second timestamps with jitter, and a random walk rounded to one decimal place...
+run("jittered random walk",
+    1507284000000 + np.cumsum(np.full(COUNT, 10000) + np.random.randint(-50, 50, COUNT)),
+    np.round(20.0 + np.cumsum(np.random.normal(0.0, 0.02, COUNT)), 1))
+
+# regular timestamps, and a value that changes about once in a hundred points...
+run("regular, slowly changing",
+    1507284000000 + np.arange(COUNT, dtype=np.int64) * 10000,
+    np.repeat(np.round(20.0 + np.cumsum(np.random.normal(0.0, 0.5, COUNT // 100)), 1), 100))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Publishes to a simulated broker with a fixed round trip, with windows of increasing size. Publications should be
+completed in order within each topic, and the elapsed time should fall as the window grows, up to the number of
+topics.
+"""
+
+import threading
+import time
+
+from collections import OrderedDict
+
+from scs_analysis.client.async_publisher import AsyncPublisher
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakePublication(object):
+
+    def __init__(self, topic, seq):
+        self.topic = topic
+        self.seq = seq
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+TOPICS = ["loc/1/gases", "loc/1/particulates", "loc/1/climate", "loc/1/status",
+          "loc/2/gases", "loc/2/particulates", "loc/2/climate", "loc/2/status"]
+
+PUBLICATIONS = 40                           # per topic
+ROUND_TRIP = 0.01                           # seconds
+
+
+def run(window):
+    lock = threading.Lock()
+    broker = OrderedDict((topic, []) for topic in TOPICS)
+    completed = OrderedDict((topic, []) for topic in TOPICS)
+
+    def publish(publication):
+        time.sleep(ROUND_TRIP)
+
+        with lock:
+            broker[publication.topic].append(publication.seq)
+
+        return True
+
+    def published(publication, success, ex):
+        completed[publication.topic].append(publication.seq)
+
+    publisher = AsyncPublisher(publish, window, published)
+    publisher.start()
+
+    t0 = time.time()
+
+    for seq in range(PUBLICATIONS):
+        for topic in TOPICS:
+            publisher.submit(FakePublication(topic, seq))
+
+    publisher.flush()
+    elapsed = time.time() - t0
+
+    publisher.close()
+
+    expected = list(range(PUBLICATIONS))
+    in_order = all(broker[topic] == expected and completed[topic] == expected for topic in TOPICS)
+
+    print(publisher)
+    print("window: %2d elapsed: %0.2f s (%0.1f publications per round trip) in order: %s" %
+          (window, elapsed, len(TOPICS) * PUBLICATIONS * ROUND_TRIP / elapsed, in_order))
+    print("-")
+
+
+for test_window in (1, 2, 4, 8, 16):
+    run(test_window)
+
+
+# a callback that raises...
+def failing_callback(publication, success, ex):
+    raise ValueError("callback failed for seq %d" % publication.seq)
+
+
+failing = AsyncPublisher(lambda publication: True, 2, failing_callback)
+failing.start()
+
+for test_seq in range(3):
+    failing.submit(FakePublication(TOPICS[0], test_seq))
+
+failing.flush()
+failing.close()
+
+print(failing)
+print("callback errors reported: %s" % (failing.callback_error_count == 3))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Compares the time per request of a new HTTPS connection per request, a pool with no idle connections - so that each
+request makes a new connection, but resumes the TLS session - and a keep-alive pool, against a local stand-in server
+with a self-signed certificate. Responses are gzip-encoded.
+
+requires openssl on the path, to make the certificate
+"""
+
+import gzip
+import http.client
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from scs_analysis.client.http_connection_pool import HTTPConnectionPool
+from scs_analysis.client.pooled_http_client import PooledHTTPClient
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+REQUESTS = 200
+
+BODY = json.dumps({'messages': [{'rec': i, 'val': i % 7} for i in range(100)]}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        encoded = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = gzip.compress(BODY) if encoded else BODY
+
+        self.send_response(200)
+
+        if encoded:
+            self.send_header('Content-Encoding', 'gzip')
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+directory = tempfile.mkdtemp()
+certfile = os.path.join(directory, "cert.pem")
+keyfile = os.path.join(directory, "key.pem")
+
+subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+                "-keyout", keyfile, "-out", certfile], check=True, stderr=subprocess.DEVNULL)
+
+server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+server_context.load_cert_chain(certfile, keyfile)
+
+server = StandInServer(('127.0.0.1', 0), StandInHandler)
+server.socket = server_context.wrap_socket(server.socket, server_side=True)
+
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+host = "localhost:%d" % server.server_address[1]
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def connection_per_request():
+    # noinspection PyProtectedMember
+    context = ssl._create_unverified_context()
+
+    for _ in range(REQUESTS):
+        conn = http.client.HTTPSConnection(host, context=context)
+        conn.request("GET", "/messages")
+
+        json.loads(conn.getresponse().read().decode())
+        conn.close()
+
+
+def pooled(pool):
+    client = PooledHTTPClient(pool)
+    client.connect(host, verified=False)
+
+    for _ in range(REQUESTS):
+        json.loads(client.get("/messages", None, {}))
+
+    client.close()
+
+
+for name, run in (("connection per request", connection_per_request),
+                  ("pool, no keep-alive", lambda: pooled(HTTPConnectionPool(max_idle=0))),
+                  ("pool, keep-alive", lambda: pooled(HTTPConnectionPool()))):
+    t0 = time.time()
+    run()
+
+    print("%s: %0.2f ms per request" % (name, (time.time() - t0) * 1000 / REQUESTS))
+
+pool = HTTPConnectionPool(max_idle=0)
+pooled(pool)
+print(pool)
+
+pool = HTTPConnectionPool()
+pooled(pool)
+print(pool)
+
+server.shutdown()
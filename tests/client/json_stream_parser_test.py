@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Parses a large page in chunks, and compares the items, time and peak memory with those of decoding the whole page.
+"""
+
+import json
+import time
+import tracemalloc
+
+from collections import OrderedDict
+
+from scs_analysis.client.json_stream_parser import JSONStreamParser
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+ITEMS = 20000
+CHUNK_SIZE = 65536
+
+
+def page():
+    items = []
+
+    for i in range(ITEMS):
+        payload = OrderedDict([('rec', "2017-10-26T12:%02d:%02dZ" % (i // 60 % 60, i % 60)),
+                               ('val', OrderedDict([('NO2', OrderedDict([('weV', 0.31288 + i), ('cnc', "4.0")])),
+                                                    ('sht', OrderedDict([('hmd', 69.6), ('tmp', 22.3)]))])),
+                               ('tag', "scs-be2-\"2\"")])
+
+        items.append(OrderedDict([('device', "scs-bbe-002"), ('topic', "loc/1/gases"), ('payload', payload)]))
+
+    return json.dumps(OrderedDict([('Items', items), ('next', "https://host/topicMessages?startTime=x")]))
+
+
+def chunks(text):
+    for i in range(0, len(text), CHUNK_SIZE):
+        yield text[i:i + CHUNK_SIZE]
+
+
+text = page()
+print("page: %0.1f MB" % (len(text) / 1e6))
+print("-")
+
+expected = json.loads(text, object_pairs_hook=OrderedDict)
+
+
+# whole page...
+tracemalloc.start()
+t0 = time.time()
+
+count = sum(1 for _ in json.loads(''.join(chunks(text)), object_pairs_hook=OrderedDict)['Items'])
+
+elapsed = time.time() - t0
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+
+print("whole page: count: %d elapsed: %0.2f s peak: %0.1f MB" % (count, elapsed, peak / 1e6))
+
+
+# incremental...
+tracemalloc.start()
+t0 = time.time()
+
+parser = JSONStreamParser('Items')
+count = 0
+
+for chunk in chunks(text):
+    for item in parser.feed(chunk):
+        count += 1
+
+parser.close()
+
+elapsed = time.time() - t0
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+
+print("incremental: count: %d elapsed: %0.2f s peak: %0.1f MB" % (count, elapsed, peak / 1e6))
+print(parser)
+print("-")
+
+
+# equality, with one-character chunks...
+parser = JSONStreamParser('Items')
+items = []
+
+for char in text[:200000]:
+    items.extend(parser.feed(char))
+
+print("items equal: %s" % (items == expected['Items'][:len(items)]))
+print("fields equal: %s" % (parser.fields == OrderedDict() and not parser.complete))
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A local HTTP server stands in for a rate-limited API: it allows QUOTA requests per second, and responds to any others
+with 429 Too Many Requests and a Retry-After header.
+
+A second server resets the connection once it has read a request, or closes it once it has responded. Its hits are
+counted: a POST must reach it only once, whether or not it fails, and a GET is retried.
+"""
+
+import http.client
+import socket
+import struct
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from scs_analysis.client.rate_limiter import RateLimiter
+from scs_analysis.client.http_connection_pool import HTTPConnectionPool
+from scs_analysis.client.pooled_http_client import PooledHTTPClient
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+QUOTA = 10
+REQUESTS = 60
+
+lock = threading.Lock()
+window = [0, 0]                                         # second, count
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        with lock:
+            second = int(time.time())
+
+            if window[0] != second:
+                window[0], window[1] = second, 0
+
+            window[1] += 1
+            allowed = window[1] <= QUOTA
+
+        body = b'{}' if allowed else b'{"message": "rate limit exceeded"}'
+
+        self.send_response(200 if allowed else 429)
+
+        if not allowed:
+            self.send_header('Retry-After', '1')
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+server = StandInServer(('127.0.0.1', 0), StandInHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+host = "127.0.0.1:%d" % server.server_address[1]
+
+
+def run(client_count):
+    pool = HTTPConnectionPool()
+    clients = []
+
+    for _ in range(client_count):
+        client = PooledHTTPClient(pool, limiter)
+        client.connect(host, secure=False)
+        clients.append(client)
+
+    def work(client):
+        for _ in range(REQUESTS // client_count):
+            client.get('/messages', None, {})
+
+    threads = [threading.Thread(target=work, args=(client, )) for client in clients]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    for client in clients:
+        client.close()
+
+    print(pool)
+    pool.close()
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+for max_rate in (QUOTA / 2, QUOTA * 4):
+    limiter = RateLimiter(max_rate)
+    print(limiter)
+
+    t0 = time.time()
+    run(4)
+
+    print("elapsed: %0.1f" % (time.time() - t0))
+    print(limiter)
+    print("-")
+
+server.shutdown()
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+hits = {}                                               # dict of (method, path): int
+
+
+def serve(listener):
+    while True:
+        connection, _ = listener.accept()
+        request = b''
+
+        while b'\r\n\r\n' not in request:
+            request += connection.recv(4096)
+
+        method, path = request.split(b' ')[:2]
+        key = (method.decode(), path.decode())
+
+        with lock:
+            hits[key] = hits.get(key, 0) + 1
+
+        if path == b'/reset':
+            connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        else:
+            connection.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+            time.sleep(0.1)
+
+        connection.close()
+
+
+reset_listener = socket.socket()
+reset_listener.bind(('127.0.0.1', 0))
+reset_listener.listen(8)
+threading.Thread(target=serve, args=(reset_listener, ), daemon=True).start()
+
+reset_pool = HTTPConnectionPool()
+reset_client = PooledHTTPClient(reset_pool, max_retries=2)
+reset_client.connect("127.0.0.1:%d" % reset_listener.getsockname()[1], secure=False)
+
+for method, call in (('POST', lambda path: reset_client.post(path, '{}', {})),
+                     ('GET', lambda path: reset_client.get(path, None, {}))):
+    # reset...
+    try:
+        call('/reset')
+        outcome = "returned"
+
+    except (OSError, http.client.HTTPException) as ex:
+        outcome = ex.__class__.__name__
+
+    print("%s reset: %s hits: %d" % (method, outcome, hits.get((method, '/reset'), 0)))
+
+    # closed by the server while idle in the pool...
+    call('/closed')
+    time.sleep(0.5)
+    call('/closed')
+
+    print("%s closed: hits: %d" % (method, hits.get((method, '/closed'), 0)))
+
+print(reset_pool)
+print("POST sent once: %s" % (hits[('POST', '/reset')] == 1))
+print("GET retried: %s" % (hits[('GET', '/reset')] == 3))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Several processes draw from one token bucket - their aggregate rate should not exceed max_rate.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+
+from scs_analysis.client.rate_limiter import RateLimiter
+from scs_analysis.client.shared_limiter_store import SharedLimiterStore
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MAX_RATE = 20.0
+PROCESSES = 4
+REQUESTS = 25                                           # per process
+
+filename = os.path.join(tempfile.mkdtemp(), "test.state")
+
+
+def work(queue):
+    limiter = RateLimiter(MAX_RATE, burst=1, store=SharedLimiterStore(filename))
+
+    for _ in range(REQUESTS):
+        limiter.acquire()
+        queue.put(time.time())
+
+    limiter.close()
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+queue = multiprocessing.Queue()
+processes = [multiprocessing.Process(target=work, args=(queue, )) for _ in range(PROCESSES)]
+
+t0 = time.time()
+
+for process in processes:
+    process.start()
+
+times = sorted(queue.get() for _ in range(PROCESSES * REQUESTS))
+
+for process in processes:
+    process.join()
+
+print("requests: %d" % len(times))
+print("aggregate rate: %0.1f (max_rate: %0.1f)" % ((len(times) - 1) / (times[-1] - times[0]), MAX_RATE))
+
+limiter = RateLimiter(MAX_RATE, store=SharedLimiterStore(filename))
+print(limiter)
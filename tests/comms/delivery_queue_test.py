@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Puts a burst of items on a DeliveryQueue whose consumer is slow, under each policy. The producer should be held up
+only by the block policy, and items should be lost only by the drop policies.
+"""
+
+import time
+
+from scs_analysis.comms.delivery_queue import DeliveryQueue
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+ITEMS = 2000
+MAX_LENGTH = 100
+
+DELIVERY_TIME = 0.001                       # seconds per item
+
+
+def run(policy):
+    delivered = []
+
+    def deliver(batch):
+        time.sleep(DELIVERY_TIME * len(batch))
+        delivered.extend(batch)
+
+    queue = DeliveryQueue(deliver, policy, MAX_LENGTH, policy, max_batch=10)
+    queue.start()
+
+    t0 = time.time()
+
+    for i in range(ITEMS):
+        queue.put(i)
+
+    put_time = time.time() - t0
+
+    queue.close()
+
+    print(queue)
+    print("%s: put time: %0.3f s delivered: %d in order: %s last: %s" %
+          (policy, put_time, len(delivered), delivered == sorted(delivered), delivered[-1]))
+    print("-")
+
+
+for policy in DeliveryQueue.POLICIES:
+    run(policy)
+
+
+# failures - reported on stderr, and counted...
+def failing_deliver(batch):
+    if batch[0] % 20 == 0:
+        raise OSError("no route for %d" % batch[0])
+
+queue = DeliveryQueue(failing_deliver, 'failing', max_batch=10)
+queue.start()
+
+for i in range(100):
+    queue.put(i)
+    time.sleep(0.0005)
+
+queue.close()
+
+print(queue)
+print("delivered + failed: %d" % (queue.delivered_count + queue.fail_count))
+print("-")
+
+
+# close - the items that cannot be delivered in time are dropped, and reported...
+def stalled_deliver(batch):
+    time.sleep(10.0)
+
+queue = DeliveryQueue(stalled_deliver, 'stalled', max_batch=1)
+queue.start()
+
+for i in range(10):
+    queue.put(i)
+
+t0 = time.time()
+queue.close()
+
+print(queue)
+print("close: %0.1f s dropped: %d" % (time.time() - t0, queue.drop_count))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Checks the percentiles of a LatencyHistogram against exact percentiles of the same values, then times the recording
+of latencies by LatencyStats, and saves the statistics to a file.
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+
+from scs_analysis.comms.latency_histogram import LatencyHistogram
+from scs_analysis.comms.latency_stats import LatencyStats
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+VALUES = 100000
+MESSAGES = 100000
+
+
+# histogram...
+latencies = [random.lognormvariate(-1.0, 1.5) for _ in range(VALUES)]
+
+histogram = LatencyHistogram()
+
+for latency in latencies:
+    histogram.record(latency)
+
+histogram.record(-0.5)
+
+ordered = sorted(latencies)
+
+for percentile in LatencyHistogram.PERCENTILES:
+    exact = ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100.0))]
+    held = histogram.percentile(percentile)
+    error = abs(held - exact) / exact
+
+    print("p%g: exact: %0.3f held: %0.3f error: %0.1f%% %s" %
+          (percentile, exact, held, error * 100, "ok" if error < 0.04 else "FAIL"))
+
+print(histogram)
+print("-")
+
+
+# rec...
+for rec in ("2026-10-19T12:00:00Z", "2026-10-19T12:00:00.123+01:00", "2026-10-19T12:00:00.12Z", "2026-10-19T12:00:00",
+            "nonsense", None):
+    print("%s: %s" % (rec, LatencyStats.rec_timestamp(rec)))
+
+print("raw: %s" % LatencyStats.raw_rec(b'{"rec": "2026-10-19T12:00:00Z", "val": {"NO2": {"cnc": 4.0}}}'))
+print("-")
+
+
+# stats...
+filename = os.path.join(tempfile.mkdtemp(), "latency.json")
+stats = LatencyStats(filename, 0.5)
+stats.start()
+
+topics = ["org/dev/loc/%d/gases" % i for i in range(10)]
+now = time.time()
+recs = [LocalizedDatetime.construct_from_timestamp(now - random.uniform(0.1, 2.0)).as_iso8601() for _ in range(1000)]
+
+t0 = time.time()
+
+for i in range(0, MESSAGES, 100):
+    received = time.time()
+    stats.record([(topics[j % len(topics)], recs[(i + j) % len(recs)], received, received + 0.002)
+                  for j in range(100)])
+
+elapsed = time.time() - t0
+
+print("recorded: %d in %0.2f s (%0.2f us per message)" % (MESSAGES, elapsed, elapsed * 1e6 / MESSAGES))
+
+time.sleep(1.0)
+stats.close()
+
+with open(filename) as f:
+    jdict = json.load(f)
+
+topic = jdict['topics'][topics[0]]
+
+print("saved: topics: %d count: %s receive: %s" % (len(jdict['topics']), topic['count'], topic['receive']))
+print(stats)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Spools messages while the "broker" is down, stops and reopens the spool part way through draining, then drains the
+rest. Every message should be read at least once, in order, with only the messages in flight at the stop read twice.
+A small spool is then overfilled, and the oldest messages should be dropped.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from scs_analysis.comms.publication_spool import PublicationSpool
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MESSAGES = 5000
+IN_FLIGHT = 8
+
+MESSAGE = '{"topic": "loc/1/gases", "payload": {"seq": %d}}'
+
+
+def drain(spool, received, stop_after=None):
+    in_flight = []
+
+    def run():
+        for message, position in spool.read():
+            received.append(message)
+            in_flight.append(position)
+
+            # acknowledge all but the last IN_FLIGHT...
+            while len(in_flight) > IN_FLIGHT:
+                spool.acknowledge(in_flight.pop(0))
+
+            if stop_after is not None and len(received) >= stop_after:
+                break
+
+            if len(received) == MESSAGES:
+                for remaining in in_flight:
+                    spool.acknowledge(remaining)
+
+                break
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    return thread
+
+
+directory = os.path.join(tempfile.mkdtemp(), "spool")
+
+# outage - messages are spooled...
+spool = PublicationSpool(directory, segment_size=64 * 1024)
+spool.open()
+
+t0 = time.time()
+
+for i in range(MESSAGES):
+    spool.append(MESSAGE % i)
+
+print("append: %0.1f us per message" % ((time.time() - t0) * 1e6 / MESSAGES))
+print(spool)
+
+# partial drain, then restart...
+first = []
+drain(spool, first, stop_after=MESSAGES // 2).join()
+spool.close()
+
+print(spool)
+
+spool = PublicationSpool(directory, segment_size=64 * 1024)
+spool.open()
+
+second = []
+thread = drain(spool, second)
+
+while len(second) < MESSAGES - MESSAGES // 2 + IN_FLIGHT and thread.is_alive():
+    time.sleep(0.01)
+
+spool.close()
+thread.join()
+
+print(spool)
+
+seqs = [int(message.split(': ')[-1].rstrip('}')) for message in first + second]
+
+print("read: %d unique: %d repeated: %d in order after restart: %s" %
+      (len(seqs), len(set(seqs)), len(seqs) - len(set(seqs)), seqs[len(first):] == sorted(seqs[len(first):])))
+print("segments left: %s" % sorted(os.listdir(directory)))
+print("-")
+
+# overflow...
+directory = os.path.join(tempfile.mkdtemp(), "spool")
+
+spool = PublicationSpool(directory, max_size=256 * 1024, segment_size=32 * 1024, sync=PublicationSpool.SYNC_NEVER)
+spool.open()
+
+for i in range(MESSAGES * 2):
+    spool.append(MESSAGE % i)
+
+received = []
+thread = drain(spool, received)
+
+while spool.read_count + spool.drop_count < MESSAGES * 2:
+    time.sleep(0.01)
+
+spool.close()
+thread.join()
+
+print(spool)
+print("first read: %s" % received[0])
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Changes the routes of a TopicRouter through a RouteControl socket, while messages are being routed, and checks that
+each change takes effect without interrupting the messages on other routes. Subscriptions are then changed through
+the socket, with stand-in subscribe and unsubscribe functions, and refused by a control that has none.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from scs_analysis.comms.route_control import RouteControl
+from scs_analysis.comms.topic_router import TopicRouter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ListSink(object):
+    """
+    classdocs
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.messages = []
+
+    def write(self, message):
+        self.messages.append(message)
+
+    def __str__(self, *args, **kwargs):
+        return "ListSink:{spec:%s, messages:%d}" % (self.spec, len(self.messages))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+print("covers...")
+
+for topic_filter, other, expected in (('#', 'a/b', True), ('a/#', 'a', True), ('a/+', 'a/b', True),
+                                      ('a/+', 'a/#', False), ('a/+/c', 'a/b/+', False), ('+/b', '$SYS/b', False),
+                                      ('#', '$SYS/#', False), ('a/b', 'a/b/c', False), ('a/b/c', 'a/b', False)):
+    print("%s covers %s: %s %s" % (topic_filter, other, TopicRouter.covers(topic_filter, other),
+                                   "ok" if TopicRouter.covers(topic_filter, other) == expected else "FAIL"))
+
+print("-")
+
+
+sinks = {}
+
+
+def sink(spec):
+    return sinks.setdefault(spec, ListSink(spec))
+
+
+def command(sock, jdict):
+    sock.sendall((json.dumps(jdict) + '\n').encode())
+
+    reply = b''
+
+    while not reply.endswith(b'\n'):
+        reply += sock.recv(4096)
+
+    return reply.decode().strip()
+
+
+directory = tempfile.mkdtemp()
+address = os.path.join(directory, "control.uds")
+
+router = TopicRouter()
+router.add('org/+/gases', sink('file:gases.jsonl'))
+
+changes = []
+
+
+def subscribe(topic):
+    if topic.startswith('refused/'):
+        raise OSError("subscribe: %s: refused" % topic)
+
+    changes.append(('subscribe', topic))
+
+
+def unsubscribe(topic):
+    changes.append(('unsubscribe', topic))
+
+
+control = RouteControl(address, router, sink, ['org/#'], subscribe=subscribe, unsubscribe=unsubscribe)
+control.start()
+
+while not os.path.exists(address):
+    time.sleep(0.01)
+
+running = True
+
+
+def route_messages():
+    while running:
+        for topic in ('org/1/gases', 'org/1/climate'):
+            for routed in router.match(topic):
+                routed.write(topic)
+
+        time.sleep(0.0001)
+
+
+thread = threading.Thread(target=route_messages, daemon=True)
+thread.start()
+
+client = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+client.connect(address)
+
+time.sleep(0.1)
+print(command(client, {"cmd": "route", "topic": "org/+/climate", "sink": "uds:/tmp/climate.uds"}))
+time.sleep(0.1)
+print(command(client, {"cmd": "route", "topic": "other/#", "sink": "stdout"}))
+print(command(client, {"cmd": "routes"}))
+print(command(client, {"cmd": "unroute", "topic": "org/+/climate", "sink": "uds:/tmp/climate.uds"}))
+print(command(client, {"cmd": "unroute", "topic": "org/+/climate", "sink": "uds:/tmp/climate.uds"}))
+print(command(client, {"cmd": "route", "topic": "org/#/climate", "sink": "stdout"}))
+print(command(client, {"cmd": "restart"}))
+time.sleep(0.1)
+print("-")
+
+print(command(client, {"cmd": "route", "topic": "other/+/gases", "sink": "stdout"}))
+print(command(client, {"cmd": "subscribe", "topic": "other/#"}))
+print(command(client, {"cmd": "subscribe", "topic": "other/#"}))
+print(command(client, {"cmd": "route", "topic": "other/+/climate", "sink": "stdout"}))
+print(command(client, {"cmd": "subscribe", "topic": "refused/#"}))
+print(command(client, {"cmd": "subscribe", "topic": "org/#/gases"}))
+print(command(client, {"cmd": "subscriptions"}))
+print(command(client, {"cmd": "unsubscribe", "topic": "other/#"}))
+print(command(client, {"cmd": "unsubscribe", "topic": "other/#"}))
+print(command(client, {"cmd": "subscriptions"}))
+print("changes: %s" % changes)
+
+running = False
+thread.join()
+
+client.close()
+control.close()
+
+print("-")
+
+gases = sinks['file:gases.jsonl'].messages
+climate = sinks['uds:/tmp/climate.uds'].messages
+climate_count = len(climate)
+
+print("gases: %d climate: %d" % (len(gases), climate_count))
+print("climate routed only while its route existed: %s" % (0 < climate_count < len(gases)))
+print("socket removed: %s" % (not os.path.exists(address)))
+print(control)
+print("-")
+
+fixed_address = os.path.join(directory, "fixed.uds")
+
+fixed = RouteControl(fixed_address, TopicRouter(), sink, ['org/#'])
+fixed.start()
+
+while not os.path.exists(fixed_address):
+    time.sleep(0.01)
+
+client = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+client.connect(fixed_address)
+
+print(command(client, {"cmd": "subscribe", "topic": "other/#"}))
+print(command(client, {"cmd": "subscriptions"}))
+
+client.close()
+fixed.close()
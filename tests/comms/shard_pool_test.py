@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A throughput benchmark: messages for several hundred topics are routed to a file, with latency statistics, by one
+AWSMQTTHandler - as in one process - and by ShardPools of increasing size. Checks that each pool writes every message,
+with the messages of each topic in the order in which they were handled, and times every message.
+
+The wall-clock rates scale with the shards only where there are cores for the workers. The parent's CPU time per
+message - the work that is not sharded - is given for each pool: the rate of one process, multiplied by the ratio of
+the one-process CPU time to the parent's, is the most that any number of shards can reach.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from collections import namedtuple
+
+from scs_analysis.comms.aws_mqtt_handler import AWSMQTTHandler
+from scs_analysis.comms.latency_stats import LatencyStats
+from scs_analysis.comms.route_sink import RouteSink
+from scs_analysis.comms.shard_pool import ShardPool
+from scs_analysis.comms.topic_router import TopicRouter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MESSAGES = 50000
+TOPICS = ["south-coast-science-dev/production-test/loc/%d/gases" % i for i in range(300)]
+
+Message = namedtuple('Message', 'topic payload')
+
+
+def payload(i):
+    val = {gas: {"weV": 0.31288 + i % 7, "aeV": 0.25288, "weC": 0.00201, "cnc": 4.0 + i % 13}
+           for gas in ("NO2", "CO", "SO2", "H2S", "Ox", "NO")}
+
+    return json.dumps({"tag": "scs-ap1-6", "rec": "2026-10-19T12:00:00Z", "val": val, "seq": i}).encode()
+
+
+def file_router(filename):
+    sink = RouteSink.construct('file:' + filename)
+    sink.connect()
+
+    router = TopicRouter()
+    router.add('#', sink)
+
+    return router, sink
+
+
+def check(filename, stats):
+    last_seqs = {}
+    in_order = True
+    count = 0
+
+    with open(filename) as f:
+        for line in f:
+            (topic, document), = json.loads(line).items()
+
+            in_order = in_order and document['seq'] > last_seqs.get(topic, -1)
+            last_seqs[topic] = document['seq']
+            count += 1
+
+    timed = sum(topic_stats['count'] for topic_stats in stats.as_json()['topics'].values())
+
+    return "written: %d in topic order: %s timed: %d" % (count, in_order, timed)
+
+
+# the workers are spawned - they import this module...
+if __name__ == '__main__':
+    messages = [Message(TOPICS[i % len(TOPICS)], payload(i)) for i in range(MESSAGES)]
+    directory = tempfile.mkdtemp()
+
+    print("cpus: %s" % os.cpu_count())
+    print("-")
+
+    # one process...
+    filename = os.path.join(directory, "one.jsonl")
+    router, file_sink = file_router(filename)
+    stats = LatencyStats()
+
+    handler = AWSMQTTHandler(router, max_length=MESSAGES, policy='block', stats=stats)
+    handler.start()
+
+    t0, c0 = time.time(), time.process_time()
+
+    for message in messages:
+        handler.handle(None, None, message)
+
+    handler.close()
+
+    elapsed, cpu = time.time() - t0, time.process_time() - c0
+    one_rate, one_cpu = MESSAGES / elapsed, cpu / MESSAGES
+
+    file_sink.close()
+
+    print("one process: %0.0f messages per second, cpu: %0.1f us per message" % (one_rate, one_cpu * 1e6))
+    print(check(filename, stats))
+    print("-")
+
+    # pools...
+    for shards in sorted({1, 2, 4, min(8, os.cpu_count() or 1)}):
+        filename = os.path.join(directory, "shards-%d.jsonl" % shards)
+        router, file_sink = file_router(filename)
+        stats = LatencyStats()
+
+        pool = ShardPool(shards, router, stats=stats, max_length=MESSAGES, policy='block')
+        pool.start()
+
+        time.sleep(2.0)                                         # the workers are spawned
+
+        t0, c0 = time.time(), time.process_time()
+
+        for message in messages:
+            pool.handle(None, None, message)
+
+        pool.close()
+
+        elapsed, cpu = time.time() - t0, time.process_time() - c0
+        parent_cpu = cpu / MESSAGES
+
+        file_sink.close()
+
+        print("%d shards: %0.0f messages per second (x%0.2f), parent cpu: %0.1f us per message, ceiling: x%0.1f" %
+              (shards, MESSAGES / elapsed, MESSAGES / elapsed / one_rate, parent_cpu * 1e6, one_cpu / parent_cpu))
+        print(check(filename, stats))
+        print(pool)
+        print("-")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Drains a spool into a publisher whose broker is down, so that every publication fails. Nothing should be acknowledged,
+the drain should hold, and after a restart with the broker up, every message should be published, in order.
+"""
+
+import os
+import tempfile
+import time
+
+from scs_analysis.client.async_publisher import AsyncPublisher
+from scs_analysis.comms.publication_spool import PublicationSpool
+from scs_analysis.comms.spool_drain import SpoolDrain
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MESSAGES = 100
+
+MESSAGE = '{"topic": "loc/1/gases", "payload": {"seq": %d}}'
+
+SpoolDrain.RETRY_BASE = 0.01
+SpoolDrain.RETRY_MAX = 0.05
+
+
+class FakePublication(object):
+    @classmethod
+    def construct_from_jdict(cls, jdict):
+        return FakePublication(jdict['topic'], jdict['payload']['seq'])
+
+    def __init__(self, topic, seq):
+        self.topic = topic
+        self.seq = seq
+
+
+def run(directory, publish, duration=None, count=None):
+    spool = PublicationSpool(directory)
+    spool.open()
+
+    publisher = AsyncPublisher(publish, 4)
+    publisher.start()
+
+    drain = SpoolDrain(spool, publisher, FakePublication.construct_from_jdict)
+    drain.start()
+
+    deadline = time.time() + (10.0 if duration is None else duration)
+
+    while time.time() < deadline and (count is None or spool.acknowledged_count < count):
+        time.sleep(0.01)
+
+    drain.close()
+    publisher.close()
+    spool.close()
+    drain.join()
+
+    print(drain)
+    print(publisher)
+    print(spool)
+
+    return spool
+
+
+directory = os.path.join(tempfile.mkdtemp(), "spool")
+
+spool = PublicationSpool(directory)
+spool.open()
+
+for i in range(MESSAGES):
+    spool.append(MESSAGE % i)
+
+spool.close()
+
+
+# broker down...
+attempts = []
+
+
+def publish_down(publication):
+    attempts.append(publication.seq)
+    return False
+
+
+down = run(directory, publish_down, duration=0.5)
+
+print("attempts: %d acknowledged: %d" % (len(attempts), down.acknowledged_count))
+print("-")
+
+
+# restart, broker up...
+published = []
+
+
+def publish_up(publication):
+    published.append(publication.seq)
+    return True
+
+
+up = run(directory, publish_up, count=MESSAGES)
+
+print("published: %d all: %s in order: %s" %
+      (len(published), set(published) == set(range(MESSAGES)), published == sorted(published)))
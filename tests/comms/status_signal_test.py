@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Sends SIGUSR1 to this process while the main thread is writing to stderr. Every signal should be reported, by the
+status thread, and the main thread should not be interrupted part-way through a write.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+
+from scs_analysis.comms.status_signal import StatusSignal
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+SIGNALS = 20
+
+reporters = set()
+
+
+def report():
+    reporters.add(threading.current_thread().name)
+    print("status: %d" % len(reporters), file=sys.stderr)
+
+
+status = StatusSignal(report)
+status.start()
+
+print(status)
+
+devnull = open(os.devnull, 'w')
+errors = 0
+
+for _ in range(SIGNALS):
+    os.kill(os.getpid(), signal.SIGUSR1)
+
+    try:
+        for _ in range(1000):
+            print("main thread writing", file=devnull)
+
+    except RuntimeError:
+        errors += 1
+
+    time.sleep(0.02)
+
+status.close()
+
+print(status)
+print("reported: %d of %d on: %s reentrant errors: %d" % (status.report_count, SIGNALS, sorted(reporters), errors))
+
+# the previous handler is restored...
+print("handler restored: %s" % (signal.getsignal(signal.SIGUSR1) == signal.SIG_DFL))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Routes topics with MQTT wildcard filters, checks the result against a filter-by-filter match, and compares the time
+taken with the trie, and with its cache, against a scan of the filters.
+"""
+
+import random
+import time
+
+from scs_analysis.comms.topic_router import TopicRouter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def matches(topic_filter, topic):
+    filter_levels = topic_filter.split('/')
+    topic_levels = topic.split('/')
+
+    if topic.startswith('$') and filter_levels[0] in ('+', '#'):
+        return False
+
+    for i, level in enumerate(filter_levels):
+        if level == '#':
+            return True
+
+        if i >= len(topic_levels) or (level != '+' and level != topic_levels[i]):
+            return False
+
+    return len(filter_levels) == len(topic_levels)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+print("valid: %s" % [TopicRouter.is_valid_filter(f) for f in ('a/+/c', 'a/#', '#', '+', 'a/#/c', 'a/b+', '')])
+
+router = TopicRouter()
+
+router.add('a/b/c', 'exact')
+router.add('a/+/c', 'single')
+router.add('a/#', 'multi')
+router.add('#', 'all')
+router.add('+/+', 'two')
+router.add('a/+/c', 'exact')                            # a sink may have several routes
+
+for topic in ('a/b/c', 'a/x/c', 'a', 'a/b', 'b/c/d', '$SYS/a', 'a/b/c/d'):
+    print("%-8s %s" % (topic, router.match(topic)))
+
+print(router)
+print("-")
+
+# random routing tables...
+random.seed(1)
+
+LEVELS = ['org-%d' % i for i in range(4)] + ['device-%d' % i for i in range(20)] + ['gases', 'particulates', 'climate']
+
+filters = set()
+
+while len(filters) < 500:
+    depth = random.randint(1, 4)
+    levels = [random.choice(LEVELS + ['+'] * 3) for _ in range(depth)]
+
+    if random.random() < 0.2:
+        levels.append('#')
+
+    filters.add('/'.join(levels))
+
+filters = sorted(filters)
+
+router = TopicRouter()
+
+for sink_filter in filters:
+    router.add(sink_filter, sink_filter)                # each filter is its own sink
+
+topics = ['/'.join(random.choice(LEVELS) for _ in range(random.randint(1, 4))) for _ in range(2000)]
+
+correct = all(router.match(topic) == tuple(f for f in filters if matches(f, topic)) for topic in topics)
+
+print("filters: %d topics: %d correct: %s" % (len(filters), len(topics), correct))
+
+t0 = time.time()
+for topic in topics:
+    [f for f in filters if matches(f, topic)]
+scan = time.time() - t0
+
+router = TopicRouter()
+
+for sink_filter in filters:
+    router.add(sink_filter, sink_filter)
+
+t0 = time.time()
+for topic in topics:
+    router.match(topic)
+walk = time.time() - t0
+
+t0 = time.time()
+for topic in topics:
+    router.match(topic)
+cached = time.time() - t0
+
+print("per topic - scan: %0.1f us trie: %0.1f us cached: %0.2f us" %
+      (scan * 1e6 / len(topics), walk * 1e6 / len(topics), cached * 1e6 / len(topics)))
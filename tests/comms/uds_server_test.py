@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Three local clients subscribe to a UDSServer, as they would to aws_mqtt_mux. Messages are routed to them by topic.
+One client never reads - it should lose messages from its own queue without holding up the others. When a client
+goes away, its routes should be removed.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from scs_analysis.comms.topic_router import TopicRouter
+from scs_analysis.comms.uds_server import UDSServer
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MESSAGES = 20000
+QUEUE_LENGTH = 100
+
+TOPICS = ('org/dev/loc/1/gases', 'org/dev/loc/1/particulates', 'org/dev/loc/2/gases')
+
+
+def serve(server, router):
+    server.connect()
+
+    for connection, line in server.read():
+        if line is None:
+            router.remove_sink(connection)
+            connection.close()
+            continue
+
+        jdict = json.loads(line)
+
+        if jdict['cmd'] == 'subscribe':
+            router.add(jdict['topic'], connection)
+
+
+def client(address, topic_filter):
+    sock = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+    sock.connect(address)
+    sock.sendall((json.dumps({"cmd": "subscribe", "topic": topic_filter}) + '\n').encode())
+
+    return sock
+
+
+def receive(sock, count, received):
+    buffer = b''
+
+    while len(received) < count:
+        data = sock.recv(65536)
+
+        if not data:
+            break
+
+        *lines, buffer = (buffer + data).split(b'\n')
+        received.extend(line.decode() for line in lines)
+
+
+directory = tempfile.mkdtemp()
+address = os.path.join(directory, "mux.uds")
+
+router = TopicRouter()
+server = UDSServer(address, QUEUE_LENGTH, 'drop-oldest')
+
+threading.Thread(target=serve, args=(server, router), daemon=True).start()
+
+while not os.path.exists(address):
+    time.sleep(0.01)
+
+gases = client(address, 'org/dev/+/1/gases')
+everything = client(address, 'org/#')
+stalled = client(address, 'org/dev/loc/#')
+
+while len(router.sinks) < 3:
+    time.sleep(0.01)
+
+expected_gases = sum(1 for i in range(MESSAGES) if TOPICS[i % len(TOPICS)] == TOPICS[0])
+
+gases_received = []
+everything_received = []
+
+threads = [threading.Thread(target=receive, args=(gases, expected_gases, gases_received), daemon=True),
+           threading.Thread(target=receive, args=(everything, MESSAGES, everything_received), daemon=True)]
+
+for thread in threads:
+    thread.start()
+
+stalled_connection = server.connections[2]
+
+t0 = time.time()
+
+for i in range(MESSAGES):
+    topic = TOPICS[i % len(TOPICS)]
+    message = json.dumps({topic: {"seq": i}})
+
+    for sink in router.match(topic):
+        sink.write(message)
+
+        while sink is not stalled_connection and sink.queue.depth >= QUEUE_LENGTH // 2:
+            time.sleep(0.001)                           # the readers are given time - the stalled client is not
+
+for thread in threads:
+    thread.join(30)
+
+elapsed = time.time() - t0
+
+print("gases: received: %d of %d" % (len(gases_received), expected_gases))
+print("everything: received: %d of %d" % (len(everything_received), MESSAGES))
+print("elapsed: %0.2f s" % elapsed)
+print("-")
+
+for connection in server.connections:
+    print(connection)
+
+print("-")
+
+# a client goes away...
+gases.close()
+
+while len(router.sinks) > 2:
+    time.sleep(0.01)
+
+print("after close: %s" % router)
+print("-")
+
+everything.close()
+stalled.close()
+
+while router.sinks:
+    time.sleep(0.01)
+
+server.close()
+print(server)
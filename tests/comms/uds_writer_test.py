@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Compares a connection per message - as DomainSocket makes - with a UDSWriter, writing to a UDSReader. The reader is
+then stopped and restarted, and the writer should reconnect.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from scs_analysis.comms.uds_reader import UDSReader
+from scs_analysis.comms.uds_writer import UDSWriter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MESSAGES = 20000
+
+MESSAGE = '{"gases": {"rec": "2017-10-26T12:00:00Z", "val": {"NO2": {"weV": 0.31288, "cnc": 4.0}}}}'
+
+
+def start_reader(address, count, received):
+    reader = UDSReader(address)
+    reader.connect()
+
+    def run():
+        for message in reader.read():
+            received.append(message)
+
+            if len(received) == count:
+                break
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    while not os.path.exists(address):
+        time.sleep(0.01)
+
+    return reader, thread
+
+
+def connection_per_message(address):
+    for _ in range(MESSAGES):
+        sock = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+        sock.connect(address)
+        sock.sendall(MESSAGE.encode())
+        sock.close()
+
+
+def uds_writer(address):
+    writer = UDSWriter(address)
+    writer.connect()
+
+    for _ in range(MESSAGES):
+        writer.write(MESSAGE)
+
+    writer.close()
+    print(writer)
+
+
+directory = tempfile.mkdtemp()
+
+for name, write in (("connection per message", connection_per_message), ("UDSWriter", uds_writer)):
+    address = os.path.join(directory, "%s.uds" % name.replace(' ', '_'))
+    received = []
+
+    reader, thread = start_reader(address, MESSAGES, received)
+
+    t0 = time.time()
+    write(address)
+    thread.join()
+    elapsed = time.time() - t0
+
+    reader.close()
+
+    print("%s: received: %d correct: %s elapsed: %0.2f s (%0.1f us per message)" %
+          (name, len(received), all(message == MESSAGE for message in received), elapsed,
+           elapsed * 1e6 / MESSAGES))
+    print("-")
+
+
+# reader goes away...
+address = os.path.join(directory, "restart.uds")
+
+writer = UDSWriter(address)
+writer.connect()
+
+received = []
+reader, thread = start_reader(address, 10, received)
+
+for _ in range(10):
+    writer.write(MESSAGE)
+
+thread.join()
+reader.close()
+
+refused = 0
+
+for _ in range(10):
+    try:
+        writer.write(MESSAGE)
+
+    except ConnectionRefusedError:
+        refused += 1
+
+    time.sleep(0.02)
+
+received = []
+reader, thread = start_reader(address, 1, received)
+
+time.sleep(UDSWriter.BACKOFF_MAX / 10)
+
+while not received:
+    try:
+        writer.write(MESSAGE)
+
+    except ConnectionRefusedError:
+        pass
+
+    time.sleep(0.05)
+
+thread.join()
+reader.close()
+writer.close()
+
+print("refused while the reader was away: %d" % refused)
+print("received after restart: %d" % len(received))
+print(writer)
+print("-")
+
+
+# reader goes away part-way through a write...
+address = os.path.join(directory, "partial.uds")
+
+server = socket.socket(family=socket.AF_UNIX, type=socket.SOCK_STREAM)
+server.bind(address)
+server.listen(1)
+
+received = []
+
+
+def read_partial():
+    # first connection: read a little, then close...
+    connection, _ = server.accept()
+    data = connection.recv(1000)
+    connection.close()
+
+    received.extend(data.decode().split(UDSWriter.EOM)[:-1])
+
+    # second connection: read everything...
+    connection, _ = server.accept()
+    data = b''
+
+    while True:
+        chunk = connection.recv(65536)
+
+        if not chunk:
+            break
+
+        data += chunk
+
+    connection.close()
+
+    received.extend(message for message in data.decode().split(UDSWriter.EOM) if message)
+
+
+thread = threading.Thread(target=read_partial, daemon=True)
+thread.start()
+
+writer = UDSWriter(address)
+batch = UDSWriter.EOM.join('{"seq": %d}' % i for i in range(MESSAGES * 10))
+
+writer.write(batch)
+writer.close()
+
+thread.join()
+server.close()
+
+seqs = [int(message.split()[-1].strip('}')) for message in received]
+
+print("written: %d received: %d duplicates: %d in order: %s" %
+      (MESSAGES * 10, len(seqs), len(seqs) - len(set(seqs)), seqs == sorted(seqs)))
+print(writer)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Pulls two merged topics, stopping after a number of messages, and resumes from the checkpoint - until the pull is
+complete. The joined output should be the same as that of an uninterrupted pull.
+
+Instant is a fixture with the two methods of LocalizedDatetime that ParallelFetcher.slices(..) uses.
+"""
+
+import os
+import tempfile
+
+from scs_analysis.history.history_checkpoint import HistoryCheckpoint
+from scs_analysis.history.parallel_fetcher import ParallelFetcher
+from scs_analysis.history.topic_merger import TopicMerger
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class Instant(object):
+    """
+    classdocs
+    """
+
+    def __init__(self, timestamp):
+        self.__timestamp = timestamp
+
+
+    def timestamp(self):
+        return self.__timestamp
+
+
+    def timedelta(self, seconds=0, hours=0):
+        return Instant(self.__timestamp + seconds + hours * 3600)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+PATHS = ['gases', 'climate']
+INTERVALS = {'gases': 10, 'climate': 15}
+
+
+def fetch_factory():
+    def fetch(topic, start, end):
+        interval = INTERVALS[topic]
+        first = int(-(-start.timestamp() // interval)) * interval
+
+        return [{'rec': t, 'topic': topic} for t in range(first, int(end.timestamp()) + 1, interval)]     # inclusive
+
+    return fetch
+
+
+def pull(filename, stop_after=None):
+    checkpoint = HistoryCheckpoint.load(filename)
+
+    if checkpoint is None:
+        start = Instant(1508976000)
+        end = start.timedelta(hours=6)
+
+        checkpoint = HistoryCheckpoint.construct(filename, PATHS, start, end, 20, False)
+
+    fetcher = ParallelFetcher(fetch_factory, 4)
+    streams = []
+
+    for path in PATHS:
+        slice_start, skip = checkpoint.position(path)
+        slices = ParallelFetcher.slices(Instant(slice_start), Instant(checkpoint.end), checkpoint.slice_minutes,
+                                        checkpoint.aligned)
+
+        streams.append((path, fetcher.find_positions(path, slices, key=lambda message: message['rec'], skip=skip)))
+
+    merger = TopicMerger(lambda position: position[2]['rec'])
+    written = []
+
+    try:
+        for topic, (time_slice, index, message) in merger.merge(streams):
+            if len(written) == stop_after:
+                return written
+
+            written.append((topic, message['rec']))
+            checkpoint.update(topic, time_slice[0], index + 1, message['rec'])
+
+        checkpoint.delete()
+
+    finally:
+        checkpoint.save()
+
+    return written
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+directory = tempfile.mkdtemp()
+
+expected = pull(os.path.join(directory, "uninterrupted.json"))
+print("expected: %d" % len(expected))
+
+checkpoint_filename = os.path.join(directory, "checkpoint.json")
+output = []
+runs = 0
+
+while True:
+    runs += 1
+    output.extend(pull(checkpoint_filename, stop_after=97))
+
+    if not os.path.exists(checkpoint_filename):
+        break
+
+print("runs: %d" % runs)
+print("output: %d" % len(output))
+print("duplicates: %d" % (len(output) - len(set(output))))
+print("same: %s" % (output == expected))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Messages are published to an in-memory store every ten seconds, some of them late, and the store is polled by the
+follower. Every message should be found once.
+"""
+
+import time
+
+from collections import OrderedDict
+
+from scs_analysis.history.history_follower import HistoryFollower
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+store = []
+
+
+def publish(t, topic):
+    rec = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+    store.append((t, topic, OrderedDict([('rec', rec), ('val', int(t) % 7)])))
+
+
+def fetch(topic, start, end):
+    return [message for t, message_topic, message in sorted(store, key=lambda item: item[0])
+            if message_topic == topic and start <= t <= end]
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+now = int(time.time())
+origin = now - 600                                      # recs in the past, so that every poll covers them
+
+follower = HistoryFollower(fetch, lambda message: message, ['gases', 'climate'], origin)
+print(follower)
+
+found = []
+
+for step in range(40):
+    t = origin + step * 10
+
+    publish(t, 'gases')
+    publish(t, 'climate')
+
+    if step % 5 == 4:
+        publish(t - 35, 'gases')                        # a late arrival
+
+    if step % 3 == 0:
+        found.extend(follower.poll())
+
+found.extend(follower.poll())
+
+recs = [(topic, message['rec'], message['val']) for topic, message in found]
+
+print(follower)
+print("published: %d" % len(store))
+print("found: %d" % len(found))
+print("duplicates: %d" % (len(recs) - len(set(recs))))
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A local HTTP server stands in for the message API: each request returns one message per second of the requested
+period, after a fixed latency.
+
+A generator then stands in for a reader that parses its response as it arrives: the first message of the history
+should be returned long before its slice is complete.
+"""
+
+import json
+import threading
+import time
+import urllib.request
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+from scs_analysis.history.parallel_fetcher import ParallelFetcher
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+LATENCY = 0.2
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+
+        start = int(query['start'][0])
+        end = int(query['end'][0])
+
+        time.sleep(LATENCY)
+
+        body = json.dumps([{'rec': rec, 'val': rec % 7} for rec in range(start, end + 1)]).encode()     # inclusive
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+server = StandInServer(('127.0.0.1', 0), StandInHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+url = "http://127.0.0.1:%d/messages" % server.server_address[1]
+
+
+def fetch_factory():
+    def fetch(topic, start, end):
+        with urllib.request.urlopen("%s?topic=%s&start=%d&end=%d" % (url, topic, start, end)) as response:
+            return json.loads(response.read().decode())
+
+    return fetch
+
+
+def key(message):
+    return message['rec']
+
+
+slices = [(start, start + 100) for start in range(0, 2000, 100)]        # boundaries are returned by both slices
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+for workers in (1, 4, 8):
+    fetcher = ParallelFetcher(fetch_factory, workers)
+    print(fetcher)
+
+    t0 = time.time()
+    messages = list(fetcher.find('test', slices, key=key))
+    elapsed = time.time() - t0
+
+    recs = [message['rec'] for message in messages]
+
+    print("count: %d elapsed: %0.2f" % (len(recs), elapsed))
+    print("ordered: %s" % (recs == list(range(0, 2001))))
+    print("-")
+
+server.shutdown()
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+MESSAGE_INTERVAL = 0.01
+
+
+def streaming_fetch_factory():
+    def fetch(topic, start, end):
+        for rec in range(start, end + 1):
+            time.sleep(MESSAGE_INTERVAL)
+            yield {'rec': rec, 'val': rec % 7}
+
+    return fetch
+
+
+fetcher = ParallelFetcher(streaming_fetch_factory, 4)
+print(fetcher)
+
+t0 = time.time()
+first = None
+recs = []
+
+for message in fetcher.find('test', slices[:4], key=key):
+    if first is None:
+        first = time.time() - t0
+
+    recs.append(message['rec'])
+
+elapsed = time.time() - t0
+
+print("first: %0.2f slice: %0.2f elapsed: %0.2f" % (first, 101 * MESSAGE_INTERVAL, elapsed))
+print("streamed: %s" % (first < 101 * MESSAGE_INTERVAL / 2))
+print("ordered: %s" % (recs == list(range(0, 401))))
+print("-")
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CorruptBucketError(ValueError):
+    pass
+
+
+def eager_failure_factory():
+    def fetch(topic, start, end):
+        if start == 200:
+            raise CorruptBucketError("slice %d" % start)            # raised before any message is returned
+
+        return [{'rec': rec} for rec in range(start, end + 1)]
+
+    return fetch
+
+
+def factory_failure():
+    raise ConnectionError("no manager")
+
+
+for name, factory in (("eager fetch failure", eager_failure_factory), ("factory failure", factory_failure)):
+    fetcher = ParallelFetcher(factory, 2)
+    recs = []
+
+    t0 = time.time()
+
+    try:
+        for message in fetcher.find('test', slices[:4], key=key):
+            recs.append(message['rec'])
+
+        print("%s: not raised" % name)
+
+    except Exception as ex:
+        print("%s: %s: %s count: %d elapsed: %0.2f" % (name, ex.__class__.__name__, ex, len(recs), time.time() - t0))
+
+print("-")
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+produced = [0]
+
+
+def long_slice_factory():
+    def fetch(topic, start, end):
+        for rec in range(start, start + 100000):
+            produced[0] += 1
+            yield {'rec': rec}
+
+    return fetch
+
+
+fetcher = ParallelFetcher(long_slice_factory, 2, capacity=100)
+print(fetcher)
+
+messages = fetcher.find('test', [(0, 1), (100000, 100001)])
+
+for _ in range(10):
+    next(messages)
+
+time.sleep(0.5)
+print("produced while paused: %d (at most %d)" % (produced[0], 10 + 2 * (100 + 1)))
+
+t0 = time.time()
+messages.close()                                                    # the consumer stops reading
+
+while threading.active_count() > 1 and time.time() - t0 < 5:        # the StandIn server is already shut down
+    time.sleep(0.1)
+
+print("workers stopped: %s elapsed: %0.2f" % (threading.active_count() == 1, time.time() - t0))
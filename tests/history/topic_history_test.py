@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A stand-in for the command line, and a fetch function that returns one message per minute of the requested period,
+drive a TopicHistory over two topics, with a checkpoint. The pull is interrupted part-way, then resumed.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+
+from scs_analysis.history.topic_history import TopicHistory
+
+from scs_core.data.json import JSONable
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class StandInCmd(object):
+
+    def __init__(self, paths, minutes, checkpoint):
+        self.paths = paths
+        self.minutes = minutes
+        self.checkpoint = checkpoint
+
+        self.start = None
+        self.end = None
+        self.follow = False
+        self.parallel = 2
+        self.slice = 60
+        self.include_wrapping = False
+        self.verbose = False
+
+
+    def use_offset(self):
+        return self.minutes is not None
+
+
+class StandInMessage(JSONable):
+
+    def __init__(self, payload):
+        self.payload = payload
+
+
+    def as_json(self):
+        return self.payload
+
+
+class Interruption(Exception):
+    pass
+
+
+def fetch_factory():
+    def fetch(topic, start, end):
+        first = int(start.timestamp()) // 60 + 1
+        last = int(end.timestamp()) // 60
+
+        for minute in range(first, last + 1):
+            rec = LocalizedDatetime.construct_from_timestamp(minute * 60).as_iso8601()
+            yield StandInMessage({'rec': rec, 'topic': topic})
+
+    return fetch
+
+
+class LimitedOutput(io.StringIO):
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+
+    def write(self, text):
+        if text.strip() and self.limit is not None and self.getvalue().count('\n') >= self.limit:
+            raise Interruption()
+
+        return super().write(text)
+
+
+def pull(cmd, limit=None):
+    history = TopicHistory(cmd, fetch_factory, lambda message: message.payload)
+
+    stdout = sys.stdout
+    sys.stdout = output = LimitedOutput(limit)
+
+    try:
+        if not history.open():
+            return None
+
+        history.run()
+
+    except Interruption:
+        pass
+
+    finally:
+        sys.stdout = stdout
+        history.close()
+
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+filename = os.path.join(tempfile.mkdtemp(), "pull.json")
+paths = ['org/loc/1/gases', 'org/loc/1/climate']
+
+complete = pull(StandInCmd(paths, 300, None))
+print("complete: %d" % len(complete))
+
+recs = [list(document.values())[0]['rec'] for document in complete]
+print("ordered: %s" % (recs == sorted(recs)))
+print("-")
+
+first = pull(StandInCmd(paths, 300, filename), 250)
+print("interrupted: %d checkpoint: %s" % (len(first), os.path.exists(filename)))
+
+print("other topics: %s" % pull(StandInCmd(paths[:1], None, filename)))
+
+second = pull(StandInCmd(paths, None, filename))
+print("resumed: %d checkpoint: %s" % (len(second), os.path.exists(filename)))
+
+keys = [json.dumps(document, sort_keys=True) for document in first + second]
+print("total: %d duplicates: %d" % (len(keys), len(keys) - len(set(keys))))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+"""
+Created on 19 Oct 2026
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+from collections import OrderedDict
+
+from scs_analysis.history.topic_merger import TopicMerger
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def stream(topic, start, step, count):
+    for i in range(count):
+        seconds = start + i * step
+        yield OrderedDict([('rec', "2017-10-26T12:%02d:%02dZ" % (seconds // 60, seconds % 60)), ('topic', topic)])
+
+
+streams = [('gases', stream('gases', 0, 10, 6)),
+           ('climate', stream('climate', 5, 15, 4)),
+           ('particulates', stream('particulates', 0, 30, 2)),
+           ('empty', stream('empty', 0, 1, 0))]
+
+merger = TopicMerger(TopicMerger.rec_timestamp)
+print(merger)
+print("-")
+
+recs = []
+
+for topic, document in merger.merge(streams):
+    print("%s: %s" % (topic, document['rec']))
+    recs.append(TopicMerger.rec_timestamp(document))
+
+print("-")
+
+print("count: %d" % len(recs))
+print("ordered: %s" % (recs == sorted(recs)))
+print("-")
+
+# a message without a valid rec follows its predecessor...
+gases = list(stream('gases', 0, 10, 3))
+gases.insert(2, OrderedDict([('rec', "nonsense"), ('topic', 'gases')]))
+
+merged = [document['rec'] for _, document in merger.merge([('gases', gases), ('climate', stream('climate', 5, 10, 3))])]
+print(merged)
+print(merger)
+print("-")
+
+for rec in ("2017-10-26T12:00:00Z", "2017-10-26T13:00:00.5+01:00", "2017-10-26T12:00:00.123456789Z",
+            "2017-10-26T12:00:00", "nonsense", None):
+    print("%s: %s" % (rec, TopicMerger.rec_timestamp({'rec': rec})))